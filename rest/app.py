@@ -13,13 +13,20 @@ from .controller.auth_controller import router as auth_router
 from .controller.sedes_controller import router as sedes_router
 from .controller.usuarios_carreras_controller import router as usuarios_carreras_router
 from .controller.clases_individuales_controller import router as clases_individuales_router
+from .controller.metrics_controller import router as metrics_router
+from .pagination import NEXT_CURSOR_HEADER
 
 # Importar funciones de base de datos
 from .database import init_database, close_database
 
+# Importar cliente de autenticación del core
+from .security.core_client import core_client
+from .security.password_hasher import password_hasher
+
 # Importar funciones de RabbitMQ
 from .messaging.rabbitmq import get_connection, close_connection
 from .messaging.consumer import EventConsumer
+from .messaging.outbox import outbox_relay
 from .messaging.handlers.proposal_handler import handle_proposal_event
 
 @asynccontextmanager
@@ -27,6 +34,12 @@ async def lifespan(app: FastAPI):
     # Startup: abrir conexión a la base de datos
     await init_database()
     
+    # Startup: inicializar cliente de autenticación del core
+    await core_client.start()
+    
+    # Startup: calibrar el costo de bcrypt en este host
+    await password_hasher.calibrate()
+    
     # Startup: inicializar RabbitMQ (opcional, no falla si no está disponible)
     try:
         await get_connection()
@@ -55,11 +68,23 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️ RabbitMQ no disponible (modo sin colas): {e}")
     
+    # Startup: publicar en background los eventos del outbox (reintenta si RabbitMQ no está disponible)
+    await outbox_relay.start()
+    
     yield
     
+    # Shutdown: publicar lo pendiente del outbox y detener el relay antes de cerrar la base de datos
+    await outbox_relay.stop()
+    
     # Shutdown: cerrar conexión a la base de datos
     await close_database()
     
+    # Shutdown: liberar recursos del cliente de autenticación
+    await core_client.close()
+    
+    # Shutdown: liberar el pool de hashing de contraseñas
+    password_hasher.shutdown()
+    
     # Shutdown: cerrar conexión a RabbitMQ
     try:
         await close_connection()
@@ -91,6 +116,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Permite todos los métodos (GET, POST, PUT, DELETE, etc.)
     allow_headers=["*"],  # Permite todos los headers
+    expose_headers=[NEXT_CURSOR_HEADER],  # Cursor de la página siguiente en listados
 )
 
 API_PREFIX = "/api/v1"
@@ -105,3 +131,4 @@ app.include_router(sueldos_router, prefix=API_PREFIX)
 app.include_router(sedes_router, prefix=API_PREFIX)
 app.include_router(usuarios_carreras_router, prefix=API_PREFIX)
 app.include_router(clases_individuales_router, prefix=API_PREFIX)
+app.include_router(metrics_router, prefix=API_PREFIX)
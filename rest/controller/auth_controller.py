@@ -1,15 +1,17 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..schemas.auth_schema import LoginRequest, AuthResponse, VerifyResponse
 from ..service.auth_service import AuthService
 from ..database import get_async_db
 from ..dao.usuario_dao import UsuarioDAO
+from ..security.rate_limiter import login_rate_limiter, trusted_proxies
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 @router.post("/login", response_model=AuthResponse, response_model_exclude_none=True)
 async def login(
     login_request: LoginRequest,
+    request: Request,
     db: AsyncSession = Depends(get_async_db)
 ):
     """
@@ -17,13 +19,20 @@ async def login(
     La contraseña se envía en texto plano y se compara con el hash almacenado.
     Retorna información completa del usuario + rol.
     Si el usuario existe pero está inactivo, retorna 404 Not Found.
+    Si se superan los intentos permitidos por IP o email, retorna 429 Too Many Requests.
     """
+    # Limitar intentos antes de consultar la base o ejecutar bcrypt
+    # (detrás del proxy de Railway/Render la IP sale de X-Forwarded-For, ver TRUSTED_PROXIES)
+    client_ip = trusted_proxies.client_ip(request)
+    await login_rate_limiter.check(login_request.email_institucional, client_ip)
+    
     try:
         # Verificar si el usuario existe (sin importar su estado)
         usuario = await UsuarioDAO.get_by_email_institucional(db, login_request.email_institucional)
         
         # Si el usuario existe pero está inactivo, retornar 404
         if usuario and not usuario.status:
+            await login_rate_limiter.record_failure(login_request.email_institucional)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Usuario no encontrado"
@@ -33,11 +42,13 @@ async def login(
         auth_response = await AuthService.authenticate_user(db, login_request)
         
         if not auth_response:
+            await login_rate_limiter.record_failure(login_request.email_institucional)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Credenciales incorrectas"
             )
         
+        await login_rate_limiter.record_success(login_request.email_institucional)
         return auth_response
         
     except HTTPException:
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Query, Depends
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import date
@@ -13,6 +13,7 @@ from ..schemas.clase_individual_schema import (
 )
 from ..service.clase_individual_service import ClaseIndividualService
 from ..database import get_async_db
+from ..pagination import InvalidCursorError, set_next_cursor
 from ..security import get_current_user
 
 router = APIRouter(prefix="/clases-individuales", tags=["Clases Individuales"])
@@ -43,8 +44,10 @@ async def create_clase(
 
 @router.get("/", response_model=List[ClaseIndividualResponse], response_model_exclude_none=True)
 async def get_all_clases(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor opaco del header X-Next-Cursor para obtener la página siguiente"),
     status_filter: Optional[bool] = Query(None, alias="status", description="Filtrar por estado activo/inactivo"),
     param: Optional[str] = Query(None, description="Parámetro de búsqueda: id, id_clase, id_curso, tipo, status"),
     value: Optional[str] = Query(None, description="Valor a buscar (para status: true/false)"),
@@ -53,8 +56,16 @@ async def get_all_clases(
     """
     Obtener todas las clases individuales con filtros opcionales.
     Si se proporcionan 'param' y 'value', realiza una búsqueda específica.
-    Si no se proporcionan, devuelve todas las clases con los filtros de paginación y status.
+    Si no se proporcionan, devuelve todas las clases con los filtros de paginación y status,
+    ordenadas por fecha descendente. Sin 'skip' se pagina por cursor: si hay más
+    resultados, el header X-Next-Cursor trae el valor para pedir la página siguiente.
     """
+    if cursor is not None and (skip or param is not None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'cursor' no puede combinarse con 'skip' ni con búsquedas por 'param'"
+        )
+    
     try:
         # Si se proporcionan param y value, realizar búsqueda
         if param is not None and value is not None:
@@ -67,9 +78,15 @@ async def get_all_clases(
             return await ClaseIndividualService.search_clases(db, param, value, skip, limit, status_filter)
         else:
             # Si no hay parámetros de búsqueda, devolver todas las clases
-            return await ClaseIndividualService.get_all_clases(db, skip, limit, status_filter)
+            if skip:
+                return await ClaseIndividualService.get_all_clases(db, skip, limit, status_filter)
+            clases, next_cursor = await ClaseIndividualService.get_clases_page(db, limit, cursor, status_filter)
+            set_next_cursor(response, next_cursor)
+            return clases
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import uuid
@@ -7,6 +7,7 @@ from ..schemas.espacio_schema import EspacioCreate, EspacioUpdate, Espacio, Espa
 from ..database import get_async_db
 from ..service.espacio_service import EspacioService
 from ..security import get_current_user
+from ..pagination import InvalidCursorError, set_next_cursor
 
 router = APIRouter(prefix="/espacios", tags=["Espacios"])
 
@@ -34,16 +35,26 @@ async def create_espacio(
 
 @router.get("/", response_model=List[Espacio])
 async def get_all_espacios(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor opaco del header X-Next-Cursor para obtener la página siguiente"),
     status_filter: Optional[bool] = Query(None, description="Filtrar por status (True=activos, False=inactivos, None=todos)"),
     param: Optional[str] = Query(None, description="Parámetro de búsqueda. Valores válidos: id, id_espacio, nombre, tipo, estado, estado_espacio, sede, id_sede, capacidad, status"),
     value: Optional[str] = Query(None, description="Valor a buscar para el parámetro indicado"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Obtener todos los espacios con filtro opcional por status o realizar búsquedas
+    Obtener todos los espacios con filtro opcional por status o realizar búsquedas.
+    Sin 'skip' se pagina por cursor: si hay más resultados, el header
+    X-Next-Cursor trae el valor para pedir la página siguiente.
     """
+    if cursor is not None and (skip or param):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'cursor' no puede combinarse con 'skip' ni con búsquedas por 'param'"
+        )
+    
     try:
         if param:
             if not value:
@@ -62,7 +73,13 @@ async def get_all_espacios(
                     detail=f"Invalid search parameter: {param}. Valid parameters: {', '.join(valid_params)}"
                 )
             return await EspacioService.search(db, param, value, skip, limit)
-        return await EspacioService.get_all_espacios(db, skip, limit, status_filter)
+        if skip:
+            return await EspacioService.get_all_espacios(db, skip, limit, status_filter)
+        espacios, next_cursor = await EspacioService.get_espacios_page(db, limit, cursor, status_filter)
+        set_next_cursor(response, next_cursor)
+        return espacios
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
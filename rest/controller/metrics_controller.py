@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+from ..security import get_current_user, token_cache, core_client, token_verifications, password_hasher, login_rate_limiter
+from ..service.legajo_allocator import legajo_allocator
+from ..messaging.outbox import outbox_relay
+from ..messaging.rabbitmq import channel_pool
+from ..messaging.producer import publisher_stats
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+@router.get("/", response_model=dict)
+async def get_metrics(current_user: dict = Depends(get_current_user)):
+    """Obtener contadores internos de rendimiento de la API (requiere autenticación)"""
+    return {
+        "auth_token_cache": token_cache.get_stats(),
+        "auth_singleflight": token_verifications.get_stats(),
+        "core_http_pool": core_client.get_pool_stats(),
+        "core_circuit_breaker": core_client.breaker.get_stats(),
+        "password_hasher": password_hasher.get_stats(),
+        "login_rate_limiter": login_rate_limiter.get_stats(),
+        "legajo_allocator": legajo_allocator.get_stats(),
+        "outbox_relay": outbox_relay.get_stats(),
+        "rabbitmq_publish_channels": channel_pool.get_stats(),
+        "rabbitmq_publisher": publisher_stats.get_stats()
+    }
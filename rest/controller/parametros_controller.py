@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import uuid
@@ -6,6 +6,7 @@ from ..schemas.parametro_schema import Parametro, ParametroCreate, ParametroUpda
 from ..database import get_async_db
 from ..service.parametro_service import ParametroService
 from ..security import get_current_user
+from ..pagination import InvalidCursorError, set_next_cursor
 
 router = APIRouter(prefix="/parametros", tags=["Parametros"])
 
@@ -30,14 +31,26 @@ async def create_parametro(
 
 @router.get("/", response_model=List[Parametro])
 async def get_all_parametros(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco del header X-Next-Cursor para obtener la página siguiente"),
     status_filter: Optional[bool] = Query(None, description="Filtrar por status (True=activos, False=inactivos, None=todos)"),
     param: Optional[str] = Query(None, description="Parámetro de búsqueda. Valores válidos: id, id_parametro, nombre, tipo, status"),
     value: Optional[str] = Query(None, description="Valor a buscar para el parámetro indicado"),
     db: AsyncSession = Depends(get_async_db)
 ):
-    """Obtener todos los parámetros con filtro opcional por status o realizar búsquedas"""
+    """
+    Obtener todos los parámetros con filtro opcional por status o realizar búsquedas.
+    Sin 'skip' se pagina por cursor: si hay más resultados, el header
+    X-Next-Cursor trae el valor para pedir la página siguiente.
+    """
+    if cursor is not None and (skip or param):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'cursor' no puede combinarse con 'skip' ni con búsquedas por 'param'"
+        )
+    
     try:
         if param:
             if not value:
@@ -54,9 +67,15 @@ async def get_all_parametros(
                     detail=f"Invalid search parameter: {param}. Valid parameters: {', '.join(valid_params)}"
                 )
             return await ParametroService.search(db, param, value, skip, limit)
-        resultado = await ParametroService.get_all_parametros(db, skip, limit, status_filter)
-        return resultado["parametros"]
+        if skip:
+            resultado = await ParametroService.get_all_parametros(db, skip, limit, status_filter)
+            return resultado["parametros"]
+        parametros, next_cursor = await ParametroService.get_parametros_page(db, limit, cursor, status_filter)
+        set_next_cursor(response, next_cursor)
+        return parametros
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
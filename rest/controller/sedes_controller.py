@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import uuid
@@ -6,6 +6,7 @@ from ..schemas.sede_schema import SedeCreate, SedeUpdate, Sede
 from ..database import get_async_db
 from ..service.sede_service import SedeService
 from ..security import get_current_user
+from ..pagination import InvalidCursorError, set_next_cursor
 
 router = APIRouter(prefix="/sedes", tags=["Sedes"])
 
@@ -30,14 +31,26 @@ async def create_sede(
 
 @router.get("/", response_model=List[Sede])
 async def get_all_sedes(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco del header X-Next-Cursor para obtener la página siguiente"),
     status_filter: Optional[bool] = Query(None, description="Filtrar por status (True=activos, False=inactivos, None=todos)"),
     param: Optional[str] = Query(None, description="Parámetro de búsqueda. Valores válidos: id, id_sede, nombre, ubicacion, status"),
     value: Optional[str] = Query(None, description="Valor a buscar para el parámetro indicado"),
     db: AsyncSession = Depends(get_async_db)
 ):
-    """Obtener todas las sedes con filtro opcional por status y paginación, o realizar búsquedas"""
+    """
+    Obtener todas las sedes con filtro opcional por status y paginación, o realizar búsquedas.
+    Sin 'skip' se pagina por cursor: si hay más resultados, el header
+    X-Next-Cursor trae el valor para pedir la página siguiente.
+    """
+    if cursor is not None and (skip or param):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'cursor' no puede combinarse con 'skip' ni con búsquedas por 'param'"
+        )
+    
     try:
         if param:
             if not value:
@@ -54,8 +67,14 @@ async def get_all_sedes(
                     detail=f"Invalid search parameter: {param}. Valid parameters: {', '.join(valid_params)}"
                 )
             return await SedeService.search(db, param, value, skip, limit)
-        resultado = await SedeService.get_all_sedes(db, skip=skip, limit=limit, status_filter=status_filter)
-        return resultado["sedes"]
+        if skip:
+            resultado = await SedeService.get_all_sedes(db, skip=skip, limit=limit, status_filter=status_filter)
+            return resultado["sedes"]
+        sedes, next_cursor = await SedeService.get_sedes_page(db, limit, cursor, status_filter)
+        set_next_cursor(response, next_cursor)
+        return sedes
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import uuid
@@ -6,6 +6,7 @@ from ..schemas.sueldo_schema import Sueldo, SueldoBase, SueldoUpdate
 from ..service.sueldo_service import SueldoService
 from ..database import get_async_db
 from ..security import get_current_user
+from ..pagination import InvalidCursorError, set_next_cursor
 
 router = APIRouter(prefix="/sueldos", tags=["Sueldos"])
 
@@ -49,13 +50,25 @@ async def pagar_sueldos_docentes(
 
 @router.get("/", response_model=List[Sueldo], response_model_exclude_none=True)
 async def get_all_sueldos(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor opaco del header X-Next-Cursor para obtener la página siguiente"),
     param: Optional[str] = Query(None, description="Parámetro de búsqueda opcional: id, id_sueldo, id_usuario, monto, status"),
     value: Optional[str] = Query(None, description="Valor a buscar cuando se usa 'param'"),
     status_filter: Optional[bool] = Query(None, description="Filtrar por estado activo/inactivo"),
     db: AsyncSession = Depends(get_async_db)
 ):
+    """
+    Listar sueldos. Sin 'skip' se pagina por cursor: si hay más resultados,
+    el header X-Next-Cursor trae el valor para pedir la página siguiente.
+    """
+    if cursor is not None and (skip or param):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'cursor' no puede combinarse con 'skip' ni con búsquedas por 'param'"
+        )
+
     if param is not None:
         valid_params = ["id", "id_sueldo", "id_usuario", "monto", "status"]
         if param.lower() not in valid_params:
@@ -71,7 +84,15 @@ async def get_all_sueldos(
         sueldos = await SueldoService.search_sueldos(db, param, value, skip, limit, status_filter)
         return sueldos
 
-    return await SueldoService.get_all_sueldos(db, skip, limit, status_filter)
+    if skip:
+        return await SueldoService.get_all_sueldos(db, skip, limit, status_filter)
+
+    try:
+        sueldos, next_cursor = await SueldoService.get_sueldos_page(db, limit, cursor, status_filter)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    set_next_cursor(response, next_cursor)
+    return sueldos
 
 @router.get("/usuario/{id_usuario}", response_model=Sueldo, response_model_exclude_none=True)
 async def get_sueldo_by_usuario(
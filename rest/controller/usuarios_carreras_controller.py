@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..database import get_async_db
 from ..service.usuario_carrera_service import UsuarioCarreraService
@@ -6,19 +6,32 @@ from ..schemas.usuario_carrera_schema import UsuarioCarrera, UsuarioCarreraCreat
 from typing import List, Optional
 from uuid import UUID
 from ..security import get_current_user
+from ..pagination import InvalidCursorError, set_next_cursor
 
 router = APIRouter(prefix="/usuarios-carreras", tags=["Usuario-Carrera"])
 
 @router.get("/", response_model=List[UsuarioCarrera], response_model_exclude_none=True)
 async def get_all_usuario_carreras(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     param: Optional[str] = Query(None, description="Parámetro de búsqueda opcional: id, id_usuario, id_carrera, status"),
     value: Optional[str] = Query(None, description="Valor a buscar cuando se usa 'param'"),
     status_filter: Optional[bool] = Query(None, description="Filtrar por estado activo/inactivo"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco del header X-Next-Cursor para obtener la página siguiente"),
     db: AsyncSession = Depends(get_async_db)
 ):
-    """Obtener todas las relaciones usuario-carrera con filtros opcionales"""
+    """
+    Obtener todas las relaciones usuario-carrera con filtros opcionales.
+    Sin 'skip' se pagina por cursor: si hay más resultados, el header
+    X-Next-Cursor trae el valor para pedir la página siguiente.
+    """
+    if cursor is not None and (skip or param):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'cursor' no puede combinarse con 'skip' ni con búsquedas por 'param'"
+        )
+    
     try:
         if param is not None:
             valid_params = ["id", "id_usuario", "id_carrera", "status"]
@@ -35,7 +48,13 @@ async def get_all_usuario_carreras(
             relaciones = await UsuarioCarreraService.search_usuario_carreras(db, param, value, skip, limit, status_filter)
             return relaciones
 
-        return await UsuarioCarreraService.get_all_usuario_carreras(db, skip, limit, status_filter)
+        if skip:
+            return await UsuarioCarreraService.get_all_usuario_carreras(db, skip, limit, status_filter)
+        relaciones, next_cursor = await UsuarioCarreraService.get_usuario_carreras_page(db, limit, cursor, status_filter)
+        set_next_cursor(response, next_cursor)
+        return relaciones
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
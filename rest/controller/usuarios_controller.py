@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, status, Query, Depends
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Response, Request
+from fastapi.responses import StreamingResponse, JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any, Union
 import uuid
@@ -6,8 +7,11 @@ from ..schemas.usuario_schema import (
     UsuarioCreate, UsuarioUpdate, Usuario, UsuarioConRol
 )
 from ..service.usuario_service import UsuarioService
+from ..service.usuario_import_service import UsuarioImportService, parse_csv_stream, parse_ndjson_stream
+from ..service.usuario_export_service import UsuarioExportService
 from ..database import get_async_db
 from ..security import get_current_user
+from ..pagination import InvalidCursorError, set_next_cursor
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -30,15 +34,84 @@ async def create_user(
         "message": "User created successfully"
     }
 
+@router.post("/import", response_model=dict)
+async def import_users(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Formato del cuerpo: csv o ndjson (por defecto se toma del Content-Type)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Alta masiva de usuarios desde un CSV (con encabezado) o NDJSON enviado como cuerpo.
+    Cada fila se valida como UsuarioCreate; el reporte indica por fila si se creó
+    (con legajo, email institucional y contraseña generada) o los errores encontrados.
+    """
+    content_type = request.headers.get("content-type", "").lower()
+    if format is None:
+        if "csv" in content_type:
+            format = "csv"
+        elif "ndjson" in content_type or "jsonl" in content_type or "json" in content_type:
+            format = "ndjson"
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Enviar el cuerpo como text/csv o application/x-ndjson, o indicar 'format'"
+            )
+
+    parser = parse_csv_stream if format == "csv" else parse_ndjson_stream
+    return await UsuarioImportService.import_users(db, parser(request.stream()))
+
+@router.get("/export")
+async def export_users(
+    format: str = Query("ndjson", pattern="^(csv|ndjson)$", description="Formato de salida: ndjson o csv"),
+    status_filter: Optional[bool] = Query(None, description="Filtrar por estado activo/inactivo"),
+    id_rol: Optional[uuid.UUID] = Query(None, description="Filtrar por rol"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Exportar todos los usuarios (con rol, sueldo y carrera) en streaming.
+    No tiene límite de filas: se lee la tabla por lotes con un cursor del servidor.
+    """
+    if format == "csv":
+        return StreamingResponse(
+            UsuarioExportService.export_users("csv", status_filter, id_rol),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="usuarios.csv"'}
+        )
+    return StreamingResponse(
+        UsuarioExportService.export_users("ndjson", status_filter, id_rol),
+        media_type="application/x-ndjson"
+    )
+
 @router.get("/", response_model=List[UsuarioConRol], response_model_exclude_none=True)
 async def get_all_users(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor opaco del header X-Next-Cursor para obtener la página siguiente"),
     param: Optional[str] = Query(None, description="Parámetro de búsqueda opcional: id, legajo, dni, email_institucional, email_personal, nombre, status"),
     value: Optional[str] = Query(None, description="Valor a buscar cuando se usa 'param'"),
     status_filter: Optional[bool] = Query(None),
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por coma (ej: id_usuario,nombre,apellido,legajo)"),
+    expand: Optional[str] = Query(None, description="Relaciones a incluir separadas por coma: rol, sueldo, carrera"),
     db: AsyncSession = Depends(get_async_db)
 ):
+    """
+    Listar usuarios. Sin 'skip' se pagina por cursor: si hay más resultados,
+    el header X-Next-Cursor trae el valor para pedir la página siguiente.
+    Con 'fields' y/o 'expand' solo se leen y devuelven los campos y relaciones pedidos.
+    """
+    if cursor is not None and (skip or param):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'cursor' no puede combinarse con 'skip' ni con búsquedas por 'param'"
+        )
+
+    try:
+        fieldset = UsuarioService.parse_fieldset(fields, expand)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     if param is not None:
         valid_params = [
             "id", "legajo", "dni", "email_institucional", "email_personal",
@@ -54,9 +127,32 @@ async def get_all_users(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="When 'param' is provided, 'value' must also be provided"
             )
-        return await UsuarioService.search(db, param, value, skip, limit, status_filter)
+        usuarios = await UsuarioService.search(db, param, value, skip, limit, status_filter)
+        if fieldset is not None:
+            return JSONResponse(UsuarioService.project_usuarios_con_rol(usuarios, fieldset))
+        return usuarios
+
+    if fieldset is not None:
+        # Respuesta proyectada: se arma como JSON directamente, sin validar contra UsuarioConRol
+        if skip:
+            return JSONResponse(await UsuarioService.get_all_users_sparse(db, fieldset, skip, limit, status_filter))
+        try:
+            usuarios, next_cursor = await UsuarioService.get_users_page_sparse(db, fieldset, limit, cursor, status_filter)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        sparse_response = JSONResponse(usuarios)
+        set_next_cursor(sparse_response, next_cursor)
+        return sparse_response
+
+    if skip:
+        return await UsuarioService.get_all_users(db, skip, limit, status_filter)
 
-    return await UsuarioService.get_all_users(db, skip, limit, status_filter)
+    try:
+        usuarios, next_cursor = await UsuarioService.get_users_page(db, limit, cursor, status_filter)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    set_next_cursor(response, next_cursor)
+    return usuarios
 
 @router.put("/{user_id}", response_model=Usuario)
 async def update_user(
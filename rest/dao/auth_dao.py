@@ -1,10 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_
+from sqlalchemy import and_, update
 from sqlalchemy.orm import selectinload
 from ..models.usuario_model import Usuario
 from ..models.rol_model import Rol
-from .usuario_dao import UsuarioDAO
+from .queries import row_exists
 from typing import Optional
 import uuid
 
@@ -34,7 +34,24 @@ class AuthDAO:
     async def verify_user_exists_and_active(db: AsyncSession, email_institucional: str) -> bool:
         """
         Verificar que un usuario existe y está activo por email institucional
-        Usa el método existente del UsuarioDAO
         """
-        user = await UsuarioDAO.get_by_email_institucional(db, email_institucional)
-        return user is not None and user.status
\ No newline at end of file
+        return await row_exists(
+            db,
+            Usuario.email_institucional == email_institucional,
+            Usuario.status == True
+        )
+    
+    @staticmethod
+    async def update_password_hash(db: AsyncSession, user_id: uuid.UUID, old_hash: str, new_hash: str) -> bool:
+        """
+        Reemplazar el hash de contraseña solo si sigue siendo `old_hash`,
+        para no pisar un cambio de contraseña concurrente
+        """
+        query = update(Usuario).where(
+            and_(
+                Usuario.id_usuario == user_id,
+                Usuario.contraseña == old_hash
+            )
+        ).values(contraseña=new_hash)
+        result = await db.execute(query)
+        return result.rowcount > 0
@@ -3,7 +3,9 @@ from sqlalchemy.future import select
 from sqlalchemy import update, and_, or_, func
 from ..models.clase_individual_model import ClaseIndividual, EstadoClase, TipoClase
 from ..schemas.clase_individual_schema import ClaseIndividualCreate, ClaseIndividualUpdate
-from typing import List, Optional, Dict, Any
+from ..pagination import keyset_page
+from .queries import row_exists
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, date
 import uuid
 
@@ -24,7 +26,7 @@ class ClaseIndividualDAO:
         
         db_clase = ClaseIndividual(**clase_data)
         db.add(db_clase)
-        await db.commit()
+        await db.flush()
         await db.refresh(db_clase)
         return db_clase
     
@@ -53,12 +55,27 @@ class ClaseIndividualDAO:
             # Por defecto solo mostrar activas
             query = query.where(ClaseIndividual.status == True)
         
-        query = query.order_by(ClaseIndividual.fecha_clase.desc())
+        query = query.order_by(ClaseIndividual.fecha_clase.desc(), ClaseIndividual.id_clase.desc())
         query = query.offset(skip).limit(limit)
         
         result = await db.execute(query)
         return result.scalars().all()
     
+    @staticmethod
+    async def get_page(db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, status_filter: Optional[bool] = None) -> Tuple[List[ClaseIndividual], Optional[str]]:
+        """Obtener una página de clases por keyset sobre (fecha_clase, id_clase) descendente"""
+        query = select(ClaseIndividual)
+        
+        if status_filter is not None:
+            query = query.where(ClaseIndividual.status == status_filter)
+        else:
+            # Por defecto solo mostrar activas
+            query = query.where(ClaseIndividual.status == True)
+        
+        return await keyset_page(
+            db, query, [ClaseIndividual.fecha_clase, ClaseIndividual.id_clase], limit, cursor, descending=True
+        )
+    
     @staticmethod
     async def get_by_curso(db: AsyncSession, id_curso: uuid.UUID, skip: int = 0, limit: int = 100, status_filter: Optional[bool] = None) -> List[ClaseIndividual]:
         """Obtener clases por curso"""
@@ -157,7 +174,6 @@ class ClaseIndividualDAO:
         if update_data:
             query = update(ClaseIndividual).where(ClaseIndividual.id_clase == id_clase).values(**update_data)
             await db.execute(query)
-            await db.commit()
         
         return await ClaseIndividualDAO.get_by_id(db, id_clase)
     
@@ -169,7 +185,6 @@ class ClaseIndividualDAO:
         ).values(status=False)
         
         result = await db.execute(query)
-        await db.commit()
         
         return result.rowcount > 0
     
@@ -209,15 +224,12 @@ class ClaseIndividualDAO:
     @staticmethod
     async def exists_by_curso_and_fecha(db: AsyncSession, id_curso: uuid.UUID, fecha_clase: date) -> bool:
         """Verificar si existe una clase para un curso en una fecha específica"""
-        query = select(ClaseIndividual).where(
-            and_(
-                ClaseIndividual.id_curso == id_curso,
-                ClaseIndividual.fecha_clase == fecha_clase,
-                ClaseIndividual.status == True
-            )
+        return await row_exists(
+            db,
+            ClaseIndividual.id_curso == id_curso,
+            ClaseIndividual.fecha_clase == fecha_clase,
+            ClaseIndividual.status == True
         )
-        result = await db.execute(query)
-        return result.scalar_one_or_none() is not None
     
     @staticmethod
     async def search(db: AsyncSession, param: str, value: str, skip: int = 0, limit: int = 100) -> List[ClaseIndividual]:
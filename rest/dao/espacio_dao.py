@@ -1,10 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update, and_, join
+from sqlalchemy import update, and_, join, func
 from ..models.espacio_model import Espacio
 from ..models.sede_model import Sede
 from ..schemas.espacio_schema import EspacioCreate, EspacioUpdate, EspacioConSede
-from typing import List, Optional
+from ..pagination import keyset_page
+from .queries import row_exists
+from typing import List, Optional, Tuple
 import uuid
 
 class EspacioDAO:
@@ -21,7 +23,7 @@ class EspacioDAO:
             estado=espacio.estado
         )
         db.add(db_espacio)
-        await db.commit()
+        await db.flush()
         await db.refresh(db_espacio)
         return db_espacio
     
@@ -45,10 +47,18 @@ class EspacioDAO:
             query = query.where(Espacio.status == status_filter)
         # Si es None, no agregamos filtro para obtener todos
         
-        query = query.offset(skip).limit(limit)
+        query = query.order_by(Espacio.id_espacio).offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
     
+    @staticmethod
+    async def get_page(db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, status_filter: Optional[bool] = None) -> Tuple[List[Espacio], Optional[str]]:
+        """Obtener una página de espacios por keyset sobre id_espacio"""
+        query = select(Espacio)
+        if status_filter is not None:
+            query = query.where(Espacio.status == status_filter)
+        return await keyset_page(db, query, [Espacio.id_espacio], limit, cursor)
+    
     @staticmethod
     async def get_by_sede(db: AsyncSession, id_sede: uuid.UUID, skip: int = 0, limit: int = 100) -> List[Espacio]:
         """Obtener espacios por sede"""
@@ -167,7 +177,6 @@ class EspacioDAO:
         if update_data:
             query = update(Espacio).where(Espacio.id_espacio == id_espacio).values(**update_data)
             await db.execute(query)
-            await db.commit()
         
         return await EspacioDAO.get_by_id(db, id_espacio, include_inactive=True)
     
@@ -176,32 +185,24 @@ class EspacioDAO:
         """Eliminación lógica de un espacio"""
         query = update(Espacio).where(Espacio.id_espacio == id_espacio).values(status=False)
         result = await db.execute(query)
-        await db.commit()
         return result.rowcount > 0
     
     @staticmethod
     async def exists_by_nombre_and_sede(db: AsyncSession, nombre: str, id_sede: uuid.UUID) -> bool:
         """Verificar si existe un espacio con ese nombre en esa sede"""
-        query = select(Espacio).where(
-            and_(
-                Espacio.nombre == nombre,
-                Espacio.id_sede == id_sede
-            )
-        )
-        result = await db.execute(query)
-        return result.scalar_one_or_none() is not None
+        return await row_exists(db, Espacio.nombre == nombre, Espacio.id_sede == id_sede)
     
     @staticmethod
     async def count_by_sede(db: AsyncSession, id_sede: uuid.UUID) -> int:
         """Contar espacios activos por sede"""
-        query = select(Espacio).where(
+        query = select(func.count(Espacio.id_espacio)).where(
             and_(
                 Espacio.id_sede == id_sede,
                 Espacio.status == True
             )
         )
         result = await db.execute(query)
-        return len(result.scalars().all())
+        return result.scalar() or 0
     
     @staticmethod
     async def get_comedores_by_sede(db: AsyncSession, id_sede: uuid.UUID) -> List[Espacio]:
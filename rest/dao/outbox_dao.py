@@ -0,0 +1,78 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import and_, update, delete, func
+from ..models.outbox_model import OutboxEvent
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+
+class OutboxDAO:
+
+    @staticmethod
+    async def add(db: AsyncSession, message: Dict[str, Any], exchange_name: str, routing_key: str) -> OutboxEvent:
+        """Registrar un evento en la transacción de la request (se publica después del commit)"""
+        db_event = OutboxEvent(
+            event_id=message.get("eventId"),
+            exchange_name=exchange_name,
+            routing_key=routing_key,
+            payload=message,
+            attempts=0
+        )
+        db.add(db_event)
+        await db.flush()
+        return db_event
+
+    @staticmethod
+    def _pending():
+        return and_(OutboxEvent.published_at.is_(None), OutboxEvent.failed_at.is_(None))
+
+    @staticmethod
+    async def claim_batch(db: AsyncSession, limit: int) -> List[OutboxEvent]:
+        """
+        Tomar los próximos `limit` eventos pendientes en orden de id, bloqueándolos
+        hasta el commit. SKIP LOCKED permite varias instancias del relay sin que
+        se publiquen dos veces los mismos eventos.
+        """
+        query = select(OutboxEvent).where(
+            OutboxDAO._pending()
+        ).order_by(OutboxEvent.id).limit(limit).with_for_update(skip_locked=True)
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def mark_published(db: AsyncSession, ids: List[int], published_at: datetime) -> int:
+        """Marcar eventos como publicados"""
+        if not ids:
+            return 0
+        query = update(OutboxEvent).where(OutboxEvent.id.in_(ids)).values(published_at=published_at)
+        result = await db.execute(query)
+        return result.rowcount
+
+    @staticmethod
+    async def mark_failed(db: AsyncSession, event_id: int, attempts: int, error: str, failed_at: Optional[datetime] = None) -> bool:
+        """Registrar un intento fallido; con `failed_at` el evento se descarta y deja de reintentarse"""
+        query = update(OutboxEvent).where(OutboxEvent.id == event_id).values(
+            attempts=attempts,
+            last_error=error,
+            failed_at=failed_at
+        )
+        result = await db.execute(query)
+        return result.rowcount > 0
+
+    @staticmethod
+    async def get_backlog(db: AsyncSession) -> Tuple[int, Optional[datetime]]:
+        """Cantidad de eventos pendientes y fecha del más antiguo"""
+        query = select(func.count(OutboxEvent.id), func.min(OutboxEvent.created_at)).where(OutboxDAO._pending())
+        result = await db.execute(query)
+        row = result.first()
+        if row is None:
+            return 0, None
+        return row[0] or 0, row[1]
+
+    @staticmethod
+    async def delete_published_before(db: AsyncSession, cutoff: datetime) -> int:
+        """Eliminar los eventos ya publicados antes de `cutoff`"""
+        query = delete(OutboxEvent).where(
+            and_(OutboxEvent.published_at.is_not(None), OutboxEvent.published_at < cutoff)
+        )
+        result = await db.execute(query)
+        return result.rowcount
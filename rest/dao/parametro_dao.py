@@ -3,7 +3,9 @@ from sqlalchemy.future import select
 from sqlalchemy import update, and_
 from ..models.parametro_model import Parametro
 from ..schemas.parametro_schema import ParametroCreate, ParametroUpdate
-from typing import List, Optional, Dict
+from ..pagination import keyset_page
+from .queries import row_exists
+from typing import List, Optional, Dict, Tuple
 import uuid
 
 class ParametroDAO:
@@ -18,7 +20,7 @@ class ParametroDAO:
             valor_texto=parametro.valor_texto
         )
         db.add(db_parametro)
-        await db.commit()
+        await db.flush()
         await db.refresh(db_parametro)
         return db_parametro
     
@@ -53,10 +55,18 @@ class ParametroDAO:
             query = query.where(Parametro.status == status_filter)
         # Si es None, no filtrar y devolver todos los registros
         
-        query = query.offset(skip).limit(limit)
+        query = query.order_by(Parametro.id_parametro).offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
     
+    @staticmethod
+    async def get_page(db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, status_filter: Optional[bool] = None) -> Tuple[List[Parametro], Optional[str]]:
+        """Obtener una página de parámetros por keyset sobre id_parametro"""
+        query = select(Parametro)
+        if status_filter is not None:
+            query = query.where(Parametro.status == status_filter)
+        return await keyset_page(db, query, [Parametro.id_parametro], limit, cursor)
+    
     @staticmethod
     async def get_by_tipo(db: AsyncSession, tipo: str, skip: int = 0, limit: int = 100) -> List[Parametro]:
         """Obtener parámetros por tipo"""
@@ -89,7 +99,6 @@ class ParametroDAO:
         if update_data:
             query = update(Parametro).where(Parametro.id_parametro == id_parametro).values(**update_data)
             await db.execute(query)
-            await db.commit()
         
         return await ParametroDAO.get_by_id(db, id_parametro, include_inactive=True)
     
@@ -98,17 +107,15 @@ class ParametroDAO:
         """Eliminación lógica de un parámetro"""
         query = update(Parametro).where(Parametro.id_parametro == id_parametro).values(status=False)
         result = await db.execute(query)
-        await db.commit()
         return result.rowcount > 0
     
     @staticmethod
     async def exists_by_nombre(db: AsyncSession, nombre: str, exclude_id: Optional[uuid.UUID] = None) -> bool:
         """Verificar si existe un parámetro con ese nombre"""
-        query = select(Parametro).where(Parametro.nombre == nombre)
+        criteria = [Parametro.nombre == nombre]
         if exclude_id:
-            query = query.where(Parametro.id_parametro != exclude_id)
-        result = await db.execute(query)
-        return result.scalar_one_or_none() is not None
+            criteria.append(Parametro.id_parametro != exclude_id)
+        return await row_exists(db, *criteria)
     
     @staticmethod
     async def get_valores_by_nombre(db: AsyncSession, nombre: str) -> Optional[Dict[str, any]]:
@@ -0,0 +1,12 @@
+from sqlalchemy import and_, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def row_exists(db: AsyncSession, *criteria) -> bool:
+    """
+    Verificar si hay al menos una fila que cumpla `criteria` con SELECT EXISTS(...).
+    No trae columnas ni hidrata entidades, y el motor corta en la primera
+    coincidencia; con un índice que cubra los criterios se resuelve sin leer la tabla.
+    """
+    result = await db.execute(select(exists().where(and_(*criteria))))
+    return bool(result.scalar())
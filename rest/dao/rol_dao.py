@@ -3,7 +3,8 @@ from sqlalchemy.future import select
 from sqlalchemy import update
 from ..models.rol_model import Rol
 from ..schemas.rol_schema import RolBase, RolUpdate
-from typing import List, Optional
+from .queries import row_exists
+from typing import Dict, List, Optional
 import uuid
 
 class RolDAO:
@@ -19,7 +20,7 @@ class RolDAO:
             status=True  # Siempre se crea como activo
         )
         db.add(db_rol)
-        await db.commit()
+        await db.flush()
         await db.refresh(db_rol)
         return db_rol
     
@@ -32,6 +33,22 @@ class RolDAO:
         result = await db.execute(query)
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def exists(db: AsyncSession, id_rol: uuid.UUID, status_filter: Optional[bool] = None) -> bool:
+        """Verificar si existe el rol (opcionalmente filtrando por status)"""
+        criteria = [Rol.id_rol == id_rol]
+        if status_filter is not None:
+            criteria.append(Rol.status == status_filter)
+        return await row_exists(db, *criteria)
+    
+    @staticmethod
+    async def get_by_ids(db: AsyncSession, ids_rol: List[uuid.UUID]) -> Dict[uuid.UUID, Rol]:
+        """Obtener varios roles por ID en una sola consulta"""
+        if not ids_rol:
+            return {}
+        result = await db.execute(select(Rol).where(Rol.id_rol.in_(ids_rol)))
+        return {rol.id_rol: rol for rol in result.scalars().all()}
+    
     @staticmethod
     async def search_by_categoria(db: AsyncSession, categoria_pattern: str, status_filter: Optional[bool] = None) -> List[Rol]:
         query = select(Rol).where(
@@ -88,7 +105,6 @@ class RolDAO:
         if update_data:
             query = update(Rol).where(Rol.id_rol == id_rol).values(**update_data)
             await db.execute(query)
-            await db.commit()
         
         return await RolDAO.get_by_id(db, id_rol)
     
@@ -97,7 +113,6 @@ class RolDAO:
         """Eliminación lógica: cambiar status a False"""
         query = update(Rol).where(Rol.id_rol == id_rol).values(status=False)
         result = await db.execute(query)
-        await db.commit()
         return result.rowcount > 0
 
     @staticmethod
@@ -3,7 +3,9 @@ from sqlalchemy.future import select
 from sqlalchemy import and_, update, func
 from ..models.sede_model import Sede
 from ..schemas.sede_schema import SedeCreate, SedeUpdate
-from typing import List, Optional
+from ..pagination import keyset_page
+from .queries import row_exists
+from typing import List, Optional, Tuple
 import uuid
 
 class SedeDAO:
@@ -16,7 +18,7 @@ class SedeDAO:
             ubicacion=sede.ubicacion
         )
         db.add(db_sede)
-        await db.commit()
+        await db.flush()
         await db.refresh(db_sede)
         return db_sede
     
@@ -29,6 +31,14 @@ class SedeDAO:
         result = await db.execute(query)
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def exists(db: AsyncSession, id_sede: uuid.UUID, include_inactive: bool = False) -> bool:
+        """Verificar si existe la sede"""
+        criteria = [Sede.id_sede == id_sede]
+        if not include_inactive:
+            criteria.append(Sede.status == True)
+        return await row_exists(db, *criteria)
+    
     @staticmethod
     async def get_by_nombre(db: AsyncSession, nombre: str) -> Optional[Sede]:
         """Obtener sede por nombre único"""
@@ -51,10 +61,18 @@ class SedeDAO:
             query = query.where(Sede.status == status_filter)
         # Si es None, no filtrar y devolver todos los registros
         
-        query = query.offset(skip).limit(limit)
+        query = query.order_by(Sede.id_sede).offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
     
+    @staticmethod
+    async def get_page(db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, status_filter: Optional[bool] = None) -> Tuple[List[Sede], Optional[str]]:
+        """Obtener una página de sedes por keyset sobre id_sede"""
+        query = select(Sede)
+        if status_filter is not None:
+            query = query.where(Sede.status == status_filter)
+        return await keyset_page(db, query, [Sede.id_sede], limit, cursor)
+    
     @staticmethod
     async def search_by_nombre(db: AsyncSession, nombre_pattern: str, skip: int = 0, limit: int = 100) -> List[Sede]:
         """Buscar sedes por patrón en el nombre"""
@@ -87,7 +105,6 @@ class SedeDAO:
         if update_data:
             query = update(Sede).where(Sede.id_sede == id_sede).values(**update_data)
             await db.execute(query)
-            await db.commit()
         
         return await SedeDAO.get_by_id(db, id_sede, include_inactive=True)
     
@@ -96,12 +113,9 @@ class SedeDAO:
         """Eliminación lógica de una sede"""
         query = update(Sede).where(Sede.id_sede == id_sede).values(status=False)
         result = await db.execute(query)
-        await db.commit()
         return result.rowcount > 0
     
     @staticmethod
     async def exists_by_nombre(db: AsyncSession, nombre: str) -> bool:
         """Verificar si existe una sede con ese nombre"""
-        query = select(Sede).where(Sede.nombre == nombre)
-        result = await db.execute(query)
-        return result.scalar_one_or_none() is not None
\ No newline at end of file
+        return await row_exists(db, Sede.nombre == nombre)
\ No newline at end of file
@@ -6,7 +6,9 @@ from ..models.sueldo_model import Sueldo
 from ..models.usuario_model import Usuario
 from ..models.rol_model import Rol
 from ..schemas.sueldo_schema import SueldoBase, SueldoUpdate
-from typing import List, Optional
+from ..pagination import keyset_page
+from .queries import row_exists
+from typing import Dict, List, Optional, Tuple
 import uuid
 
 class SueldoDAO:
@@ -22,7 +24,7 @@ class SueldoDAO:
             status=True 
         )
         db.add(db_sueldo)
-        await db.commit()
+        await db.flush()
         await db.refresh(db_sueldo)
         return db_sueldo
     
@@ -54,6 +56,20 @@ class SueldoDAO:
         result = await db.execute(query)
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_active_by_usuarios(db: AsyncSession, ids_usuario: List[uuid.UUID]) -> Dict[uuid.UUID, Sueldo]:
+        """Obtener en una sola consulta el sueldo activo de cada usuario indicado."""
+        if not ids_usuario:
+            return {}
+        query = select(Sueldo).where(
+            and_(Sueldo.id_usuario.in_(ids_usuario), Sueldo.status == True)
+        )
+        result = await db.execute(query)
+        sueldos: Dict[uuid.UUID, Sueldo] = {}
+        for sueldo in result.scalars().all():
+            sueldos.setdefault(sueldo.id_usuario, sueldo)
+        return sueldos
+    
     @staticmethod
     async def get_all(db: AsyncSession, skip: int = 0, limit: int = 100, status_filter: Optional[bool] = None) -> List[Sueldo]:
         """Obtener todos los sueldos con filtros"""
@@ -62,10 +78,18 @@ class SueldoDAO:
         if status_filter is not None:
             query = query.where(Sueldo.status == status_filter)
         
-        query = query.offset(skip).limit(limit)
+        query = query.order_by(Sueldo.id_sueldo).offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
     
+    @staticmethod
+    async def get_page(db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, status_filter: Optional[bool] = None) -> Tuple[List[Sueldo], Optional[str]]:
+        """Obtener una página de sueldos por keyset sobre id_sueldo"""
+        query = select(Sueldo)
+        if status_filter is not None:
+            query = query.where(Sueldo.status == status_filter)
+        return await keyset_page(db, query, [Sueldo.id_sueldo], limit, cursor)
+    
     @staticmethod
     async def update(db: AsyncSession, sueldo_id: uuid.UUID, sueldo_update: SueldoUpdate) -> Optional[Sueldo]:
         """Actualizar un sueldo"""
@@ -74,7 +98,6 @@ class SueldoDAO:
         if update_data:
             query = update(Sueldo).where(Sueldo.id_sueldo == sueldo_id).values(**update_data)
             await db.execute(query)
-            await db.commit()
         
         return await SueldoDAO.get_by_id(db, sueldo_id)
     
@@ -83,7 +106,6 @@ class SueldoDAO:
         """Eliminación lógica: cambiar status a False"""
         query = update(Sueldo).where(Sueldo.id_sueldo == sueldo_id).values(status=False)
         result = await db.execute(query)
-        await db.commit()
         return result.rowcount > 0
     
     @staticmethod
@@ -91,20 +113,17 @@ class SueldoDAO:
         """Reactivar sueldo de un usuario (cambiar status a True)"""
         query = update(Sueldo).where(Sueldo.id_usuario == id_usuario).values(status=True)
         result = await db.execute(query)
-        await db.commit()
         return result.rowcount > 0
     
     @staticmethod
     async def exists_by_usuario(db: AsyncSession, id_usuario: uuid.UUID) -> bool:
         """Verificar si existe un sueldo activo para el usuario"""
-        query = select(Sueldo).where(
-            and_(
-                Sueldo.id_usuario == id_usuario,
-                Sueldo.status == True
-            )
-        )
-        result = await db.execute(query)
-        return result.scalar_one_or_none() is not None
+        return await row_exists(db, Sueldo.id_usuario == id_usuario, Sueldo.status == True)
+    
+    @staticmethod
+    async def exists(db: AsyncSession, sueldo_id: uuid.UUID) -> bool:
+        """Verificar si existe un sueldo activo con ese ID"""
+        return await row_exists(db, Sueldo.id_sueldo == sueldo_id, Sueldo.status == True)
     
     @staticmethod
     async def search(db: AsyncSession, param: str, value: str, skip: int = 0, limit: int = 100) -> List[Sueldo]:
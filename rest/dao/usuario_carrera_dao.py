@@ -3,7 +3,9 @@ from sqlalchemy.future import select
 from sqlalchemy import and_, update
 from ..models.usuario_carrera_model import UsuarioCarrera
 from ..schemas.usuario_carrera_schema import UsuarioCarreraCreate
-from typing import List, Optional
+from ..pagination import keyset_page
+from .queries import row_exists
+from typing import Dict, List, Optional, Tuple
 import uuid
 
 class UsuarioCarreraDAO:
@@ -17,7 +19,7 @@ class UsuarioCarreraDAO:
             status=True
         )
         db.add(db_usuario_carrera)
-        await db.commit()
+        await db.flush()
         await db.refresh(db_usuario_carrera)
         return db_usuario_carrera
     
@@ -37,6 +39,20 @@ class UsuarioCarreraDAO:
         
         return carrera
     
+    @staticmethod
+    async def get_active_by_usuarios(db: AsyncSession, ids_usuario: List[uuid.UUID]) -> Dict[uuid.UUID, UsuarioCarrera]:
+        """Obtener en una sola consulta la carrera activa de cada usuario indicado."""
+        if not ids_usuario:
+            return {}
+        query = select(UsuarioCarrera).where(
+            and_(UsuarioCarrera.id_usuario.in_(ids_usuario), UsuarioCarrera.status == True)
+        )
+        result = await db.execute(query)
+        carreras: Dict[uuid.UUID, UsuarioCarrera] = {}
+        for carrera in result.scalars().all():
+            carreras.setdefault(carrera.id_usuario, carrera)
+        return carreras
+    
     @staticmethod
     async def get_usuarios_by_carrera(db: AsyncSession, id_carrera: uuid.UUID, status_filter: Optional[bool] = None) -> List[UsuarioCarrera]:
         """Obtener todos los usuarios de una carrera con filtros opcionales"""
@@ -61,7 +77,6 @@ class UsuarioCarreraDAO:
             )
         ).values(status=False)
         result = await db.execute(query)
-        await db.commit()
         return result.rowcount > 0
     
     @staticmethod
@@ -74,21 +89,17 @@ class UsuarioCarreraDAO:
         """Reactivar carrera de un usuario (cambiar status a True)"""
         query = update(UsuarioCarrera).where(UsuarioCarrera.id_usuario == id_usuario).values(status=True)
         result = await db.execute(query)
-        await db.commit()
         return result.rowcount > 0
     
     @staticmethod
     async def exists(db: AsyncSession, id_usuario: uuid.UUID, id_carrera: uuid.UUID) -> bool:
         """Verificar si existe la relación usuario-carrera activa"""
-        query = select(UsuarioCarrera).where(
-            and_(
-                UsuarioCarrera.id_usuario == id_usuario,
-                UsuarioCarrera.id_carrera == id_carrera,
-                UsuarioCarrera.status == True
-            )
+        return await row_exists(
+            db,
+            UsuarioCarrera.id_usuario == id_usuario,
+            UsuarioCarrera.id_carrera == id_carrera,
+            UsuarioCarrera.status == True
         )
-        result = await db.execute(query)
-        return result.scalar_one_or_none() is not None
     
     @staticmethod
     async def get_all(db: AsyncSession, skip: int = 0, limit: int = 100, status_filter: Optional[bool] = None) -> List[UsuarioCarrera]:
@@ -101,10 +112,21 @@ class UsuarioCarreraDAO:
             # Por defecto solo mostrar activas
             query = query.where(UsuarioCarrera.status == True)
         
-        query = query.offset(skip).limit(limit)
+        query = query.order_by(UsuarioCarrera.id_usuario, UsuarioCarrera.id_carrera).offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
     
+    @staticmethod
+    async def get_page(db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, status_filter: Optional[bool] = None) -> Tuple[List[UsuarioCarrera], Optional[str]]:
+        """Obtener una página de relaciones usuario-carrera por keyset sobre la clave primaria"""
+        query = select(UsuarioCarrera)
+        if status_filter is not None:
+            query = query.where(UsuarioCarrera.status == status_filter)
+        else:
+            # Por defecto solo mostrar activas
+            query = query.where(UsuarioCarrera.status == True)
+        return await keyset_page(db, query, [UsuarioCarrera.id_usuario, UsuarioCarrera.id_carrera], limit, cursor)
+    
     @staticmethod
     async def get_by_id(db: AsyncSession, id_usuario: uuid.UUID, id_carrera: uuid.UUID, status_filter: Optional[bool] = None) -> Optional[UsuarioCarrera]:
         """Obtener relación usuario-carrera por IDs con filtros opcionales"""
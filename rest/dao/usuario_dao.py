@@ -1,11 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update, and_, or_, func
-from sqlalchemy.orm import selectinload
-from ..models.usuario_model import Usuario
+from sqlalchemy import update, insert, and_, or_, func, case, literal_column
+from sqlalchemy.orm import selectinload, joinedload, load_only
+from .. import database
+from ..models.usuario_model import Usuario, legajo_seq
 from ..schemas.usuario_schema import UsuarioCreate, UsuarioUpdate
-from typing import List, Optional, Dict, Any, Union
+from ..pagination import keyset_page
+from .queries import row_exists
+from typing import List, Optional, Dict, Any, Union, Tuple, AsyncIterator, Iterable
 import uuid
+import unicodedata
 from datetime import datetime
 
 class UsuarioDAO:
@@ -21,12 +25,93 @@ class UsuarioDAO:
         
         db_usuario = Usuario(**usuario_data)
         db.add(db_usuario)
-        await db.commit()
+        await db.flush()
         await db.refresh(db_usuario)
         return db_usuario
     
     @staticmethod
-    async def get_all(db: AsyncSession, skip: int = 0, limit: int = 100, status_filter: Optional[bool] = None) -> List[Usuario]:
+    async def create_many(db: AsyncSession, usuarios: List[Dict[str, Any]]) -> None:
+        """
+        Insertar varios usuarios con un único INSERT multi-fila.
+        Cada dict debe traer todas las columnas obligatorias, incluido id_usuario.
+        """
+        if not usuarios:
+            return
+        await db.execute(insert(Usuario), usuarios)
+    
+    @staticmethod
+    def _listing_options(fields: Optional[Iterable[str]] = None, expand: Optional[Iterable[str]] = None) -> list:
+        """
+        Opciones de carga para los listados. Sin argumentos se trae la fila completa
+        con rol, sueldos y carreras; con `fields` solo se leen esas columnas (load_only,
+        siempre con la PK) y solo se cargan las relaciones de `expand` (rol, sueldo, carrera).
+        """
+        if fields is None and expand is None:
+            return [
+                selectinload(Usuario.rol),
+                selectinload(Usuario.sueldos),
+                selectinload(Usuario.carreras)
+            ]
+        
+        expand = set(expand or ())
+        columns = {"id_usuario"} | set(fields or ())
+        if "rol" in expand:
+            columns.add("id_rol")
+        options = [load_only(*[getattr(Usuario, column) for column in sorted(columns)])]
+        if "rol" in expand:
+            options.append(selectinload(Usuario.rol))
+        if "sueldo" in expand:
+            options.append(selectinload(Usuario.sueldos))
+        if "carrera" in expand:
+            options.append(selectinload(Usuario.carreras))
+        return options
+    
+    @staticmethod
+    async def get_all(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        status_filter: Optional[bool] = None,
+        fields: Optional[Iterable[str]] = None,
+        expand: Optional[Iterable[str]] = None
+    ) -> List[Usuario]:
+        query = select(Usuario).options(*UsuarioDAO._listing_options(fields, expand))
+        
+        if status_filter is not None:
+            query = query.where(Usuario.status == status_filter)
+        
+        query = query.order_by(Usuario.id_usuario).offset(skip).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+    
+    @staticmethod
+    async def get_page(
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status_filter: Optional[bool] = None,
+        fields: Optional[Iterable[str]] = None,
+        expand: Optional[Iterable[str]] = None
+    ) -> Tuple[List[Usuario], Optional[str]]:
+        """Obtener una página de usuarios por keyset sobre id_usuario"""
+        query = select(Usuario).options(*UsuarioDAO._listing_options(fields, expand))
+        
+        if status_filter is not None:
+            query = query.where(Usuario.status == status_filter)
+        
+        return await keyset_page(db, query, [Usuario.id_usuario], limit, cursor)
+    
+    @staticmethod
+    async def stream_all(
+        db: AsyncSession,
+        status_filter: Optional[bool] = None,
+        id_rol: Optional[uuid.UUID] = None,
+        batch_size: int = 500
+    ) -> AsyncIterator[List[Usuario]]:
+        """
+        Recorrer todos los usuarios con un cursor del lado del servidor, entregando
+        lotes de `batch_size` con rol, sueldos y carreras ya cargados
+        """
         query = select(Usuario).options(
             selectinload(Usuario.rol),
             selectinload(Usuario.sueldos),
@@ -35,10 +120,13 @@ class UsuarioDAO:
         
         if status_filter is not None:
             query = query.where(Usuario.status == status_filter)
+        if id_rol is not None:
+            query = query.where(Usuario.id_rol == id_rol)
         
-        query = query.offset(skip).limit(limit)
-        result = await db.execute(query)
-        return result.scalars().all()
+        query = query.order_by(Usuario.id_usuario).execution_options(yield_per=batch_size)
+        result = await db.stream(query)
+        async for partition in result.scalars().partitions():
+            yield partition
     
     @staticmethod
     async def get_by_id(db: AsyncSession, user_id: uuid.UUID) -> Optional[Usuario]:
@@ -50,6 +138,33 @@ class UsuarioDAO:
         result = await db.execute(query)
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_by_ids(db: AsyncSession, user_ids: List[uuid.UUID]) -> Dict[uuid.UUID, Usuario]:
+        """Obtener varios usuarios por ID en una sola consulta, con rol, sueldos y carreras"""
+        if not user_ids:
+            return {}
+        query = select(Usuario).options(
+            selectinload(Usuario.rol),
+            selectinload(Usuario.sueldos),
+            selectinload(Usuario.carreras)
+        ).where(Usuario.id_usuario.in_(user_ids))
+        result = await db.execute(query)
+        return {usuario.id_usuario: usuario for usuario in result.scalars().all()}
+    
+    @staticmethod
+    async def get_by_id_joined(db: AsyncSession, user_id: uuid.UUID) -> Optional[Usuario]:
+        """
+        Obtener un usuario con rol, sueldos y carreras en una sola consulta (JOINs).
+        Para lecturas de una fila conviene sobre selectinload, que agrega un round trip por relación.
+        """
+        query = select(Usuario).options(
+            joinedload(Usuario.rol),
+            joinedload(Usuario.sueldos),
+            joinedload(Usuario.carreras)
+        ).where(Usuario.id_usuario == user_id)
+        result = await db.execute(query)
+        return result.unique().scalar_one_or_none()
+    
     @staticmethod
     async def get_by_legajo(db: AsyncSession, legajo: str) -> Optional[Usuario]:
         query = select(Usuario).options(
@@ -60,6 +175,21 @@ class UsuarioDAO:
         result = await db.execute(query)
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_existing_legajos(db: AsyncSession, legajos: List[str]) -> set:
+        """Obtener cuáles de los legajos indicados ya están asignados (una sola consulta, sin relaciones)"""
+        if not legajos:
+            return set()
+        result = await db.execute(select(Usuario.legajo).where(Usuario.legajo.in_(legajos)))
+        return set(result.scalars().all())
+    
+    @staticmethod
+    async def next_legajo_numbers(db: AsyncSession, count: int) -> List[int]:
+        """Reservar `count` números de la secuencia usuarios_legajo_seq en un solo round trip"""
+        query = select(legajo_seq.next_value()).select_from(func.generate_series(1, count))
+        result = await db.execute(query)
+        return list(result.scalars().all())
+    
     @staticmethod
     async def get_by_dni(db: AsyncSession, dni: str) -> List[Usuario]:
         query = select(Usuario).options(
@@ -80,6 +210,21 @@ class UsuarioDAO:
         result = await db.execute(query)
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_emails_institucionales_by_prefixes(db: AsyncSession, prefixes: List[str], domain: str) -> set:
+        """
+        Obtener en una sola consulta los emails institucionales que empiezan con
+        alguno de los `prefixes` y terminan en `@domain`.
+        Los prefijos se resuelven con el índice ix_usuarios_email_institucional_pattern.
+        """
+        if not prefixes:
+            return set()
+        query = select(Usuario.email_institucional).where(
+            or_(*[Usuario.email_institucional.like(f"{prefix}%@{domain}") for prefix in prefixes])
+        )
+        result = await db.execute(query)
+        return {email for email in result.scalars().all() if email}
+    
     @staticmethod
     async def get_by_email_personal(db: AsyncSession, email: str) -> Optional[Usuario]:
         query = select(Usuario).options(
@@ -90,38 +235,107 @@ class UsuarioDAO:
         result = await db.execute(query)
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def exists_by_email_personal(db: AsyncSession, email: str, exclude_id: Optional[uuid.UUID] = None) -> bool:
+        """Verificar si el email personal ya está registrado (opcionalmente en otro usuario)"""
+        criteria = [Usuario.email_personal == email]
+        if exclude_id:
+            criteria.append(Usuario.id_usuario != exclude_id)
+        return await row_exists(db, *criteria)
+    
+    @staticmethod
+    def _normalize_search_term(search_term: str) -> str:
+        """Pasar a minúsculas y quitar acentos, igual que immutable_unaccent(lower(...))"""
+        decomposed = unicodedata.normalize('NFKD', search_term.strip().lower())
+        return ''.join(c for c in decomposed if not unicodedata.combining(c))
+    
     @staticmethod
     async def search_by_name(db: AsyncSession, search_term: str, skip: int = 0, limit: int = 100) -> List[Usuario]:
+        """
+        Buscar usuarios por nombre y/o apellido ordenados por relevancia.
+        
+        En PostgreSQL con pg_trgm/unaccent la búsqueda ignora acentos, tolera errores
+        de tipeo (word_similarity) y usa el índice GIN ix_usuarios_nombre_completo_trgm.
+        En otros motores se usa una búsqueda por subcadena que prioriza los prefijos.
+        """
         query = select(Usuario).options(
             selectinload(Usuario.rol),
             selectinload(Usuario.sueldos),
             selectinload(Usuario.carreras)
-        ).where(
-            or_(
-                func.lower(Usuario.nombre).contains(search_term.lower()),
-                func.lower(Usuario.apellido).contains(search_term.lower()),
-                func.lower(func.concat(Usuario.nombre, ' ', Usuario.apellido)).contains(search_term.lower())
+        )
+        
+        if database.FUZZY_SEARCH_ENABLED:
+            term = UsuarioDAO._normalize_search_term(search_term)
+            # Misma expresión que el índice para que el planner pueda usarlo
+            nombre_completo = func.immutable_unaccent(
+                func.lower(Usuario.nombre.op('||')(literal_column("' '")).op('||')(Usuario.apellido))
+            )
+            query = query.where(
+                or_(
+                    nombre_completo.contains(term, autoescape=True),
+                    nombre_completo.op('%>')(term)
+                )
+            ).order_by(
+                func.word_similarity(term, nombre_completo).desc(),
+                Usuario.id_usuario
             )
-        ).offset(skip).limit(limit)
+        else:
+            term = search_term.strip().lower()
+            nombre = func.lower(Usuario.nombre)
+            apellido = func.lower(Usuario.apellido)
+            # || en lugar de concat(): concat() no existe en todos los motores (ej: SQLite < 3.44)
+            nombre_completo = func.lower(Usuario.nombre + ' ' + Usuario.apellido)
+            query = query.where(
+                or_(
+                    nombre.contains(term, autoescape=True),
+                    apellido.contains(term, autoescape=True),
+                    nombre_completo.contains(term, autoescape=True)
+                )
+            ).order_by(
+                case(
+                    (or_(
+                        apellido.startswith(term, autoescape=True),
+                        nombre.startswith(term, autoescape=True),
+                        nombre_completo.startswith(term, autoescape=True)
+                    ), 0),
+                    else_=1
+                ),
+                apellido,
+                nombre,
+                Usuario.id_usuario
+            )
+        
+        query = query.offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
     
     @staticmethod
     async def update(db: AsyncSession, user_id: uuid.UUID, usuario_update: UsuarioUpdate) -> Optional[Usuario]:
+        """
+        Actualizar con UPDATE ... RETURNING.
+        La fila actualizada vuelve en el mismo round trip; si el usuario ya estaba
+        en la sesión se actualizan sus columnas en memoria y se conservan las
+        relaciones cargadas (sin populate_existing, que las descartaría).
+        """
         update_data = usuario_update.model_dump(exclude_unset=True)
         
-        if update_data:
-            query = update(Usuario).where(Usuario.id_usuario == user_id).values(**update_data)
-            await db.execute(query)
-            await db.commit()
+        if not update_data:
+            return await UsuarioDAO.get_by_id(db, user_id)
         
-        return await UsuarioDAO.get_by_id(db, user_id)
+        query = (
+            update(Usuario)
+            .where(Usuario.id_usuario == user_id)
+            .values(**update_data)
+            .returning(Usuario)
+        )
+        result = await db.execute(query)
+        usuario = result.scalar_one_or_none()
+        return usuario
     
     @staticmethod
     async def delete(db: AsyncSession, user_id: uuid.UUID) -> bool:
         query = update(Usuario).where(Usuario.id_usuario == user_id).values(status=False)
         result = await db.execute(query)
-        await db.commit()
         return result.rowcount > 0
     
     @staticmethod
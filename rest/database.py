@@ -1,4 +1,6 @@
 import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy import text
 from dotenv import load_dotenv
@@ -14,6 +16,24 @@ LOCAL_DATABASE_URL = os.getenv('DATABASE_URL', '')
 engine = None
 AsyncSessionLocal = None
 CONNECTION_TYPE = "No inicializado"
+# True cuando pg_trgm/unaccent y el índice de búsqueda de usuarios están disponibles
+FUZZY_SEARCH_ENABLED = False
+
+# Expresión indexada para la búsqueda de usuarios por nombre (debe coincidir con UsuarioDAO)
+_FUZZY_SEARCH_SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    # unaccent() no es IMMUTABLE y no se puede usar en un índice; se envuelve fijando el diccionario
+    """
+    CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS
+    $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_usuarios_nombre_completo_trgm ON usuarios
+    USING gin (immutable_unaccent(lower(nombre || ' ' || apellido)) gin_trgm_ops)
+    """,
+]
 
 
 def _normalize_to_asyncpg(url: str) -> str:
@@ -67,7 +87,7 @@ async def _get_database_url() -> tuple[str, str]:
 
 
 async def init_database():
-    global engine, AsyncSessionLocal, CONNECTION_TYPE
+    global engine, AsyncSessionLocal, CONNECTION_TYPE, FUZZY_SEARCH_ENABLED
     
     try:
         database_url, connection_type = await _get_database_url()
@@ -94,7 +114,11 @@ async def init_database():
             async with engine.begin() as conn:
                 #await conn.run_sync(Base.metadata.drop_all)
                 await conn.run_sync(Base.metadata.create_all)
+                # create_all no agrega índices nuevos a tablas existentes
+                await conn.run_sync(_create_missing_indexes)
                 
+            FUZZY_SEARCH_ENABLED = await _setup_fuzzy_search()
+            
             print(f"✅ Base de datos inicializada: {CONNECTION_TYPE}")
             await _list_tables()
             
@@ -107,6 +131,27 @@ async def init_database():
         CONNECTION_TYPE = "Mock (error en inicialización)"
 
 
+async def _setup_fuzzy_search() -> bool:
+    """Crear extensiones, función e índice trigram para la búsqueda de usuarios por nombre"""
+    if engine.dialect.name != "postgresql":
+        return False
+    try:
+        async with engine.begin() as conn:
+            for statement in _FUZZY_SEARCH_SETUP:
+                await conn.execute(text(statement))
+        print("✅ Búsqueda difusa de usuarios habilitada (pg_trgm + unaccent)")
+        return True
+    except Exception as e:
+        print(f"⚠️ Búsqueda difusa no disponible, se usa búsqueda simple: {e}")
+        return False
+
+
+def _create_missing_indexes(sync_conn):
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
 async def _list_tables():
     if not engine:
         return
@@ -125,20 +170,65 @@ async def _list_tables():
         print(f"❌ Error listando tablas: {e}")
 
 
-async def get_async_db():
-    if not AsyncSessionLocal:
-        yield MockDatabaseSession()
-        return
-        
+# Clave en session.info con los callbacks a ejecutar después del commit
+_AFTER_COMMIT_KEY = "after_commit"
+
+
+def after_commit(db: AsyncSession, callback: Callable[[], Awaitable[Any]]) -> None:
+    """
+    Registrar una corrutina que se ejecuta cuando la unidad de trabajo confirma
+    (ej: publicar un evento). Si la transacción se deshace, se descarta.
+    """
+    db.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+async def _run_after_commit(session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT_KEY, []):
+        try:
+            await callback()
+        except Exception as e:
+            print(f"❌ Error ejecutando callback post-commit: {e}")
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[AsyncSession]:
+    """
+    Sesión con unidad de trabajo: los DAOs solo hacen flush y la transacción
+    se confirma una vez al salir del bloque; ante cualquier error se hace
+    rollback y se descartan los callbacks registrados con after_commit.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
+            await session.commit()
         except Exception as e:
             print(f"❌ Error en sesión de base de datos: {e}")
             await session.rollback()
+            session.info.pop(_AFTER_COMMIT_KEY, None)
             raise
-        finally:
-            await session.close()
+        await _run_after_commit(session)
+
+
+@asynccontextmanager
+async def savepoint(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Ejecutar un bloque dentro de un SAVEPOINT: si falla se deshace solo ese
+    bloque (la excepción se propaga) y la transacción de la request sigue usable.
+    """
+    async with db.begin_nested():
+        yield db
+
+
+async def get_async_db():
+    """Sesión por request: se confirma una sola vez al terminar el endpoint"""
+    if not AsyncSessionLocal:
+        session = MockDatabaseSession()
+        yield session
+        await _run_after_commit(session)
+        return
+        
+    async with unit_of_work() as session:
+        yield session
 
 
 async def close_database():
@@ -160,15 +250,25 @@ def get_connection_status():
 
 
 class MockDatabaseSession:
-    async def add(self, instance): pass
+    def __init__(self):
+        self.info = {}
+    def add(self, instance): pass
+    async def flush(self): pass
     async def commit(self): pass
     async def rollback(self): pass
-    async def refresh(self, instance): pass
-    async def execute(self, statement): return MockResult()
+    async def refresh(self, instance, attribute_names=None): pass
+    async def execute(self, statement, params=None): return MockResult()
+    def begin_nested(self): return MockTransaction()
     async def close(self): pass
 
 
+class MockTransaction:
+    async def __aenter__(self): return self
+    async def __aexit__(self, *exc): return False
+
+
 class MockResult:
+    def unique(self): return self
     def fetchall(self): return []
     def fetchone(self): return None
     def first(self): return None
@@ -0,0 +1,129 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models.rol_model import Rol
+from .models.usuario_model import Usuario
+
+# Clave en session.info donde vive el loader de la request
+_LOADER_KEY = "request_loader"
+
+# Función que resuelve varias claves en una sola consulta: (db, claves) -> {clave: entidad}
+BatchFn = Callable[[AsyncSession, List[Any]], Awaitable[Dict[Any, Any]]]
+
+
+def _default_batch_fns() -> Dict[type, BatchFn]:
+    # Import diferido: los DAOs importan modelos y no deben depender de este módulo
+    from .dao.rol_dao import RolDAO
+    from .dao.usuario_dao import UsuarioDAO
+    return {
+        Usuario: UsuarioDAO.get_by_ids,
+        Rol: RolDAO.get_by_ids,
+    }
+
+
+class RequestLoader:
+    """
+    Identity map + DataLoader con alcance de request.
+
+    `load(Modelo, id)` devuelve la entidad desde memoria si ya se pidió en esta
+    request; si no, la clave se encola y todas las que se pidan en la misma vuelta
+    del event loop se resuelven con una única consulta IN (...). Las claves
+    inexistentes se recuerdan como None.
+
+    Las entidades pertenecen a la sesión de la request, así que reflejan los
+    cambios hechos en ella; si se agrega un hijo a una relación ya cargada hay
+    que refrescar esa relación (db.refresh(entidad, ["relacion"])) o usar clear().
+    """
+
+    def __init__(self, db: AsyncSession, batch_fns: Optional[Dict[type, BatchFn]] = None):
+        self.db = db
+        self._batch_fns = batch_fns if batch_fns is not None else _default_batch_fns()
+        self._cache: Dict[Tuple[type, Hashable], Any] = {}
+        self._pending: Dict[type, Dict[Hashable, asyncio.Future]] = {}
+        self._dispatches: Set[asyncio.Task] = set()
+        # La sesión no admite consultas concurrentes: un lote por vez
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+
+    async def load(self, model: type, key: Hashable) -> Optional[Any]:
+        """Obtener una entidad por clave primaria (None si no existe)"""
+        cache_key = (model, key)
+        if cache_key in self._cache:
+            self.hits += 1
+            return self._cache[cache_key]
+        if model not in self._batch_fns:
+            raise KeyError(f"No hay loader registrado para {model.__name__}")
+
+        pending = self._pending.setdefault(model, {})
+        future = pending.get(key)
+        if future is None:
+            self.misses += 1
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            pending[key] = future
+            if len(pending) == 1:
+                # El lote se despacha en la próxima vuelta del loop, después de
+                # que el resto de las corrutinas listas encolen sus claves
+                task = loop.create_task(self._dispatch(model))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+        return await asyncio.shield(future)
+
+    async def load_many(self, model: type, keys: Iterable[Hashable]) -> List[Optional[Any]]:
+        """Obtener varias entidades en el orden pedido, con una sola consulta para las que falten"""
+        return list(await asyncio.gather(*(self.load(model, key) for key in keys)))
+
+    def prime(self, model: type, key: Hashable, entity: Any) -> None:
+        """Guardar una entidad ya obtenida (ej: recién creada) para no volver a consultarla"""
+        self._cache[(model, key)] = entity
+
+    def clear(self, model: type, key: Hashable) -> None:
+        """Olvidar una entidad para que el próximo load la vuelva a consultar"""
+        self._cache.pop((model, key), None)
+
+    async def _dispatch(self, model: type) -> None:
+        # Una vuelta extra para que entren también las claves de gathers anidados (load_many)
+        await asyncio.sleep(0)
+        async with self._lock:
+            pending = self._pending.pop(model, {})
+            if not pending:
+                return
+            self.batches += 1
+            try:
+                found = await self._batch_fns[model](self.db, list(pending))
+            except Exception as e:
+                for future in pending.values():
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for key, future in pending.items():
+                entity = found.get(key)
+                self._cache[(model, key)] = entity
+                if not future.done():
+                    future.set_result(entity)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener contadores del loader (útil para depurar una request)"""
+        return {
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "batches": self.batches
+        }
+
+
+def request_loader(db: AsyncSession) -> RequestLoader:
+    """
+    Obtener el loader de la request asociado a la sesión inyectada por
+    get_async_db; se crea con la primera consulta y muere con la sesión.
+    """
+    loader = db.info.get(_LOADER_KEY)
+    if loader is None:
+        loader = RequestLoader(db)
+        db.info[_LOADER_KEY] = loader
+    return loader
@@ -4,6 +4,7 @@ Módulo de mensajería RabbitMQ
 from .rabbitmq import get_connection, get_channel, close_connection, get_connection_status
 from .producer import EventProducer
 from .consumer import EventConsumer
+from .outbox import OutboxRelay, outbox_relay, enqueue_event
 
 __all__ = [
     "get_connection",
@@ -11,6 +12,9 @@ __all__ = [
     "close_connection",
     "get_connection_status",
     "EventProducer",
-    "EventConsumer"
+    "EventConsumer",
+    "OutboxRelay",
+    "outbox_relay",
+    "enqueue_event"
 ]
 
@@ -0,0 +1,295 @@
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+
+from .. import database
+from ..dao.outbox_dao import OutboxDAO
+from .producer import EventProducer
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Eventos que se publican por transacción del relay
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '100'))
+# Espera entre lecturas cuando no llegan avisos de commits nuevos
+OUTBOX_POLL_INTERVAL_SECONDS = float(os.getenv('OUTBOX_POLL_INTERVAL_SECONDS', '5'))
+# Reintentos: backoff exponencial entre la base y el máximo, y descarte tras N intentos
+OUTBOX_RETRY_BASE_SECONDS = float(os.getenv('OUTBOX_RETRY_BASE_SECONDS', '1'))
+OUTBOX_RETRY_MAX_SECONDS = float(os.getenv('OUTBOX_RETRY_MAX_SECONDS', '60'))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '20'))
+# Limpieza de eventos ya publicados
+OUTBOX_RETENTION_HOURS = float(os.getenv('OUTBOX_RETENTION_HOURS', '24'))
+OUTBOX_CLEANUP_INTERVAL_SECONDS = float(os.getenv('OUTBOX_CLEANUP_INTERVAL_SECONDS', '3600'))
+OUTBOX_SHUTDOWN_TIMEOUT_SECONDS = float(os.getenv('OUTBOX_SHUTDOWN_TIMEOUT_SECONDS', '5'))
+# Ventana para calcular la tasa de publicación (p. ej. al vaciar el atraso tras una caída)
+_RATE_WINDOW_SECONDS = 60.0
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Algunos motores devuelven fechas sin zona: se guardan en UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class OutboxRelay:
+    """
+    Publica en RabbitMQ los eventos de la tabla outbox_events.
+
+    Cada vuelta toma un lote de pendientes en orden de id (FOR UPDATE SKIP LOCKED),
+    los publica en orden con publisher confirms en pipeline (publish_many) y marca
+    como publicados, en la misma transacción, solo los confirmados antes del primer
+    rechazo. Ese evento y los siguientes quedan pendientes: se registra el intento
+    del primero y se espera un backoff exponencial antes de reintentar el lote
+    desde él; tras OUTBOX_MAX_ATTEMPTS rechazos el evento se descarta (failed_at)
+    y el relay sigue.
+
+    Solo cuentan como intentos los rechazos del broker (nack). Con el broker caído
+    o la conexión perdida el evento no recibió respuesta: se reintenta con backoff
+    sin sumar intentos, así una caída larga nunca descarta eventos.
+
+    La entrega es al menos una vez: si el proceso muere entre el publish y el
+    commit, el evento se vuelve a publicar con el mismo eventId.
+    """
+
+    def __init__(self, batch_size: int = OUTBOX_BATCH_SIZE, poll_interval: float = OUTBOX_POLL_INTERVAL_SECONDS):
+        self.batch_size = max(1, batch_size)
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._last_cleanup = 0.0
+        self._retry_delay = 0.0
+        self._outages = 0
+        self._published_window: Deque[Tuple[float, int]] = deque()
+        self.published = 0
+        self.failed_attempts = 0
+        self.unavailable = 0
+        self.discarded = 0
+        self.batches = 0
+        self.cleaned_up = 0
+        self.errors = 0
+        self.pending = 0
+        self.oldest_pending_at: Optional[datetime] = None
+        self.last_publish_lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Iniciar el relay en background (solo con base de datos real)"""
+        if self.running or database.AsyncSessionLocal is None:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        print(f"✅ Relay del outbox iniciado (batch_size={self.batch_size})")
+
+    async def stop(self):
+        """
+        Detener el relay: antes publica lo pendiente (hasta
+        OUTBOX_SHUTDOWN_TIMEOUT_SECONDS); lo que no alcance queda en la tabla
+        y se publica en el próximo inicio.
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=OUTBOX_SHUTDOWN_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            # El lote sin confirmar se deshace y se vuelve a publicar en el próximo inicio
+            print("⚠️ Relay del outbox no terminó a tiempo, cancelando")
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        print("✅ Relay del outbox detenido")
+
+    async def notify(self) -> None:
+        """Avisar que hay eventos nuevos (se registra con after_commit)"""
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            drained = 0
+            try:
+                drained = await self.drain_once()
+                await self._maybe_cleanup()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                self.last_error = str(e)
+                print(f"❌ Error en relay del outbox: {e}")
+                self._outages += 1
+                self._retry_delay = max(self._retry_delay, self._backoff(self._outages))
+
+            if self._stopping and (self._retry_delay or drained < self.batch_size):
+                # Al apagar se sigue drenando mientras queden lotes completos y haya broker
+                break
+            if self._retry_delay:
+                # Broker caído: no reintentar antes del backoff aunque lleguen avisos
+                await asyncio.sleep(self._retry_delay)
+                continue
+            if drained >= self.batch_size:
+                # Probablemente quedan más pendientes: seguir sin esperar
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain_once(self) -> int:
+        """Publicar un lote de pendientes; retorna cuántos eventos se publicaron"""
+        async with database.AsyncSessionLocal() as db:
+            events = await OutboxDAO.claim_batch(db, self.batch_size)
+            results = await EventProducer.publish_many([
+                (event.payload, event.exchange_name, event.routing_key) for event in events
+            ])
+            # Solo el prefijo confirmado: los eventos posteriores a un rechazo se
+            # vuelven a publicar detrás de él para no adelantarlo
+            confirmed = 0
+            while confirmed < len(results) and results[confirmed]:
+                confirmed += 1
+            published = events[:confirmed]
+            published_ids = [event.id for event in published]
+            failed = events[confirmed] if confirmed < len(events) else None
+
+            now = datetime.now(timezone.utc)
+            await OutboxDAO.mark_published(db, published_ids, now)
+            if published:
+                self.last_publish_lag_seconds = round((now - _as_utc(published[-1].created_at)).total_seconds(), 3)
+
+            if failed is None:
+                self._outages = 0
+                self._retry_delay = 0.0
+            elif results[confirmed] is None:
+                self._record_unavailable(failed)
+            else:
+                self._outages = 0
+                await self._record_failure(db, failed, now)
+
+            self.pending, oldest = await OutboxDAO.get_backlog(db)
+            self.oldest_pending_at = _as_utc(oldest) if oldest else None
+            await db.commit()
+
+        if events:
+            self.batches += 1
+        self.published += len(published_ids)
+        if published_ids:
+            self._published_window.append((time.monotonic(), len(published_ids)))
+        return len(published_ids)
+
+    def _publish_rate(self) -> float:
+        """Eventos publicados por segundo en la última ventana"""
+        cutoff = time.monotonic() - _RATE_WINDOW_SECONDS
+        while self._published_window and self._published_window[0][0] < cutoff:
+            self._published_window.popleft()
+        return round(sum(count for _, count in self._published_window) / _RATE_WINDOW_SECONDS, 3)
+
+    @staticmethod
+    def _backoff(retries: int) -> float:
+        return min(OUTBOX_RETRY_BASE_SECONDS * 2 ** (retries - 1), OUTBOX_RETRY_MAX_SECONDS)
+
+    def _record_unavailable(self, event) -> None:
+        # Sin respuesta del broker: no es culpa del evento, no se cuenta el intento
+        self._outages += 1
+        self.unavailable += 1
+        self._retry_delay = self._backoff(self._outages)
+        self.last_error = f"{event.routing_key} eventId={event.event_id}: RabbitMQ no disponible"
+        logger.warning(
+            f"⚠️ RabbitMQ no disponible, evento {event.routing_key} sigue pendiente, "
+            f"eventId={event.event_id}, reintento en {self._retry_delay}s"
+        )
+
+    async def _record_failure(self, db: AsyncSession, event, now: datetime) -> None:
+        attempts = event.attempts + 1
+        error = "Rechazado por RabbitMQ"
+        self.failed_attempts += 1
+        self.last_error = f"{event.routing_key} eventId={event.event_id}: {error}"
+
+        if attempts >= OUTBOX_MAX_ATTEMPTS:
+            await OutboxDAO.mark_failed(db, event.id, attempts, error, failed_at=now)
+            self.discarded += 1
+            self._retry_delay = 0.0
+            logger.error(
+                f"❌ Evento {event.routing_key} descartado tras {attempts} intentos, "
+                f"eventId={event.event_id}"
+            )
+            return
+
+        await OutboxDAO.mark_failed(db, event.id, attempts, error)
+        self._retry_delay = self._backoff(attempts)
+        logger.warning(
+            f"⚠️ Evento {event.routing_key} rechazado por RabbitMQ (intento {attempts}), "
+            f"eventId={event.event_id}, reintento en {self._retry_delay}s"
+        )
+
+    async def _maybe_cleanup(self) -> None:
+        if time.monotonic() - self._last_cleanup < OUTBOX_CLEANUP_INTERVAL_SECONDS:
+            return
+        self._last_cleanup = time.monotonic()
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=OUTBOX_RETENTION_HOURS)
+        async with database.AsyncSessionLocal() as db:
+            deleted = await OutboxDAO.delete_published_before(db, cutoff)
+            await db.commit()
+        self.cleaned_up += deleted
+        if deleted:
+            logger.info(f"🧹 Outbox: {deleted} eventos publicados eliminados")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener contadores del relay y el atraso del evento pendiente más antiguo"""
+        lag = None
+        if self.oldest_pending_at is not None:
+            lag = round((datetime.now(timezone.utc) - self.oldest_pending_at).total_seconds(), 3)
+        return {
+            "running": self.running,
+            "batch_size": self.batch_size,
+            "pending": self.pending,
+            "lag_seconds": lag,
+            "last_publish_lag_seconds": self.last_publish_lag_seconds,
+            "published": self.published,
+            "publish_rate_per_second": self._publish_rate(),
+            "failed_attempts": self.failed_attempts,
+            "unavailable": self.unavailable,
+            "discarded": self.discarded,
+            "batches": self.batches,
+            "cleaned_up": self.cleaned_up,
+            "retry_delay_seconds": self._retry_delay,
+            "errors": self.errors,
+            "last_error": self.last_error
+        }
+
+
+outbox_relay = OutboxRelay()
+
+
+async def enqueue_event(
+    db: AsyncSession,
+    message: Dict[str, Any],
+    exchange_name: str,
+    routing_key: str,
+    context: str = ""
+) -> None:
+    """
+    Registrar el evento en el outbox dentro de la transacción de la request: se
+    confirma junto con el cambio que lo origina y el relay lo publica después.
+    En modo mock (sin base) se publica directamente al confirmar la request.
+    """
+    if database.AsyncSessionLocal is None:
+        EventProducer.publish_after_commit(db, message, exchange_name, routing_key, context)
+        return
+
+    await OutboxDAO.add(db, message, exchange_name, routing_key)
+    logger.info(f"📥 Evento {routing_key} registrado en el outbox {context}, eventId={message.get('eventId')}")
+    database.after_commit(db, outbox_relay.notify)
@@ -1,12 +1,148 @@
+import os
 import json
-from typing import Optional, Dict, Any
+import time
+import asyncio
+import logging
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 from aio_pika import Message, DeliveryMode
-from .rabbitmq import get_channel
+from aio_pika.abc import AbstractExchange
+from aiormq import spec
+from aiormq.exceptions import DeliveryError
+from dotenv import load_dotenv
+from .rabbitmq import PooledChannel, channel_pool
+from ..database import after_commit
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Mensajes publicados sin confirmar que publish_many mantiene en vuelo por canal
+RABBITMQ_CONFIRM_WINDOW = int(os.getenv('RABBITMQ_CONFIRM_WINDOW', '256'))
+# Tiempo máximo de espera del ack del broker por mensaje
+RABBITMQ_CONFIRM_TIMEOUT = float(os.getenv('RABBITMQ_CONFIRM_TIMEOUT', '10'))
+
+# (mensaje, exchange, routing key)
+OutgoingEvent = Tuple[Dict[str, Any], str, str]
+
+
+class PublisherStats:
+    """Contadores de publisher confirms: mensajes en vuelo, confirmados y rechazados"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.acked = 0
+        self.nacked = 0
+        self.errors = 0
+        self.batches = 0
+        self._confirm_latency = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        confirmed = self.acked + self.nacked
+        return {
+            "confirm_window": RABBITMQ_CONFIRM_WINDOW,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "acked": self.acked,
+            "nacked": self.nacked,
+            "errors": self.errors,
+            "batches": self.batches,
+            "avg_confirm_latency_ms": round(self._confirm_latency / confirmed * 1000, 2) if confirmed else 0.0
+        }
+
+
+publisher_stats = PublisherStats()
 
 
 class EventProducer:
     """Clase para publicar mensajes en RabbitMQ"""
     
+    @staticmethod
+    def _build_message(message: Dict[str, Any]) -> Message:
+        return Message(
+            json.dumps(message).encode(),
+            delivery_mode=DeliveryMode.PERSISTENT,
+            content_type="application/json"
+        )
+    
+    @staticmethod
+    async def _get_exchange(pooled: PooledChannel, exchange_name: str) -> AbstractExchange:
+        """Resolver el exchange una sola vez por canal y reutilizar el handle"""
+        exchange = pooled.exchanges.get(exchange_name)
+        if exchange is not None:
+            return exchange
+        
+        # Intentar obtener el exchange existente primero (sin declararlo)
+        # Esto DEBERIA funcionar incluso si no tenemos permisos de configuración
+        try:
+            exchange = await pooled.channel.get_exchange(exchange_name)
+            print(f"✅ Exchange obtenido: {exchange_name}")
+        except Exception as get_error:
+            # El declare pasivo fallido cierra el canal: reabrirlo antes de seguir
+            await channel_pool.ensure_open(pooled)
+            # Si no existe, intentar declararlo
+            # Esto requiere SI y SOLO SI tenemos permisos de configuración
+            try:
+                exchange = await pooled.channel.declare_exchange(
+                    exchange_name,
+                    type="topic",
+                    durable=True
+                )
+                print(f"✅ Exchange declarado: {exchange_name}")
+            except Exception as declare_error:
+                # Si falla por permisos de configuración, el exchange probablemente ya existe
+                # Intentar obtenerlo de nuevo (puede que el error inicial fuera temporal)
+                error_msg = str(declare_error)
+                if "ACCESS_REFUSED" in error_msg or "configure access" in error_msg.lower():
+                    print(f"⚠️ Sin permisos para declarar exchange '{exchange_name}', asumiendo que existe y obteniéndolo...")
+                    await channel_pool.ensure_open(pooled)
+                    try:
+                        exchange = await pooled.channel.get_exchange(exchange_name)
+                    except Exception:
+                        # Si aún falla, relanzar el error original de permisos
+                        raise declare_error
+                else:
+                    # Si es otro error, relanzarlo
+                    raise declare_error
+        
+        pooled.exchanges[exchange_name] = exchange
+        return exchange
+    
+    @staticmethod
+    async def _ensure_queue(pooled: PooledChannel, queue_name: str) -> None:
+        """Declarar la cola una sola vez por canal"""
+        if queue_name not in pooled.queues:
+            pooled.queues[queue_name] = await pooled.channel.declare_queue(queue_name, durable=True)
+    
+    @staticmethod
+    async def _publish_confirmed(exchange: AbstractExchange, message_obj: Message, routing_key: str) -> bool:
+        """
+        Publicar y esperar el ack del broker (los canales están en modo confirm).
+        Retorna False si el broker rechazó o devolvió el mensaje; los errores de
+        canal o de timeout se propagan.
+        """
+        publisher_stats.in_flight += 1
+        publisher_stats.peak_in_flight = max(publisher_stats.peak_in_flight, publisher_stats.in_flight)
+        started = time.perf_counter()
+        try:
+            confirmation = await exchange.publish(message_obj, routing_key=routing_key, timeout=RABBITMQ_CONFIRM_TIMEOUT)
+        except DeliveryError:
+            publisher_stats.nacked += 1
+            return False
+        except Exception:
+            publisher_stats.errors += 1
+            raise
+        finally:
+            publisher_stats.in_flight -= 1
+            publisher_stats._confirm_latency += time.perf_counter() - started
+        
+        # None: canal sin confirms; Basic.Return u otro frame: mensaje no aceptado
+        if confirmation is None or isinstance(confirmation, spec.Basic.Ack):
+            publisher_stats.acked += 1
+            return True
+        publisher_stats.nacked += 1
+        return False
+    
     @staticmethod
     async def publish(
         message: Dict[str, Any],
@@ -17,6 +153,9 @@ class EventProducer:
         """
         Publicar un mensaje en RabbitMQ
         
+        Usa un canal del pool de publicación; el exchange (o la cola) se resuelve
+        la primera vez en cada canal y después publicar es un único envío.
+        
         Args:
             message: Diccionario con el contenido del mensaje
             exchange_name: Nombre del exchange (default: "backoffice.events")
@@ -26,73 +165,33 @@ class EventProducer:
         Returns:
             True si se publicó correctamente, False en caso contrario
         """
+        # Extraer información del evento para logging
+        event_id = message.get("eventId", "N/A") if isinstance(message, dict) else "N/A"
+        event_type = message.get("eventType", "N/A") if isinstance(message, dict) else "N/A"
+        
         try:
-            channel = await get_channel()
+            message_obj = EventProducer._build_message(message)
             
-            # Si hay queue_name, publicar directamente a la cola
-            if queue_name:
-                queue = await channel.declare_queue(queue_name, durable=True)
-                message_obj = Message(
-                    json.dumps(message).encode(),
-                    delivery_mode=DeliveryMode.PERSISTENT,
-                    content_type="application/json"
-                )
-                
-                # Extraer información del evento para logging
-                event_id = message.get("eventId", "N/A")
-                event_type = message.get("eventType", "N/A")
-                
-                await queue.publish(message_obj)
+            async with channel_pool.acquire() as pooled:
+                # Si hay queue_name, publicar directamente a la cola (exchange por defecto)
+                if queue_name:
+                    await EventProducer._ensure_queue(pooled, queue_name)
+                    if not await EventProducer._publish_confirmed(pooled.channel.default_exchange, message_obj, queue_name):
+                        print(f"❌ Evento rechazado por el broker: eventId={event_id}, eventType={event_type}, queue={queue_name}")
+                        return False
+                    print(
+                        f"✅ Evento publicado exitosamente a cola: eventId={event_id}, "
+                        f"eventType={event_type}, queue={queue_name}"
+                    )
+                    return True
                 
-                print(
-                    f"✅ Evento publicado exitosamente a cola: eventId={event_id}, "
-                    f"eventType={event_type}, queue={queue_name}"
-                )
-                return True
-            
-            # Intentar obtener el exchange existente primero (sin declararlo)
-            # Esto DEBERIA funcionar incluso si no tenemos permisos de configuración
-            exchange = None
-            try:
-                # Intentar obtener el exchange existente (sin declararlo)
-                exchange = await channel.get_exchange(exchange_name)
-                print(f"✅ Exchange obtenido: {exchange_name}")
-            except Exception as get_error:
-                # Si no existe, intentar declararlo
-                # Esto requiere SI y SOLO SI tenemos permisos de configuración
-                try:
-                    exchange = await channel.declare_exchange(
-                        exchange_name,
-                        type="topic",
-                        durable=True
+                exchange = await EventProducer._get_exchange(pooled, exchange_name)
+                if not await EventProducer._publish_confirmed(exchange, message_obj, routing_key):
+                    print(
+                        f"❌ Evento rechazado por el broker: eventId={event_id}, "
+                        f"eventType={event_type}, exchange={exchange_name}, routingKey={routing_key}"
                     )
-                    print(f"✅ Exchange declarado: {exchange_name}")
-                except Exception as declare_error:
-                    # Si falla por permisos de configuración, el exchange probablemente ya existe
-                    # Intentar obtenerlo de nuevo (puede que el error inicial fuera temporal)
-                    error_msg = str(declare_error)
-                    if "ACCESS_REFUSED" in error_msg or "configure access" in error_msg.lower():
-                        print(f"⚠️ Sin permisos para declarar exchange '{exchange_name}', asumiendo que existe y obteniéndolo...")
-                        try:
-                            exchange = await channel.get_exchange(exchange_name)
-                        except Exception:
-                            # Si aún falla, relanzar el error original de permisos
-                            raise declare_error
-                    else:
-                        # Si es otro error, relanzarlo
-                        raise declare_error
-            
-            message_obj = Message(
-                json.dumps(message).encode(),
-                delivery_mode=DeliveryMode.PERSISTENT,
-                content_type="application/json"
-            )
-            
-            # Extraer información del evento para logging
-            event_id = message.get("eventId", "N/A")
-            event_type = message.get("eventType", "N/A")
-            
-            await exchange.publish(message_obj, routing_key=routing_key)
+                    return False
             
             print(
                 f"✅ Evento publicado exitosamente: eventId={event_id}, "
@@ -102,14 +201,93 @@ class EventProducer:
             return True
             
         except Exception as e:
-            # Extraer información del evento para logging de error
-            event_id = message.get("eventId", "N/A") if isinstance(message, dict) else "N/A"
-            event_type = message.get("eventType", "N/A") if isinstance(message, dict) else "N/A"
-            
             print(
                 f"❌ Error publicando evento: eventId={event_id}, "
                 f"eventType={event_type}, exchange={exchange_name}, "
                 f"routingKey={routing_key}, error={str(e)}"
             )
             return False
-
+    
+    @staticmethod
+    async def publish_many(events: Sequence[OutgoingEvent]) -> List[Optional[bool]]:
+        """
+        Publicar varios eventos en un mismo canal sin esperar cada ack antes de
+        enviar el siguiente: hasta RABBITMQ_CONFIRM_WINDOW mensajes quedan en vuelo
+        y cada uno se resuelve cuando llega su confirmación.
+        
+        Args:
+            events: Lista de (mensaje, exchange, routing key), publicados en ese orden
+        
+        Returns:
+            Un resultado por evento, en el mismo orden: True = confirmado por el
+            broker, False = rechazado por el broker (nack o devuelto), None = sin
+            confirmación (broker no disponible, canal caído o timeout)
+        """
+        if not events:
+            return []
+        
+        publisher_stats.batches += 1
+        window = asyncio.Semaphore(max(1, RABBITMQ_CONFIRM_WINDOW))
+        
+        try:
+            async with channel_pool.acquire() as pooled:
+                exchanges: Dict[str, AbstractExchange] = {}
+                for _, exchange_name, _ in events:
+                    if exchange_name not in exchanges:
+                        exchanges[exchange_name] = await EventProducer._get_exchange(pooled, exchange_name)
+                
+                async def send(message: Dict[str, Any], exchange_name: str, routing_key: str) -> Optional[bool]:
+                    async with window:
+                        try:
+                            return await EventProducer._publish_confirmed(
+                                exchanges[exchange_name],
+                                EventProducer._build_message(message),
+                                routing_key
+                            )
+                        except Exception as e:
+                            print(f"❌ Error publicando evento: eventId={message.get('eventId', 'N/A')}, error={str(e)}")
+                            return None
+                
+                # Las tareas se crean en orden, así los mensajes salen en ese orden
+                results = await asyncio.gather(*(send(*event) for event in events))
+        except Exception as e:
+            print(f"❌ Error publicando lote de {len(events)} eventos: {str(e)}")
+            return [None] * len(events)
+        
+        acked = sum(1 for ok in results if ok)
+        print(f"✅ Lote publicado: {acked}/{len(events)} eventos confirmados por el broker")
+        return list(results)
+    
+    @staticmethod
+    def publish_after_commit(
+        db,
+        message: Dict[str, Any],
+        exchange_name: str,
+        routing_key: str,
+        context: str = ""
+    ) -> None:
+        """
+        Publicar el evento recién cuando se confirme la transacción de la request,
+        así nunca sale un evento de un cambio que terminó en rollback. Solo se usa
+        sin base de datos (modo mock); con base los eventos van al outbox
+        (`enqueue_event`) y los publica el relay en background.
+        `context` se agrega al log (ej: "para usuario: user_id=..., legajo=...").
+        """
+        async def publish() -> None:
+            published = await EventProducer.publish(
+                message=message,
+                exchange_name=exchange_name,
+                routing_key=routing_key
+            )
+            if published:
+                logger.info(
+                    f"✅ Evento {routing_key} publicado correctamente {context}, "
+                    f"eventId={message.get('eventId')}"
+                )
+            else:
+                logger.warning(
+                    f"⚠️ No se pudo publicar evento {routing_key} {context}, "
+                    f"eventId={message.get('eventId')}"
+                )
+        
+        after_commit(db, publish)
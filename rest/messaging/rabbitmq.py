@@ -1,6 +1,9 @@
 import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
 from aio_pika import connect_robust
-from aio_pika.abc import AbstractConnection, AbstractChannel
+from aio_pika.abc import AbstractConnection, AbstractChannel, AbstractExchange, AbstractQueue
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,6 +17,9 @@ RABBITMQ_PORT = os.getenv('RABBITMQ_PORT', '5672')
 # Construir URL de conexión
 RABBITMQ_URL = f"amqp://{RABBITMQ_DEFAULT_USER}:{RABBITMQ_DEFAULT_PASS}@{RABBITMQ_HOST}:{RABBITMQ_PORT}"
 
+# Canales dedicados a publicar (el canal global queda para el consumidor)
+RABBITMQ_PUBLISH_CHANNELS = int(os.getenv('RABBITMQ_PUBLISH_CHANNELS', '4'))
+
 # Estado global
 _connection: AbstractConnection | None = None
 _channel: AbstractChannel | None = None
@@ -46,10 +52,128 @@ async def get_channel() -> AbstractChannel:
     return _channel
 
 
+class PooledChannel:
+    """
+    Canal de publicación con los exchanges y colas ya resueltos en él.
+    Los handles son válidos solo para este canal: si se reabre (reconexión o
+    cierre por error del broker) el cache se vacía y se vuelven a resolver.
+    """
+
+    def __init__(self, channel: AbstractChannel):
+        self.exchanges: Dict[str, AbstractExchange] = {}
+        self.queues: Dict[str, AbstractQueue] = {}
+        self.reopens = 0
+        self.attach(channel)
+
+    def attach(self, channel: AbstractChannel) -> None:
+        """Usar `channel` (nuevo o reemplazo de uno perdido) con el cache vacío"""
+        self.channel = channel
+        self.exchanges.clear()
+        self.queues.clear()
+        # RobustChannel avisa cuando connect_robust lo restaura tras una reconexión
+        reopen_callbacks = getattr(channel, "reopen_callbacks", None)
+        if reopen_callbacks is not None:
+            reopen_callbacks.add(self._on_reopen)
+
+    def _on_reopen(self, *args) -> None:
+        self.exchanges.clear()
+        self.queues.clear()
+        self.reopens += 1
+
+
+class ChannelPool:
+    """
+    Pool de canales para publicar. Cada publicación toma un canal en exclusiva,
+    así los publishers concurrentes no se serializan sobre un único canal; los
+    canales se abren a demanda hasta `size`.
+    """
+
+    def __init__(self, size: int = RABBITMQ_PUBLISH_CHANNELS):
+        self.size = max(1, size)
+        self._channels: List[PooledChannel] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.waits = 0
+
+    def _idle_queue(self) -> asyncio.Queue:
+        # Se crea dentro del event loop que lo usa
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+        return self._idle
+
+    async def _take(self) -> PooledChannel:
+        idle = self._idle_queue()
+        if idle.empty():
+            async with self._lock:
+                if len(self._channels) < self.size:
+                    connection = await get_connection()
+                    pooled = PooledChannel(await connection.channel())
+                    self._channels.append(pooled)
+                    print(f"✅ Canal de publicación abierto ({len(self._channels)}/{self.size})")
+                    return pooled
+            self.waits += 1
+        return await idle.get()
+
+    async def ensure_open(self, pooled: PooledChannel) -> None:
+        """Reabrir el canal si el broker lo cerró (ej: tras un declare pasivo fallido)"""
+        if not pooled.channel.is_closed:
+            return
+        try:
+            await pooled.channel.reopen()
+            # RobustChannel ya limpió el cache desde reopen_callbacks
+            if getattr(pooled.channel, "reopen_callbacks", None) is None:
+                pooled._on_reopen()
+        except Exception:
+            # También se perdió la conexión: abrir un canal sobre la conexión actual
+            connection = await get_connection()
+            pooled.attach(await connection.channel())
+            pooled.reopens += 1
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[PooledChannel]:
+        """Tomar un canal del pool y devolverlo al terminar"""
+        pooled = await self._take()
+        self.acquired += 1
+        try:
+            await self.ensure_open(pooled)
+            yield pooled
+        finally:
+            self._idle_queue().put_nowait(pooled)
+
+    async def close(self) -> None:
+        """Cerrar todos los canales del pool"""
+        channels, self._channels = self._channels, []
+        self._idle = None
+        for pooled in channels:
+            if not pooled.channel.is_closed:
+                await pooled.channel.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener contadores del pool de canales"""
+        idle = self._idle.qsize() if self._idle is not None else 0
+        return {
+            "size": self.size,
+            "open": len(self._channels),
+            "idle": idle,
+            "in_use": len(self._channels) - idle,
+            "acquired": self.acquired,
+            "waits": self.waits,
+            "cached_exchanges": sum(len(pooled.exchanges) for pooled in self._channels),
+            "cached_queues": sum(len(pooled.queues) for pooled in self._channels),
+            "reopens": sum(pooled.reopens for pooled in self._channels)
+        }
+
+
+channel_pool = ChannelPool()
+
+
 async def close_connection():
     """Cerrar conexión a RabbitMQ"""
     global _connection, _channel
     
+    await channel_pool.close()
+    
     if _channel and not _channel.is_closed:
         await _channel.close()
         _channel = None
@@ -65,6 +189,7 @@ def get_connection_status():
     """Obtener estado de la conexión"""
     return {
         "connected": _connection is not None and not _connection.is_closed if _connection else False,
-        "channel_active": _channel is not None and not _channel.is_closed if _channel else False
+        "channel_active": _channel is not None and not _channel.is_closed if _channel else False,
+        "publish_channels": channel_pool.get_stats()
     }
 
@@ -10,6 +10,7 @@ from .sede_model import Sede
 from .espacio_model import Espacio, TipoEspacio, EstadoEspacio
 from .sueldo_model import Sueldo
 from .clase_individual_model import ClaseIndividual, EstadoClase, TipoClase
+from .outbox_model import OutboxEvent
 
 __all__ = [
     # Models principales
@@ -21,6 +22,7 @@ __all__ = [
     "Espacio",
     "Sueldo",
     "ClaseIndividual",
+    "OutboxEvent",
     
     # Enums
     "TipoEspacio",
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Time, Enum, Date
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Time, Enum, Date, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -32,5 +32,12 @@ class ClaseIndividual(Base):
     observaciones = Column(Text, nullable=True, comment="Observaciones adicionales sobre la clase")
     status = Column(Boolean, default=True, nullable=False, comment="Estado del registro (activo/inactivo)")
     
+    # Índices para la paginación por cursor (fecha_clase, id_clase) y para el
+    # chequeo de clase duplicada por curso y fecha (EXISTS resuelto solo con el índice)
+    __table_args__ = (
+        Index('ix_clases_individuales_fecha_clase_id_clase', 'fecha_clase', 'id_clase'),
+        Index('ix_clases_individuales_id_curso_fecha_clase_status', 'id_curso', 'fecha_clase', 'status'),
+    )
+    
     def __repr__(self):
         return f"<ClaseIndividual(id_clase={self.id_clase}, titulo='{self.titulo}', fecha_clase='{self.fecha_clase}', tipo='{self.tipo.value}', estado='{self.estado.value}')>"
\ No newline at end of file
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Text, DateTime, JSON, Index, text
+from sqlalchemy.sql import func
+from .base import Base
+
+class OutboxEvent(Base):
+    """
+    Evento pendiente de publicar en RabbitMQ. Se inserta en la misma transacción
+    que el cambio que lo origina y el OutboxRelay lo publica en orden de id.
+    """
+    __tablename__ = "outbox_events"
+
+    # BIGSERIAL: el orden de inserción es el orden de publicación
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    event_id = Column(String(36), nullable=True, comment="eventId del mensaje (para deduplicar en los consumidores)")
+    exchange_name = Column(String(100), nullable=False, comment="Exchange de destino")
+    routing_key = Column(String(100), nullable=False, comment="Routing key del mensaje")
+    payload = Column(JSON, nullable=False, comment="Mensaje completo a publicar")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, comment="Momento en que se registró el evento")
+    attempts = Column(Integer, default=0, nullable=False, comment="Intentos de publicación fallidos")
+    last_error = Column(Text, nullable=True, comment="Último error de publicación")
+    published_at = Column(DateTime(timezone=True), nullable=True, comment="Momento en que se publicó (NULL = pendiente)")
+    failed_at = Column(DateTime(timezone=True), nullable=True, comment="Momento en que se descartó por superar los reintentos")
+
+    # Índice parcial sobre los pendientes (el relay los lee por id) y por fecha de publicación (limpieza)
+    __table_args__ = (
+        Index(
+            'ix_outbox_events_pending',
+            'id',
+            postgresql_where=text('published_at IS NULL AND failed_at IS NULL'),
+            sqlite_where=text('published_at IS NULL AND failed_at IS NULL')
+        ),
+        Index('ix_outbox_events_published_at', 'published_at'),
+    )
+
+    def __repr__(self):
+        return f"<OutboxEvent(id={self.id}, routing_key='{self.routing_key}', event_id='{self.event_id}')>"
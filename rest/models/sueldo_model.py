@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Text, ForeignKey, Numeric
+from sqlalchemy import Column, String, Boolean, Text, ForeignKey, Numeric, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -13,6 +13,11 @@ class Sueldo(Base):
     observaciones = Column(Text, nullable=True)
     status = Column(Boolean, default=True, nullable=False)
     
+    # Índice para el chequeo de sueldo activo por usuario (EXISTS resuelto solo con el índice)
+    __table_args__ = (
+        Index('ix_sueldos_id_usuario_status', 'id_usuario', 'status'),
+    )
+    
     # Relación con usuario
     usuario = relationship("Usuario", back_populates="sueldos")
     
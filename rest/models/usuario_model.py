@@ -1,10 +1,13 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, Index, Sequence
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import Base
 import uuid
 
+# Numeración de legajos USR######; create_all la crea junto con las tablas
+legajo_seq = Sequence("usuarios_legajo_seq", start=1, minvalue=1, maxvalue=999999, metadata=Base.metadata)
+
 class Usuario(Base):
     __tablename__ = "usuarios"
     
@@ -21,6 +24,15 @@ class Usuario(Base):
     id_rol = Column(UUID(as_uuid=True), ForeignKey("roles.id_rol"), nullable=False, comment="Rol único del usuario")
     status = Column(Boolean, default=True, nullable=False, comment="Estado del usuario (activo/inactivo)")
     
+    # Índice para búsquedas por prefijo (LIKE 'base%') en la generación de emails institucionales
+    __table_args__ = (
+        Index(
+            'ix_usuarios_email_institucional_pattern',
+            'email_institucional',
+            postgresql_ops={'email_institucional': 'varchar_pattern_ops'}
+        ),
+    )
+    
     # Relaciones
     rol = relationship("Rol", back_populates="usuarios")
     sueldos = relationship("Sueldo", back_populates="usuario", cascade="all, delete-orphan")
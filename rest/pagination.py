@@ -0,0 +1,97 @@
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import Response
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+# Header con el cursor de la página siguiente (se omite en la última página)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """El cursor recibido está malformado o no corresponde al listado"""
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _from_json(column, value: Any) -> Any:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type in (int, float, str) and not isinstance(value, python_type):
+        raise InvalidCursorError("Cursor inválido")
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Codificar los valores de la clave de orden de la última fila como cursor opaco"""
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """Decodificar un cursor y convertir sus valores al tipo de cada columna de orden"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise InvalidCursorError("Cursor inválido")
+        return [_from_json(column, value) for column, value in zip(columns, values)]
+    except InvalidCursorError:
+        raise
+    except (ValueError, TypeError, AttributeError):
+        raise InvalidCursorError("Cursor inválido")
+
+
+async def keyset_page(
+    db: AsyncSession,
+    query: Select,
+    columns: Sequence[Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Paginar por keyset: ordena por `columns` (que deben identificar la fila de
+    forma única y estar indexadas) y continúa estrictamente después del cursor.
+    Retorna (filas, cursor de la página siguiente o None si no hay más).
+    """
+    key = tuple_(*columns)
+    if cursor:
+        values = tuple(decode_cursor(cursor, columns))
+        query = query.where(key < values if descending else key > values)
+
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in columns])
+    result = await db.execute(query.limit(limit + 1))
+    rows = list(result.scalars().all())
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, column.key) for column in columns])
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Exponer el cursor de la página siguiente en el header de la respuesta"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -1,8 +1,24 @@
-from .core_client import core_client, CoreAuthClient
-from .dependencies import get_current_user
+from .core_client import core_client, CoreAuthClient, CoreUnavailableError
+from .dependencies import get_current_user, invalidate_token, token_verifications
+from .token_cache import token_cache, TokenCache
+from .password_hasher import password_hasher, PasswordHasher
+from .rate_limiter import login_rate_limiter, LoginRateLimiter, RateLimitStore, InMemoryRateLimitStore, trusted_proxies, TrustedProxies
 
 __all__ = [
     "core_client",
     "CoreAuthClient", 
-    "get_current_user"
+    "CoreUnavailableError",
+    "get_current_user",
+    "invalidate_token",
+    "token_verifications",
+    "token_cache",
+    "TokenCache",
+    "password_hasher",
+    "PasswordHasher",
+    "login_rate_limiter",
+    "LoginRateLimiter",
+    "RateLimitStore",
+    "InMemoryRateLimitStore",
+    "trusted_proxies",
+    "TrustedProxies"
 ]
@@ -0,0 +1,156 @@
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CORE_CB_FAILURE_RATE = float(os.getenv('CORE_CB_FAILURE_RATE', '0.5'))
+CORE_CB_SLOW_CALL_SECONDS = float(os.getenv('CORE_CB_SLOW_CALL_SECONDS', '2'))
+CORE_CB_SLOW_CALL_RATE = float(os.getenv('CORE_CB_SLOW_CALL_RATE', '0.8'))
+CORE_CB_MIN_CALLS = int(os.getenv('CORE_CB_MIN_CALLS', '10'))
+CORE_CB_WINDOW_SECONDS = float(os.getenv('CORE_CB_WINDOW_SECONDS', '30'))
+CORE_CB_OPEN_SECONDS = float(os.getenv('CORE_CB_OPEN_SECONDS', '15'))
+CORE_CB_HALF_OPEN_PROBES = int(os.getenv('CORE_CB_HALF_OPEN_PROBES', '1'))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """El circuito está abierto: la llamada se rechaza sin contactar al upstream"""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por tasa de fallos y de llamadas lentas sobre una ventana deslizante.
+
+    - closed: las llamadas pasan; si en la ventana hay al menos `min_calls` y la
+      tasa de fallos o de llamadas lentas supera su umbral, se abre.
+    - open: las llamadas se rechazan con CircuitOpenError durante `open_seconds`.
+    - half_open: se permiten `half_open_probes` llamadas de prueba; si una falla
+      vuelve a open, si todas terminan bien vuelve a closed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = CORE_CB_FAILURE_RATE,
+        slow_call_seconds: float = CORE_CB_SLOW_CALL_SECONDS,
+        slow_call_rate: float = CORE_CB_SLOW_CALL_RATE,
+        min_calls: int = CORE_CB_MIN_CALLS,
+        window_seconds: float = CORE_CB_WINDOW_SECONDS,
+        open_seconds: float = CORE_CB_OPEN_SECONDS,
+        half_open_probes: int = CORE_CB_HALF_OPEN_PROBES,
+        is_failure: Optional[Callable[[BaseException], bool]] = None
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.is_failure = is_failure or (lambda exc: True)
+
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        # (timestamp, fallo, lenta)
+        self._window: "deque[tuple[float, bool, bool]]" = deque()
+
+        self.rejected = 0
+        self.times_opened = 0
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Ejecutar fn() a través del circuito"""
+        probe = self._before_call()
+        started = time.monotonic()
+        try:
+            result = await fn()
+        except Exception as exc:
+            self._after_call(probe, self.is_failure(exc), time.monotonic() - started)
+            raise
+        except BaseException:
+            # Cancelación: no dice nada del upstream, solo liberar el cupo de prueba
+            if probe:
+                self._probes_in_flight -= 1
+            raise
+        self._after_call(probe, False, time.monotonic() - started)
+        return result
+
+    def _before_call(self) -> bool:
+        """Validar si la llamada puede pasar; retorna True si es una prueba half-open"""
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                raise CircuitOpenError(f"Circuito '{self.name}' abierto")
+            self.state = HALF_OPEN
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+            print(f"🟡 Circuito '{self.name}' en half-open, probando upstream")
+
+        if self.state == HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_probes:
+                self.rejected += 1
+                raise CircuitOpenError(f"Circuito '{self.name}' en prueba (half-open)")
+            self._probes_in_flight += 1
+            return True
+
+        return False
+
+    def _after_call(self, probe: bool, failed: bool, elapsed: float) -> None:
+        slow = elapsed >= self.slow_call_seconds
+
+        if probe:
+            self._probes_in_flight -= 1
+            if self.state != HALF_OPEN:
+                return
+            if failed or slow:
+                self._open()
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                self.state = CLOSED
+                self._window.clear()
+                print(f"🟢 Circuito '{self.name}' cerrado, upstream recuperado")
+            return
+
+        now = time.monotonic()
+        self._window.append((now, failed, slow))
+        self._trim(now)
+
+        if self.state == CLOSED and len(self._window) >= self.min_calls:
+            total = len(self._window)
+            failures = sum(1 for _, f, _ in self._window if f)
+            slow_calls = sum(1 for _, _, s in self._window if s)
+            if failures / total >= self.failure_rate or slow_calls / total >= self.slow_call_rate:
+                self._open()
+
+    def _trim(self, now: float) -> None:
+        while self._window and now - self._window[0][0] > self.window_seconds:
+            self._window.popleft()
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._window.clear()
+        self.times_opened += 1
+        print(f"🔴 Circuito '{self.name}' abierto por {self.open_seconds}s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener estado y contadores del circuito"""
+        self._trim(time.monotonic())
+        total = len(self._window)
+        return {
+            "state": self.state,
+            "window_calls": total,
+            "window_failures": sum(1 for _, f, _ in self._window if f),
+            "window_slow_calls": sum(1 for _, _, s in self._window if s),
+            "rejected": self.rejected,
+            "times_opened": self.times_opened
+        }
@@ -1,33 +1,347 @@
+import os
+import asyncio
+import time
 import httpx
-from typing import Dict, Any
+import jwt
+from typing import Dict, Any, Optional
+from dotenv import load_dotenv
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+
+load_dotenv()
 
 CORE_API_URL = "https://jtseq9puk0.execute-api.us-east-1.amazonaws.com"
 
+# Pool de conexiones HTTP hacia el core (un único cliente compartido)
+CORE_HTTP_MAX_CONNECTIONS = int(os.getenv('CORE_HTTP_MAX_CONNECTIONS', '20'))
+CORE_HTTP_MAX_KEEPALIVE = int(os.getenv('CORE_HTTP_MAX_KEEPALIVE', '10'))
+CORE_HTTP_KEEPALIVE_EXPIRY = float(os.getenv('CORE_HTTP_KEEPALIVE_EXPIRY', '30'))
+CORE_HTTP2 = os.getenv('CORE_HTTP2', 'false').lower() in ["true", "1", "yes"]
+CORE_HTTP_CONNECT_TIMEOUT = float(os.getenv('CORE_HTTP_CONNECT_TIMEOUT', '3'))
+CORE_HTTP_READ_TIMEOUT = float(os.getenv('CORE_HTTP_READ_TIMEOUT', '5'))
+CORE_HTTP_POOL_TIMEOUT = float(os.getenv('CORE_HTTP_POOL_TIMEOUT', '2'))
+
+# Modo de verificación de JWT: "remote" (verify-jwt del core) o "local" (PyJWT)
+CORE_JWT_VERIFY_MODE = os.getenv('CORE_JWT_VERIFY_MODE', 'remote').lower()
+CORE_JWT_PUBLIC_KEY = os.getenv('CORE_JWT_PUBLIC_KEY', '').replace("\\n", "\n")
+CORE_JWKS_URL = os.getenv('CORE_JWKS_URL', '')
+CORE_JWKS_REFRESH_SECONDS = float(os.getenv('CORE_JWKS_REFRESH_SECONDS', '300'))
+# Un kid desconocido fuerza un refresco como mucho cada tantos segundos
+CORE_JWKS_MIN_REFRESH_SECONDS = float(os.getenv('CORE_JWKS_MIN_REFRESH_SECONDS', '30'))
+# Los kids que siguen sin aparecer tras refrescar se rechazan sin salir a la red durante este tiempo
+CORE_JWKS_UNKNOWN_KID_TTL_SECONDS = float(os.getenv('CORE_JWKS_UNKNOWN_KID_TTL_SECONDS', '60'))
+CORE_JWKS_UNKNOWN_KID_MAX_SIZE = int(os.getenv('CORE_JWKS_UNKNOWN_KID_MAX_SIZE', '1024'))
+CORE_JWT_ALGORITHMS = [a.strip() for a in os.getenv('CORE_JWT_ALGORITHMS', 'RS256').split(',') if a.strip()]
+CORE_JWT_AUDIENCE = os.getenv('CORE_JWT_AUDIENCE') or None
+CORE_JWT_ISSUER = os.getenv('CORE_JWT_ISSUER') or None
+CORE_JWT_REMOTE_REVOCATION_CHECK = os.getenv('CORE_JWT_REMOTE_REVOCATION_CHECK', 'false').lower() in ["true", "1", "yes"]
+
+# Claims registrados del JWT que no forman parte de los datos del usuario
+_REGISTERED_CLAIMS = {"iss", "sub", "aud", "exp", "nbf", "iat", "jti", "kind", "type", "typ"}
+
+
+class CoreUnavailableError(Exception):
+    """El core no está disponible: circuito abierto, error de red, timeout o 5xx"""
+
+
+def _is_upstream_failure(exc: BaseException) -> bool:
+    """Solo los errores del core cuentan para el circuito, no los 4xx del token"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
 
 class CoreAuthClient:
-    
-    def __init__(self, base_url: str = CORE_API_URL):
+
+    def __init__(self, base_url: str = CORE_API_URL, verify_mode: str = CORE_JWT_VERIFY_MODE):
         self.base_url = base_url.rstrip("/")
-        self.timeout = 30.0
-    
-    async def verify_token(self, token: str, kind: str = "access") -> Dict[str, Any]:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/api/auth/verify-jwt",
-                headers={"Authorization": f"Bearer {token}"},
-                json={"kind": kind, "token": token}
+        self.timeout = httpx.Timeout(
+            CORE_HTTP_READ_TIMEOUT,
+            connect=CORE_HTTP_CONNECT_TIMEOUT,
+            pool=CORE_HTTP_POOL_TIMEOUT
+        )
+        self.limits = httpx.Limits(
+            max_connections=CORE_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=CORE_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=CORE_HTTP_KEEPALIVE_EXPIRY
+        )
+        self.http2 = CORE_HTTP2 and self._h2_available()
+        self._client: Optional[httpx.AsyncClient] = None
+        self.verify_mode = verify_mode
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._requests = 0
+        self._errors = 0
+        self._total_latency = 0.0
+        self.breaker = CircuitBreaker("core-auth", is_failure=_is_upstream_failure)
+        self._jwks: Dict[str, Any] = {}
+        self._jwks_lock = asyncio.Lock()
+        self._jwks_task: Optional[asyncio.Task] = None
+        self._jwks_refreshed_at = 0.0
+        # kid -> momento hasta el que se rechaza sin refrescar
+        self._unknown_kids: Dict[Optional[str], float] = {}
+
+    @staticmethod
+    def _h2_available() -> bool:
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            print("⚠️ CORE_HTTP2 habilitado pero el paquete 'h2' no está instalado, usando HTTP/1.1")
+            return False
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Obtener el cliente HTTP compartido (se crea bajo demanda fuera del lifespan)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2
             )
+        return self._client
+
+    async def _request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> httpx.Response:
+        """
+        Ejecutar una request al core a través del circuit breaker.
+        Lanza CoreUnavailableError si el core no está disponible.
+        """
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        try:
+            return await self.breaker.call(lambda: self._send(method, url, **kwargs))
+        except CircuitOpenError as e:
+            raise CoreUnavailableError(str(e)) from e
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code >= 500:
+                raise CoreUnavailableError(f"El core respondió {e.response.status_code}") from e
+            raise
+        except httpx.TransportError as e:
+            raise CoreUnavailableError(f"Error de conexión con el core: {e!r}") from e
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Ejecutar una request con el pool compartido registrando métricas"""
+        client = self._get_client()
+
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
             response.raise_for_status()
-            return response.json()
-    
-    async def get_me(self, access_token: str) -> Dict[str, Any]:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
-                f"{self.base_url}/api/auth/me",
-                headers={"Authorization": f"Bearer {access_token}"}
+            return response
+        except Exception:
+            self._errors += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._requests += 1
+            self._total_latency += time.perf_counter() - started
+
+    async def start(self):
+        """Abrir el pool HTTP compartido y, en modo local, el refresco del JWKS"""
+        self._get_client()
+        print(f"✅ Cliente HTTP del core inicializado (max_connections={CORE_HTTP_MAX_CONNECTIONS}, http2={self.http2})")
+
+        if self.verify_mode != "local":
+            return
+
+        if not CORE_JWT_PUBLIC_KEY and not CORE_JWKS_URL:
+            print("⚠️ CORE_JWT_VERIFY_MODE=local sin CORE_JWT_PUBLIC_KEY ni CORE_JWKS_URL, usando verificación remota")
+            self.verify_mode = "remote"
+            return
+
+        if CORE_JWKS_URL and self._jwks_task is None:
+            try:
+                await self._refresh_jwks()
+            except Exception as e:
+                print(f"⚠️ No se pudo obtener el JWKS del core: {e}")
+            self._jwks_task = asyncio.create_task(self._jwks_refresh_loop())
+        print("✅ Verificación local de JWT habilitada")
+
+    async def close(self):
+        """Liberar recursos del cliente"""
+        if self._jwks_task:
+            self._jwks_task.cancel()
+            try:
+                await self._jwks_task
+            except asyncio.CancelledError:
+                pass
+            self._jwks_task = None
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Obtener métricas de uso del pool HTTP hacia el core"""
+        open_connections = None
+        idle_connections = None
+        # httpx no expone el pool públicamente: leerlo solo si está disponible
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            open_connections = len(connections)
+            idle_connections = sum(1 for conn in connections if conn.is_idle())
+
+        return {
+            "max_connections": CORE_HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": CORE_HTTP_MAX_KEEPALIVE,
+            "http2": self.http2,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "utilization": round(self._in_flight / CORE_HTTP_MAX_CONNECTIONS, 4) if CORE_HTTP_MAX_CONNECTIONS else 0.0,
+            "open_connections": open_connections,
+            "idle_connections": idle_connections,
+            "requests": self._requests,
+            "errors": self._errors,
+            "avg_latency_ms": round(self._total_latency / self._requests * 1000, 2) if self._requests else 0.0
+        }
+
+    async def verify_token(self, token: str, kind: str = "access", timeout: Optional[float] = None) -> Dict[str, Any]:
+        if self.verify_mode == "local":
+            result = await self._verify_token_locally(token, kind)
+            # La revocación solo la conoce el core: consultarlo si se pidió
+            if result.get("valid") and CORE_JWT_REMOTE_REVOCATION_CHECK:
+                remote = await self._verify_token_remote(token, kind, timeout)
+                if not remote.get("valid"):
+                    return remote
+            return result
+
+        return await self._verify_token_remote(token, kind, timeout)
+
+    async def _verify_token_remote(self, token: str, kind: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        response = await self._request(
+            "POST",
+            "/api/auth/verify-jwt",
+            timeout=timeout,
+            headers={"Authorization": f"Bearer {token}"},
+            json={"kind": kind, "token": token}
+        )
+        return response.json()
+
+    async def _verify_token_locally(self, token: str, kind: str) -> Dict[str, Any]:
+        """Verificar firma, expiración y tipo del token sin salir a la red"""
+        try:
+            key = await self._get_signing_key(token)
+            claims = jwt.decode(
+                token,
+                key=key,
+                algorithms=CORE_JWT_ALGORITHMS,
+                audience=CORE_JWT_AUDIENCE,
+                issuer=CORE_JWT_ISSUER,
+                options={
+                    "require": ["exp"],
+                    "verify_aud": CORE_JWT_AUDIENCE is not None
+                }
             )
-            response.raise_for_status()
-            return response.json()
+        except (jwt.InvalidTokenError, jwt.PyJWKError) as e:
+            return {"valid": False, "error": str(e)}
+
+        token_kind = claims.get("kind") or claims.get("type")
+        if token_kind and token_kind != kind:
+            return {"valid": False, "error": f"Tipo de token inválido: {token_kind}"}
+
+        return {"valid": True, "payload": claims, "source": "local"}
+
+    async def _get_signing_key(self, token: str) -> Any:
+        if CORE_JWT_PUBLIC_KEY:
+            return CORE_JWT_PUBLIC_KEY
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._find_jwk(kid)
+        if key is None and not self._is_known_unknown_kid(kid):
+            # Puede ser una rotación de claves: refrescar (con límite de frecuencia) y reintentar
+            refreshed = await self._refresh_jwks(min_interval=CORE_JWKS_MIN_REFRESH_SECONDS)
+            key = self._find_jwk(kid)
+            if key is None and refreshed:
+                self._remember_unknown_kid(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Clave de firma desconocida: kid={kid}")
+        return key
+
+    def _is_known_unknown_kid(self, kid: Optional[str]) -> bool:
+        expires_at = self._unknown_kids.get(kid)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._unknown_kids[kid]
+            return False
+        return True
+
+    def _remember_unknown_kid(self, kid: Optional[str]) -> None:
+        # Acotado: con el cache lleno se descarta el kid más antiguo
+        if len(self._unknown_kids) >= CORE_JWKS_UNKNOWN_KID_MAX_SIZE:
+            self._unknown_kids.pop(next(iter(self._unknown_kids)))
+        self._unknown_kids[kid] = time.monotonic() + CORE_JWKS_UNKNOWN_KID_TTL_SECONDS
+
+    def _find_jwk(self, kid: Optional[str]) -> Any:
+        if kid is not None:
+            return self._jwks.get(kid)
+        # Sin kid solo es inequívoco si el key set tiene una única clave
+        if len(self._jwks) == 1:
+            return next(iter(self._jwks.values()))
+        return None
+
+    async def _refresh_jwks(self, min_interval: float = 0.0) -> bool:
+        """
+        Descargar el key set del core. Con `min_interval` no se vuelve a pedir si
+        el último intento (exitoso o no) fue hace menos de esos segundos: los
+        tokens con kids al azar no pueden convertirse en una ráfaga de pedidos.
+        Retorna si se descargó el key set.
+        """
+        async with self._jwks_lock:
+            if min_interval and time.monotonic() - self._jwks_refreshed_at < min_interval:
+                return False
+            self._jwks_refreshed_at = time.monotonic()
+            response = await self._request("GET", CORE_JWKS_URL)
+            jwk_set = jwt.PyJWKSet.from_dict(response.json())
+            self._jwks = {
+                (jwk.key_id or str(index)): jwk.key
+                for index, jwk in enumerate(jwk_set.keys)
+            }
+            # Una clave rotada puede haber publicado un kid antes rechazado
+            self._unknown_kids.clear()
+            return True
+
+    async def _jwks_refresh_loop(self):
+        while True:
+            await asyncio.sleep(CORE_JWKS_REFRESH_SECONDS)
+            try:
+                await self._refresh_jwks()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Conservar el último key set válido hasta el próximo intento
+                print(f"⚠️ Error refrescando JWKS del core: {e}")
+
+    @staticmethod
+    def user_from_claims(verify_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Construir el usuario a partir de los claims de un token verificado localmente.
+        Retorna None si el token no trae rol/subrol y hace falta consultar /api/auth/me.
+        """
+        if verify_result.get("source") != "local":
+            return None
+
+        claims = verify_result.get("payload") or {}
+        source: Dict[str, Any] = claims.get("user") if isinstance(claims.get("user"), dict) else claims
+        if "role" not in source or "subrol" not in source:
+            return None
+
+        user = {k: v for k, v in source.items() if k not in _REGISTERED_CLAIMS}
+        if "id" not in user and claims.get("sub") is not None:
+            user["id"] = claims["sub"]
+        return user
+
+    async def get_me(self, access_token: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        response = await self._request(
+            "GET",
+            "/api/auth/me",
+            timeout=timeout,
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
+        return response.json()
 
 
 
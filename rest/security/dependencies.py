@@ -1,9 +1,14 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from .core_client import core_client
+from .core_client import core_client, CoreUnavailableError
+from .token_cache import token_cache, token_key
+from .singleflight import SingleFlight
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+# Verificaciones en curso por token: N requests concurrentes comparten una sola
+token_verifications = SingleFlight()
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
@@ -18,17 +23,23 @@ async def get_current_user(
     token = credentials.credentials
     
     try:
-        verify_result = await core_client.verify_token(token, kind="access")
-        
-        if not verify_result.get("valid"):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token inválido o expirado",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        me_result = await core_client.get_me(token)
-        user = me_result.get("user", {})
+        # Reutilizar la verificación previa del mismo token si sigue vigente
+        user = token_cache.get(token)
+        if user is None:
+            try:
+                user = await token_verifications.do(
+                    token_key(token),
+                    lambda: _verify_and_cache(token)
+                )
+            except CoreUnavailableError as e:
+                # Core caído: aceptar tokens validados recientemente (ventana de gracia)
+                user = token_cache.get_stale(token)
+                if user is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail=f"Servicio de autenticación no disponible: {str(e)}",
+                        headers={"Retry-After": str(int(core_client.breaker.open_seconds))},
+                    )
         
         # check ADMINISTRADOR IT
         if user.get("role") != "ADMINISTRADOR" or user.get("subrol") != "IT":
@@ -48,3 +59,34 @@ async def get_current_user(
             detail=f"Error al validar token: {str(e)}",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+async def _verify_and_cache(token: str) -> dict:
+    user = await _verify_with_core(token)
+    token_cache.set(token, user)
+    return user
+
+
+async def _verify_with_core(token: str) -> dict:
+    """Verificar el token contra el core y obtener el usuario autenticado"""
+    verify_result = await core_client.verify_token(token, kind="access")
+    
+    if not verify_result.get("valid"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido o expirado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # En modo local el token puede traer rol/subrol y evitar la llamada a /me
+    user = core_client.user_from_claims(verify_result)
+    if user is not None:
+        return user
+    
+    me_result = await core_client.get_me(token)
+    return me_result.get("user", {})
+
+
+def invalidate_token(token: str) -> bool:
+    """Hook explícito para descartar un token cacheado (logout, revocación)"""
+    return token_cache.invalidate(token)
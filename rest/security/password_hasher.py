@@ -0,0 +1,188 @@
+import os
+import math
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import bcrypt
+from fastapi import HTTPException, status
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BCRYPT_WORKERS = int(os.getenv('BCRYPT_WORKERS', str(min(4, os.cpu_count() or 1))))
+BCRYPT_MAX_QUEUE = int(os.getenv('BCRYPT_MAX_QUEUE', '32'))
+# Costo fijo opcional; si no se define se calibra al iniciar según BCRYPT_TARGET_MS
+BCRYPT_ROUNDS = os.getenv('BCRYPT_ROUNDS')
+BCRYPT_TARGET_MS = float(os.getenv('BCRYPT_TARGET_MS', '250'))
+BCRYPT_MIN_ROUNDS = int(os.getenv('BCRYPT_MIN_ROUNDS', '12'))
+BCRYPT_MAX_ROUNDS = int(os.getenv('BCRYPT_MAX_ROUNDS', '15'))
+# Por defecto solo se rehashea hacia un costo mayor; con true también se baja al objetivo
+BCRYPT_REHASH_DOWNGRADE = os.getenv('BCRYPT_REHASH_DOWNGRADE', 'false').lower() in ["true", "1", "yes"]
+# Costo por defecto de bcrypt.gensalt()
+_DEFAULT_ROUNDS = 12
+# Costo bajo con el que se mide el host antes de extrapolar
+_PROBE_ROUNDS = 8
+
+
+class PasswordHasher:
+    """
+    Hash y verificación bcrypt fuera del event loop.
+
+    bcrypt libera el GIL, así que un pool de threads acotado alcanza para no
+    bloquear el resto de las requests. Si hay más de `max_queue` operaciones
+    esperando worker se responde 503 de inmediato en lugar de encolar sin límite.
+    """
+
+    def __init__(self, workers: int = BCRYPT_WORKERS, max_queue: int = BCRYPT_MAX_QUEUE):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.rounds = int(BCRYPT_ROUNDS) if BCRYPT_ROUNDS else _DEFAULT_ROUNDS
+        self.calibrated_ms: Optional[float] = None
+        self._pending = 0
+        self.rejected = 0
+        self._ops = {"hash": 0, "check": 0}
+        self._total_wait = 0.0
+        self._total_run = 0.0
+        self._max_run = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    @staticmethod
+    def _timed(fn: Callable[..., Any], args: Tuple[Any, ...], submitted_at: float) -> Tuple[Any, float, float]:
+        started = time.perf_counter()
+        result = fn(*args)
+        return result, started - submitted_at, time.perf_counter() - started
+
+    async def _run(self, op: str, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servicio saturado, reintente en unos segundos",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, waited, ran = await loop.run_in_executor(
+                self._get_executor(), self._timed, fn, args, time.perf_counter()
+            )
+        finally:
+            self._pending -= 1
+
+        self._ops[op] += 1
+        self._total_wait += waited
+        self._total_run += ran
+        self._max_run = max(self._max_run, ran)
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Generar el hash bcrypt de una contraseña en texto plano"""
+        hashed = await self._run("hash", bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(rounds=self.rounds))
+        return hashed.decode('utf-8')
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Hashear un lote en paralelo sin ocupar más de `workers` lugares del pool,
+        así la cola queda libre para los logins concurrentes
+        """
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def hash_one(password: str) -> str:
+            async with semaphore:
+                return await self.hash(password)
+
+        return list(await asyncio.gather(*(hash_one(password) for password in passwords)))
+
+    async def check(self, password: str, hashed: str) -> bool:
+        """Comparar una contraseña en texto plano con el hash almacenado"""
+        return await self._run("check", bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+    async def calibrate(
+        self,
+        target_ms: float = BCRYPT_TARGET_MS,
+        min_rounds: int = BCRYPT_MIN_ROUNDS,
+        max_rounds: int = BCRYPT_MAX_ROUNDS
+    ) -> int:
+        """
+        Elegir el costo bcrypt cuyo tiempo de hash en este host quede más cerca
+        de `target_ms` sin superarlo, nunca por debajo de `min_rounds`. Cada
+        round adicional duplica el tiempo, así que alcanza con medir un costo
+        bajo y extrapolar. Si BCRYPT_ROUNDS está definido se respeta ese valor.
+        """
+        if BCRYPT_ROUNDS:
+            return self.rounds
+
+        def measure() -> float:
+            salt = bcrypt.gensalt(rounds=_PROBE_ROUNDS)
+            samples = []
+            for _ in range(3):
+                started = time.perf_counter()
+                bcrypt.hashpw(b"calibracion-bcrypt", salt)
+                samples.append(time.perf_counter() - started)
+            return sorted(samples)[1] * 1000
+
+        loop = asyncio.get_running_loop()
+        measured_ms = await loop.run_in_executor(self._get_executor(), measure)
+
+        extra = math.floor(math.log2(target_ms / measured_ms)) if measured_ms > 0 and target_ms > measured_ms else 0
+        self.rounds = max(min_rounds, min(max_rounds, _PROBE_ROUNDS + extra))
+        self.calibrated_ms = measured_ms * (2 ** (self.rounds - _PROBE_ROUNDS))
+        print(f"✅ bcrypt calibrado: rounds={self.rounds} (~{self.calibrated_ms:.0f} ms por hash, objetivo {target_ms:.0f} ms)")
+        return self.rounds
+
+    @staticmethod
+    def rounds_of(hashed: str) -> Optional[int]:
+        """Leer el costo de un hash bcrypt ($2b$12$...)"""
+        try:
+            return int(hashed.split("$")[2])
+        except (AttributeError, IndexError, ValueError):
+            return None
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """
+        Indicar si el hash almacenado usa un costo menor al objetivo. Cada worker
+        calibra por su cuenta y el ruido de la medición puede darles objetivos
+        distintos: rehashear solo hacia arriba evita que un hash oscile entre
+        costos en cada login (BCRYPT_REHASH_DOWNGRADE=true también lo baja).
+        """
+        rounds = self.rounds_of(hashed)
+        if rounds is None:
+            return False
+        if BCRYPT_REHASH_DOWNGRADE:
+            return rounds != self.rounds
+        return rounds < self.rounds
+
+    def shutdown(self):
+        """Liberar el pool de threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener métricas de uso y latencia del pool"""
+        ops = self._ops["hash"] + self._ops["check"]
+        return {
+            "workers": self.workers,
+            "rounds": self.rounds,
+            "calibrated_ms": round(self.calibrated_ms, 2) if self.calibrated_ms is not None else None,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "queued": max(0, self._pending - self.workers),
+            "rejected": self.rejected,
+            "hashes": self._ops["hash"],
+            "checks": self._ops["check"],
+            "avg_wait_ms": round(self._total_wait / ops * 1000, 2) if ops else 0.0,
+            "avg_run_ms": round(self._total_run / ops * 1000, 2) if ops else 0.0,
+            "max_run_ms": round(self._max_run * 1000, 2)
+        }
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,280 @@
+import os
+import time
+import ipaddress
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Token bucket por IP: ráfaga máxima y reposición por minuto
+LOGIN_RL_IP_BURST = int(os.getenv('LOGIN_RL_IP_BURST', '20'))
+LOGIN_RL_IP_PER_MINUTE = float(os.getenv('LOGIN_RL_IP_PER_MINUTE', '30'))
+# Token bucket por email institucional
+LOGIN_RL_EMAIL_BURST = int(os.getenv('LOGIN_RL_EMAIL_BURST', '5'))
+LOGIN_RL_EMAIL_PER_MINUTE = float(os.getenv('LOGIN_RL_EMAIL_PER_MINUTE', '10'))
+# Ventana deslizante de intentos fallidos por email
+LOGIN_RL_MAX_FAILURES = int(os.getenv('LOGIN_RL_MAX_FAILURES', '5'))
+LOGIN_RL_FAILURE_WINDOW_SECONDS = float(os.getenv('LOGIN_RL_FAILURE_WINDOW_SECONDS', '300'))
+# Cantidad máxima de claves en memoria (se desalojan las menos usadas)
+LOGIN_RL_MAX_KEYS = int(os.getenv('LOGIN_RL_MAX_KEYS', '10000'))
+# Proxies confiables (IPs o CIDRs separados por coma, o "*") cuyo X-Forwarded-For se usa para la IP del cliente
+TRUSTED_PROXIES = [p.strip() for p in os.getenv('TRUSTED_PROXIES', '').split(',') if p.strip()]
+
+
+class TrustedProxies:
+    """
+    Resolver la IP real del cliente detrás de proxies reversos.
+
+    Solo se lee X-Forwarded-For si el par directo es un proxy confiable; la
+    cabecera se recorre de derecha a izquierda salteando los proxies confiables
+    y la primera dirección que no lo es se toma como cliente (las entradas a su
+    izquierda las puede inventar el cliente). Con "*" se confía en cualquier par
+    y se toma la entrada más a la izquierda, igual que uvicorn con
+    --forwarded-allow-ips="*": usarlo solo si la app no es accesible sin pasar
+    por el proxy.
+    """
+
+    def __init__(self, proxies: List[str] = TRUSTED_PROXIES):
+        self.trust_all = "*" in proxies
+        self.networks = []
+        for proxy in proxies:
+            if proxy == "*":
+                continue
+            try:
+                self.networks.append(ipaddress.ip_network(proxy, strict=False))
+            except ValueError:
+                print(f"⚠️ TRUSTED_PROXIES: dirección inválida ignorada: {proxy}")
+
+    def is_trusted(self, host: Optional[str]) -> bool:
+        if self.trust_all:
+            return True
+        if not host or not self.networks:
+            return False
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.networks)
+
+    def client_ip(self, request: Request) -> Optional[str]:
+        """IP del cliente de la request, atravesando solo proxies confiables"""
+        peer = request.client.host if request.client else None
+        if not self.is_trusted(peer):
+            return peer
+
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if not forwarded_for:
+            return peer
+        hosts = [host.strip() for host in forwarded_for.split(",") if host.strip()]
+        if not hosts:
+            return peer
+        if self.trust_all:
+            return hosts[0]
+        for host in reversed(hosts):
+            if not self.is_trusted(host):
+                return host
+        # Toda la cadena son proxies propios: el más lejano es lo más cercano al cliente
+        return hosts[0]
+
+
+class RateLimitStore(ABC):
+    """
+    Almacenamiento del estado del limitador.
+
+    La implementación en memoria sirve para un solo proceso; para compartir el
+    estado entre varios workers se puede implementar la misma interfaz sobre un
+    almacenamiento externo (ej: Redis) y pasarla a LoginRateLimiter.
+    """
+
+    @abstractmethod
+    async def take(self, key: str, capacity: int, per_second: float) -> Tuple[bool, float]:
+        """Consumir un token del bucket `key`; retorna (permitido, segundos hasta el próximo token)"""
+
+    @abstractmethod
+    async def failures(self, key: str, window: float) -> Tuple[int, float]:
+        """Contar fallos dentro de la ventana; retorna (cantidad, segundos hasta que vence el más viejo)"""
+
+    @abstractmethod
+    async def add_failure(self, key: str, window: float, limit: int) -> None:
+        """Registrar un fallo en la ventana de `key`"""
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        """Olvidar el estado asociado a `key`"""
+
+    @abstractmethod
+    def size(self) -> int:
+        """Cantidad de claves retenidas"""
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """Estado del limitador en memoria del proceso, acotado por LRU"""
+
+    def __init__(self, max_keys: int = LOGIN_RL_MAX_KEYS):
+        self.max_keys = max_keys
+        # key -> [tokens, último refill]
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        # key -> timestamps de fallos
+        self._failures: "OrderedDict[str, deque]" = OrderedDict()
+        self.evictions = 0
+
+    def _evict(self, entries: OrderedDict) -> None:
+        while len(entries) > self.max_keys:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    async def take(self, key: str, capacity: int, per_second: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(capacity), now]
+            self._buckets[key] = bucket
+            self._evict(self._buckets)
+        else:
+            bucket[0] = min(float(capacity), bucket[0] + (now - bucket[1]) * per_second)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return True, 0.0
+        return False, (1 - bucket[0]) / per_second if per_second > 0 else float("inf")
+
+    @staticmethod
+    def _trim(attempts: deque, window: float, now: float) -> None:
+        while attempts and now - attempts[0] > window:
+            attempts.popleft()
+
+    async def failures(self, key: str, window: float) -> Tuple[int, float]:
+        attempts = self._failures.get(key)
+        if not attempts:
+            return 0, 0.0
+        now = time.monotonic()
+        self._trim(attempts, window, now)
+        if not attempts:
+            del self._failures[key]
+            return 0, 0.0
+        return len(attempts), attempts[0] + window - now
+
+    async def add_failure(self, key: str, window: float, limit: int) -> None:
+        now = time.monotonic()
+        attempts = self._failures.get(key)
+        if attempts is None:
+            # Solo interesan los últimos `limit` fallos
+            attempts = deque(maxlen=max(1, limit))
+            self._failures[key] = attempts
+            self._evict(self._failures)
+        else:
+            self._failures.move_to_end(key)
+        self._trim(attempts, window, now)
+        attempts.append(now)
+
+    async def reset(self, key: str) -> None:
+        self._buckets.pop(key, None)
+        self._failures.pop(key, None)
+
+    def size(self) -> int:
+        return len(self._buckets) + len(self._failures)
+
+
+class LoginRateLimiter:
+    """
+    Limitador de intentos de login por IP y por email institucional.
+
+    - Token bucket por IP y por email: corta ráfagas sin castigar el uso normal.
+    - Ventana deslizante de fallos por email: después de `max_failures` intentos
+      fallidos se rechaza hasta que venza el fallo más viejo; un login exitoso la limpia.
+
+    Se consulta antes de tocar la base o bcrypt, así un ataque de fuerza bruta
+    no consume workers del pool de hashing.
+    """
+
+    def __init__(
+        self,
+        store: Optional[RateLimitStore] = None,
+        ip_burst: int = LOGIN_RL_IP_BURST,
+        ip_per_minute: float = LOGIN_RL_IP_PER_MINUTE,
+        email_burst: int = LOGIN_RL_EMAIL_BURST,
+        email_per_minute: float = LOGIN_RL_EMAIL_PER_MINUTE,
+        max_failures: int = LOGIN_RL_MAX_FAILURES,
+        failure_window: float = LOGIN_RL_FAILURE_WINDOW_SECONDS
+    ):
+        self.store = store or InMemoryRateLimitStore()
+        self.ip_burst = ip_burst
+        self.ip_per_second = ip_per_minute / 60
+        self.email_burst = email_burst
+        self.email_per_second = email_per_minute / 60
+        self.max_failures = max_failures
+        self.failure_window = failure_window
+
+        self.allowed = 0
+        self.rejected = {"ip": 0, "email": 0, "failures": 0}
+        self.failures_recorded = 0
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return f"email:{email.strip().lower()}"
+
+    @staticmethod
+    def _ip_key(ip: Optional[str]) -> str:
+        return f"ip:{ip or 'desconocida'}"
+
+    def _reject(self, reason: str, retry_after: float) -> HTTPException:
+        self.rejected[reason] += 1
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Demasiados intentos de login, reintente más tarde",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
+
+    async def check(self, email: str, ip: Optional[str]) -> None:
+        """Validar el intento; lanza HTTPException 429 si supera algún límite"""
+        email_key = self._email_key(email)
+
+        if self.max_failures > 0:
+            failures, retry_after = await self.store.failures(email_key, self.failure_window)
+            if failures >= self.max_failures:
+                raise self._reject("failures", retry_after)
+
+        allowed, retry_after = await self.store.take(self._ip_key(ip), self.ip_burst, self.ip_per_second)
+        if not allowed:
+            raise self._reject("ip", retry_after)
+
+        allowed, retry_after = await self.store.take(email_key, self.email_burst, self.email_per_second)
+        if not allowed:
+            raise self._reject("email", retry_after)
+
+        self.allowed += 1
+
+    async def record_failure(self, email: str) -> None:
+        """Registrar un intento fallido para el email"""
+        if self.max_failures <= 0:
+            return
+        self.failures_recorded += 1
+        await self.store.add_failure(self._email_key(email), self.failure_window, self.max_failures)
+
+    async def record_success(self, email: str) -> None:
+        """Limpiar el estado del email después de un login exitoso"""
+        await self.store.reset(self._email_key(email))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener contadores del limitador"""
+        stats = {
+            "allowed": self.allowed,
+            "rejected_ip": self.rejected["ip"],
+            "rejected_email": self.rejected["email"],
+            "rejected_failures": self.rejected["failures"],
+            "failures_recorded": self.failures_recorded,
+            "tracked_keys": self.store.size()
+        }
+        if isinstance(self.store, InMemoryRateLimitStore):
+            stats["evictions"] = self.store.evictions
+        return stats
+
+
+login_rate_limiter = LoginRateLimiter()
+trusted_proxies = TrustedProxies()
@@ -0,0 +1,50 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Coalescer de llamadas concurrentes: mientras una operación para una clave
+    está en curso, las demás llamadas con la misma clave esperan su resultado
+    (o su excepción) en lugar de ejecutarla de nuevo.
+
+    La operación corre en su propia tarea, así que si el primer solicitante se
+    cancela (ej: el cliente cortó la conexión) los demás siguen esperándola.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+        self.deduplicated = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Ejecutar fn() una sola vez por clave entre llamadas concurrentes"""
+        self.calls += 1
+        task = self._in_flight.get(key)
+
+        if task is not None:
+            self.deduplicated += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t, k=key: self._on_done(k, t))
+
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Marcar la excepción como consumida si nadie quedó esperando
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener contadores de deduplicación"""
+        return {
+            "in_flight": len(self._in_flight),
+            "calls": self.calls,
+            "executions": self.executions,
+            "deduplicated": self.deduplicated
+        }
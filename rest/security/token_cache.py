@@ -0,0 +1,153 @@
+import os
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+import jwt
+from dotenv import load_dotenv
+
+load_dotenv()
+
+AUTH_CACHE_TTL_SECONDS = float(os.getenv('AUTH_CACHE_TTL_SECONDS', '60'))
+AUTH_CACHE_MAX_SIZE = int(os.getenv('AUTH_CACHE_MAX_SIZE', '1024'))
+# Ventana de gracia: con el core caído se aceptan tokens validados hace menos de N segundos
+AUTH_GRACE_SECONDS = float(os.getenv('AUTH_GRACE_SECONDS', '0'))
+
+
+def token_key(token: str) -> str:
+    """Clave estable para un token sin retenerlo en claro"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class _CacheEntry:
+    __slots__ = ("user", "expires_at", "stale_until")
+
+    def __init__(self, user: Dict[str, Any], expires_at: float, stale_until: float):
+        self.user = user
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+
+class TokenCache:
+    """
+    Cache en memoria token -> usuario verificado.
+
+    - Acotado: al superar max_size se desaloja la entrada menos usada (LRU).
+    - Con TTL: cada entrada vive como máximo `ttl` segundos y nunca más allá
+      del claim `exp` del token.
+    - Las claves son el SHA-256 del token (token_key) para no retener tokens en claro.
+    - Con `grace` > 0 las entradas se conservan hasta `grace` segundos desde su
+      validación (tampoco más allá de `exp`) para get_stale() durante caídas del core.
+    """
+
+    def __init__(self, ttl: float = AUTH_CACHE_TTL_SECONDS, max_size: int = AUTH_CACHE_MAX_SIZE, grace: float = AUTH_GRACE_SECONDS):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.grace = grace
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_hits = 0
+
+    @staticmethod
+    def _token_exp(token: str) -> Optional[float]:
+        """Leer el claim `exp` sin verificar la firma (ya la verificó el core)"""
+        try:
+            claims = jwt.decode(token, options={"verify_signature": False})
+        except jwt.PyJWTError:
+            return None
+        exp = claims.get("exp")
+        return float(exp) if isinstance(exp, (int, float)) else None
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Obtener el usuario cacheado para el token, o None si no existe o expiró"""
+        key = token_key(token)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        now = time.monotonic()
+        if entry.expires_at <= now:
+            if entry.stale_until <= now:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.user
+
+    def set(self, token: str, user: Dict[str, Any]) -> None:
+        """Guardar el usuario verificado para el token respetando TTL y `exp`"""
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+
+        ttl = self.ttl
+        grace = max(self.ttl, self.grace)
+        exp = self._token_exp(token)
+        if exp is not None:
+            remaining = exp - time.time()
+            ttl = min(ttl, remaining)
+            grace = min(grace, remaining)
+        if ttl <= 0:
+            return
+
+        now = time.monotonic()
+        key = token_key(token)
+        self._entries[key] = _CacheEntry(user, now + ttl, now + grace)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_stale(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtener el usuario de un token validado recientemente aunque su TTL haya
+        vencido, dentro de la ventana de gracia. Solo para usar con el core caído.
+        """
+        if self.grace <= 0:
+            return None
+
+        entry = self._entries.get(token_key(token))
+        if entry is None or entry.stale_until <= time.monotonic():
+            return None
+
+        self.stale_hits += 1
+        return entry.user
+
+    def invalidate(self, token: str) -> bool:
+        """Eliminar explícitamente un token del cache (ej: logout o revocación)"""
+        removed = self._entries.pop(token_key(token), None) is not None
+        if removed:
+            self.invalidations += 1
+        return removed
+
+    def clear(self) -> None:
+        """Vaciar el cache completo"""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener contadores del cache"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "grace_seconds": self.grace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "stale_hits": self.stale_hits
+        }
+
+
+token_cache = TokenCache()
@@ -1,11 +1,22 @@
+import asyncio
+import logging
+import uuid
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from .. import database
 from ..dao.auth_dao import AuthDAO
 from ..dao.usuario_dao import UsuarioDAO
 from ..dao.sueldo_dao import SueldoDAO
 from ..dao.usuario_carrera_dao import UsuarioCarreraDAO
 from ..schemas.auth_schema import LoginRequest, AuthResponse, RolInfo, SueldoDetallado, CarreraDetallada, VerifyResponse
-from typing import Optional
-import bcrypt
+from ..security.password_hasher import password_hasher
+from typing import Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Referencias a los rehash en curso para que no los recolecte el GC
+_rehash_tasks: Set[asyncio.Task] = set()
+
 
 class AuthService:
     
@@ -25,10 +36,14 @@ class AuthService:
         if not usuario.status:
             return None
         
-        # Verificar contraseña usando bcrypt (compara texto plano con hash almacenado)
-        if not bcrypt.checkpw(login_request.contraseña.encode('utf-8'), usuario.contraseña.encode('utf-8')):
+        # Verificar contraseña usando bcrypt en el pool dedicado (compara texto plano con hash almacenado)
+        if not await password_hasher.check(login_request.contraseña, usuario.contraseña):
             return None
         
+        # Si el hash usa un costo menor al calibrado, actualizarlo en segundo plano
+        if password_hasher.needs_rehash(usuario.contraseña):
+            AuthService._schedule_rehash(usuario.id_usuario, login_request.contraseña, usuario.contraseña)
+        
         # Crear objeto RolInfo
         rol_info = RolInfo(
             id_rol=usuario.rol.id_rol,
@@ -74,6 +89,34 @@ class AuthService:
             carrera=carrera_detallada
         )
     
+    @staticmethod
+    def _schedule_rehash(user_id: uuid.UUID, contraseña: str, old_hash: str) -> None:
+        """Lanzar el rehash sin demorar la respuesta del login"""
+        task = asyncio.create_task(AuthService._rehash_password(user_id, contraseña, old_hash))
+        _rehash_tasks.add(task)
+        task.add_done_callback(_rehash_tasks.discard)
+    
+    @staticmethod
+    async def _rehash_password(user_id: uuid.UUID, contraseña: str, old_hash: str) -> None:
+        """
+        Rehashear la contraseña con el costo actual usando una sesión propia,
+        ya que la sesión de la request se cierra al responder
+        """
+        if database.AsyncSessionLocal is None:
+            return
+        
+        try:
+            new_hash = await password_hasher.hash(contraseña)
+            async with database.unit_of_work() as db:
+                updated = await AuthDAO.update_password_hash(db, user_id, old_hash, new_hash)
+            if updated:
+                logger.info(f"Hash de contraseña actualizado a cost {password_hasher.rounds} para usuario {user_id}")
+        except HTTPException:
+            # Pool de bcrypt saturado: se reintentará en el próximo login
+            pass
+        except Exception as e:
+            logger.error(f"Error rehasheando contraseña del usuario {user_id}: {e}")
+    
     @staticmethod
     async def verify_user_exists_and_active(db: AsyncSession, email_institucional: str) -> VerifyResponse:
         """
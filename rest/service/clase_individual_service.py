@@ -7,7 +7,7 @@ from ..schemas.clase_individual_schema import (
     ClaseEstadisticas,
     EstadoClase
 )
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import date
 import uuid
 
@@ -45,6 +45,12 @@ class ClaseIndividualService:
         db_clases = await ClaseIndividualDAO.get_all(db, skip, limit, status_filter)
         return [ClaseIndividualResponse.model_validate(clase) for clase in db_clases]
     
+    @staticmethod
+    async def get_clases_page(db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, status_filter: Optional[bool] = None) -> Tuple[List[ClaseIndividualResponse], Optional[str]]:
+        """Obtener una página de clases por cursor; retorna (clases, cursor siguiente)"""
+        db_clases, next_cursor = await ClaseIndividualDAO.get_page(db, limit, cursor, status_filter)
+        return [ClaseIndividualResponse.model_validate(clase) for clase in db_clases], next_cursor
+    
     @staticmethod
     async def get_clases_by_curso(db: AsyncSession, id_curso: uuid.UUID, skip: int = 0, limit: int = 100, status_filter: Optional[bool] = None) -> List[ClaseIndividualResponse]:
         """Obtener clases por curso"""
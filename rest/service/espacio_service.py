@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..dao.espacio_dao import EspacioDAO
 from ..schemas.espacio_schema import EspacioCreate, EspacioUpdate, Espacio, EspacioConSede, ComedorInfo
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import uuid
 
 class EspacioService:
@@ -31,6 +31,12 @@ class EspacioService:
         db_espacios = await EspacioDAO.get_all(db, skip, limit, status_filter)
         return [Espacio.model_validate(espacio) for espacio in db_espacios]
     
+    @staticmethod
+    async def get_espacios_page(db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, status_filter: Optional[bool] = None) -> Tuple[List[Espacio], Optional[str]]:
+        """Obtener una página de espacios por cursor; retorna (espacios, cursor siguiente)"""
+        db_espacios, next_cursor = await EspacioDAO.get_page(db, limit, cursor, status_filter)
+        return [Espacio.model_validate(espacio) for espacio in db_espacios], next_cursor
+    
     @staticmethod
     async def get_espacios_by_sede(db: AsyncSession, id_sede: uuid.UUID, skip: int = 0, limit: int = 100) -> List[Espacio]:
         """Obtener espacios por sede"""
@@ -0,0 +1,92 @@
+import os
+import random
+import string
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+
+from .. import database
+from ..dao.usuario_dao import UsuarioDAO
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Cantidad de números que se reservan de la secuencia por round trip
+LEGAJO_BLOCK_SIZE = int(os.getenv('LEGAJO_BLOCK_SIZE', '50'))
+
+LEGAJO_PREFIX = "USR"
+
+
+def format_legajo(number: int) -> str:
+    """Formatear un número como legajo USR######"""
+    return f"{LEGAJO_PREFIX}{number:06d}"
+
+
+class LegajoAllocator:
+    """
+    Asignador de legajos respaldado por la secuencia usuarios_legajo_seq.
+
+    Reserva bloques de números con nextval() y los entrega desde memoria, así un
+    alta no necesita consultar la base por cada legajo. Los legajos generados al
+    azar antes de la secuencia pueden coincidir con números nuevos: cada bloque se
+    filtra contra la tabla con una sola consulta IN y los ocupados se descartan.
+
+    En motores sin secuencias (o en modo mock) se generan legajos aleatorios,
+    también verificados por lote.
+    """
+
+    def __init__(self, block_size: int = LEGAJO_BLOCK_SIZE):
+        self.block_size = max(1, block_size)
+        self._buffer: "deque[str]" = deque()
+        self._lock = asyncio.Lock()
+        self.blocks_fetched = 0
+        self.collisions_skipped = 0
+        self.allocated = 0
+
+    @staticmethod
+    def _uses_sequence() -> bool:
+        return database.engine is not None and database.engine.dialect.name == "postgresql"
+
+    async def _candidates(self, db: AsyncSession, count: int) -> List[str]:
+        if self._uses_sequence():
+            numbers = await UsuarioDAO.next_legajo_numbers(db, count)
+            return [format_legajo(number) for number in numbers]
+        return list({
+            LEGAJO_PREFIX + ''.join(random.choices(string.digits, k=6))
+            for _ in range(count)
+        })
+
+    async def _refill(self, db: AsyncSession, needed: int) -> None:
+        while len(self._buffer) < needed:
+            candidates = await self._candidates(db, max(self.block_size, needed - len(self._buffer)))
+            taken = await UsuarioDAO.get_existing_legajos(db, candidates)
+            self.blocks_fetched += 1
+            self.collisions_skipped += len(taken)
+            self._buffer.extend(legajo for legajo in candidates if legajo not in taken)
+
+    async def allocate(self, db: AsyncSession, count: int = 1) -> List[str]:
+        """Obtener `count` legajos libres (para importaciones masivas se pide el lote completo)"""
+        async with self._lock:
+            await self._refill(db, count)
+            legajos = [self._buffer.popleft() for _ in range(count)]
+        self.allocated += count
+        return legajos
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener contadores del asignador"""
+        return {
+            "mode": "sequence" if self._uses_sequence() else "random",
+            "block_size": self.block_size,
+            "buffered": len(self._buffer),
+            "allocated": self.allocated,
+            "blocks_fetched": self.blocks_fetched,
+            "collisions_skipped": self.collisions_skipped
+        }
+
+
+legajo_allocator = LegajoAllocator()
@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..dao.parametro_dao import ParametroDAO
 from ..schemas.parametro_schema import ParametroCreate, ParametroUpdate, Parametro
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from fastapi import HTTPException, status
 import uuid
 
@@ -75,6 +75,12 @@ class ParametroService:
             "limit": limit
         }
     
+    @staticmethod
+    async def get_parametros_page(db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, status_filter: Optional[bool] = None) -> Tuple[List[Parametro], Optional[str]]:
+        """Obtener una página de parámetros por cursor; retorna (parámetros, cursor siguiente)"""
+        parametros, next_cursor = await ParametroDAO.get_page(db, limit, cursor, status_filter)
+        return [Parametro.model_validate(p) for p in parametros], next_cursor
+    
     @staticmethod
     async def get_parametros_by_tipo(db: AsyncSession, tipo: str, skip: int = 0, limit: int = 100) -> dict:
         """Obtener parámetros por tipo"""
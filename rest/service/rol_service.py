@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from ..database import savepoint
 from ..dao.rol_dao import RolDAO
 from ..schemas.rol_schema import RolBase, RolUpdate
 from ..models.rol_model import Rol
@@ -12,7 +13,8 @@ class RolService:
     async def create_rol(db: AsyncSession, rol: RolBase) -> Tuple[Optional[Rol], Optional[str]]:
         """Crear un nuevo rol"""
         try:
-            created_rol = await RolDAO.create(db, rol)
+            async with savepoint(db):
+                created_rol = await RolDAO.create(db, rol)
             return created_rol, None
         except IntegrityError as e:
             error_message = str(e.orig)
@@ -55,7 +57,8 @@ class RolService:
                 return None, "No se puede modificar categoría o subcategoría. Elimine el rol y cree uno nuevo"
         
         try:
-            updated_rol = await RolDAO.update(db, rol_id, rol_update)
+            async with savepoint(db):
+                updated_rol = await RolDAO.update(db, rol_id, rol_update)
             return updated_rol, None
         except IntegrityError:
             return None, "Error de integridad al actualizar el rol"
@@ -64,8 +67,7 @@ class RolService:
     async def delete_rol(db: AsyncSession, rol_id: uuid.UUID) -> Tuple[bool, Optional[str]]:
         from ..dao.usuario_dao import UsuarioDAO
         
-        existing_rol = await RolDAO.get_by_id(db, rol_id, True)
-        if not existing_rol:
+        if not await RolDAO.exists(db, rol_id, True):
             return False, "Rol no encontrado"
         
         active_users = await UsuarioDAO.count_active_by_rol(db, rol_id)
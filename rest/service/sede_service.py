@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..dao.sede_dao import SedeDAO
 from ..schemas.sede_schema import SedeCreate, SedeUpdate, Sede
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import uuid
 from fastapi import HTTPException, status
 
@@ -66,6 +66,12 @@ class SedeService:
             "limit": limit
         }
     
+    @staticmethod
+    async def get_sedes_page(db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, status_filter: Optional[bool] = None) -> Tuple[List[Sede], Optional[str]]:
+        """Obtener una página de sedes por cursor; retorna (sedes, cursor siguiente)"""
+        sedes, next_cursor = await SedeDAO.get_page(db, limit, cursor, status_filter)
+        return [Sede.model_validate(sede) for sede in sedes], next_cursor
+    
     @staticmethod
     async def search_sedes_by_nombre(db: AsyncSession, nombre_pattern: str, skip: int = 0, limit: int = 100) -> dict:
         """Buscar sedes por patrón en el nombre"""
@@ -125,8 +131,7 @@ class SedeService:
     async def delete_sede(db: AsyncSession, id_sede: uuid.UUID) -> dict:
         """Eliminación lógica de una sede"""
         # Verificar que existe
-        sede = await SedeDAO.get_by_id(db, id_sede)
-        if not sede:
+        if not await SedeDAO.exists(db, id_sede):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Sede con ID {id_sede} no encontrada"
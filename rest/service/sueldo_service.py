@@ -1,14 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..dao.sueldo_dao import SueldoDAO
-from ..dao.usuario_dao import UsuarioDAO
-from ..dao.usuario_carrera_dao import UsuarioCarreraDAO
 from ..schemas.sueldo_schema import SueldoBase, SueldoUpdate, Sueldo as SueldoSchema
 from ..models.sueldo_model import Sueldo
+from ..models.usuario_model import Usuario
+from ..loader import request_loader
 from typing import List, Optional, Tuple
 from decimal import Decimal
 import uuid
 from datetime import datetime, timezone
-from ..messaging.producer import EventProducer
+from ..messaging.outbox import enqueue_event
 from ..messaging.event_builder import build_event
 import logging
 
@@ -19,19 +19,18 @@ class SueldoService:
     @staticmethod
     async def can_create_sueldo(db: AsyncSession, sueldo: SueldoBase) -> Tuple[bool, str]:
         
-        usuario = await UsuarioDAO.get_by_id(db, sueldo.id_usuario)
+        # El usuario llega con sueldos y carreras cargados: las validaciones no consultan de nuevo
+        usuario = await request_loader(db).load(Usuario, sueldo.id_usuario)
         if not usuario or not usuario.status:
             return False, "Usuario no encontrado o inactivo"
         
         if usuario.rol and usuario.rol.categoria == "ALUMNO":
             return False, "No se puede crear un sueldo para un usuario con rol de ALUMNO"
         
-        sueldo_exists = await SueldoDAO.get_sueldo_by_usuario(db, sueldo.id_usuario, True)
-        if sueldo_exists:
+        if any(sueldo_actual.status for sueldo_actual in usuario.sueldos):
             return False, "Ya existe un sueldo activo para este usuario"
         
-        carrera = await UsuarioCarreraDAO.get_carrera_by_usuario(db, sueldo.id_usuario, True)
-        if carrera:
+        if any(carrera.status for carrera in usuario.carreras):
             return False, "El usuario no puede tener sueldo y carrera simultáneamente"
         
         return True, ""
@@ -40,25 +39,24 @@ class SueldoService:
     async def create_sueldo(db: AsyncSession, sueldo: SueldoBase) -> Optional[Sueldo]:
         """
         Crear un nuevo sueldo para un usuario no-alumno.
-        Publica el evento user.created después de la asignación exitosa.
+        Publica el evento user.created cuando se confirma la asignación.
         """
         can_create, _ = await SueldoService.can_create_sueldo(db, sueldo)
         if not can_create:
             return None
         
-        # Crear el sueldo (esto hace commit en la BD)
         created_sueldo = await SueldoDAO.create(db, sueldo)
         
-        # Capturar occurredAt justo después del commit (cuando ocurrió el cambio real)
+        # occurredAt: momento del cambio (se confirma al terminar la request)
         occurred_at = datetime.now(timezone.utc)
         
-        # Obtener el usuario para el evento
-        usuario = await UsuarioDAO.get_by_id(db, sueldo.id_usuario)
+        # Obtener el usuario para el evento (ya está en memoria desde la validación)
+        usuario = await request_loader(db).load(Usuario, sueldo.id_usuario)
         if not usuario:
             return created_sueldo
         
-        # Refrescar el usuario para obtener los datos más recientes
-        await db.refresh(usuario)
+        # Solo la colección de sueldos cambió: incluir el recién creado
+        await db.refresh(usuario, attribute_names=["sueldos"])
         
         # Obtener información del rol, sueldo y carrera para el evento
         from .usuario_service import UsuarioService
@@ -86,24 +84,16 @@ class SueldoService:
             occurred_at=occurred_at
         )
         
-        published = await EventProducer.publish(
+        await enqueue_event(
+            db,
             message=event,
             exchange_name="user.event",
-            routing_key="user.created"
-        )
-        
-        if published:
-            logger.info(
-                f"✅ Evento user.created publicado correctamente para usuario NO-ALUMNO: "
-                f"user_id={usuario.id_usuario}, legajo={usuario.legajo}, "
-                f"id_sueldo={created_sueldo.id_sueldo}, eventId={event.get('eventId')}"
-            )
-        else:
-            logger.warning(
-                f"⚠️ No se pudo publicar evento user.created para usuario NO-ALUMNO: "
-                f"user_id={usuario.id_usuario}, legajo={usuario.legajo}, "
-                f"id_sueldo={created_sueldo.id_sueldo}, eventId={event.get('eventId')}"
+            routing_key="user.created",
+            context=(
+                f"para usuario NO-ALUMNO: user_id={usuario.id_usuario}, legajo={usuario.legajo}, "
+                f"id_sueldo={created_sueldo.id_sueldo}"
             )
+        )
         
         return created_sueldo
     
@@ -116,7 +106,7 @@ class SueldoService:
     async def get_sueldo_by_usuario(db: AsyncSession, id_usuario: uuid.UUID, status_filter: Optional[bool] = None) -> Optional[Sueldo]:
         """Obtener el sueldo activo único de un usuario"""
         # Verificar que el usuario existe
-        usuario = await UsuarioDAO.get_by_id(db, id_usuario)
+        usuario = await request_loader(db).load(Usuario, id_usuario)
         if not usuario:
             return None
         
@@ -127,12 +117,16 @@ class SueldoService:
         """Obtener todos los sueldos con filtros"""
         return await SueldoDAO.get_all(db, skip, limit, status_filter)
     
+    @staticmethod
+    async def get_sueldos_page(db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, status_filter: Optional[bool] = None) -> Tuple[List[Sueldo], Optional[str]]:
+        """Obtener una página de sueldos por cursor; retorna (sueldos, cursor siguiente)"""
+        return await SueldoDAO.get_page(db, limit, cursor, status_filter)
+    
     @staticmethod
     async def update_sueldo(db: AsyncSession, sueldo_id: uuid.UUID, sueldo_update: SueldoUpdate) -> Optional[Sueldo]:
         """Actualizar un sueldo"""
         # Verificar que el sueldo existe
-        existing_sueldo = await SueldoDAO.get_by_id(db, sueldo_id)
-        if not existing_sueldo:
+        if not await SueldoDAO.exists(db, sueldo_id):
             return None
         
         return await SueldoDAO.update(db, sueldo_id, sueldo_update)
@@ -143,7 +137,7 @@ class SueldoService:
         if not existing_sueldo:
             return False, "Sueldo no encontrado"
         
-        usuario = await UsuarioDAO.get_by_id(db, existing_sueldo.id_usuario)
+        usuario = await request_loader(db).load(Usuario, existing_sueldo.id_usuario)
         if usuario and usuario.status:
             return False, "No se puede eliminar el sueldo de un usuario activo"
         
@@ -184,25 +178,14 @@ class SueldoService:
             }
         )
         
-        published = await EventProducer.publish(
+        await enqueue_event(
+            db,
             message=event,
             exchange_name="salary.event",
-            routing_key="salary.paid"
+            routing_key="salary.paid",
+            context=f"para pago de sueldos: cantidad_docentes={cantidad_docentes}, total_pagado={total_pagado}"
         )
         
-        if published:
-            logger.info(
-                f"✅ Evento salary.paid publicado correctamente: "
-                f"cantidad_docentes={cantidad_docentes}, total_pagado={total_pagado}, "
-                f"eventId={event.get('eventId')}"
-            )
-        else:
-            logger.warning(
-                f"⚠️ No se pudo publicar evento salary.paid: "
-                f"cantidad_docentes={cantidad_docentes}, total_pagado={total_pagado}, "
-                f"eventId={event.get('eventId')}"
-            )
-        
         return {
             "cantidad_docentes": cantidad_docentes,
             "total_pagado": float(total_pagado)
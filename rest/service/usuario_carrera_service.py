@@ -1,12 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..dao.usuario_carrera_dao import UsuarioCarreraDAO
-from ..dao.usuario_dao import UsuarioDAO
-from ..dao.sueldo_dao import SueldoDAO
+from ..models.usuario_model import Usuario
+from ..loader import request_loader
 from ..schemas.usuario_carrera_schema import UsuarioCarrera as UsuarioCarreraSchema, UsuarioCarreraCreate
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
-from ..messaging.producer import EventProducer
+from ..messaging.outbox import enqueue_event
 from ..messaging.event_builder import build_event
 import logging
 
@@ -18,31 +18,29 @@ class UsuarioCarreraService:
     async def create_assignment(db: AsyncSession, usuario_carrera: UsuarioCarreraCreate) -> Optional[UsuarioCarreraSchema]:
         """
         Asignar una carrera a un usuario alumno.
-        Publica el evento user.created después de la asignación exitosa.
+        Publica el evento user.created cuando se confirma la asignación.
         """
-        usuario = await UsuarioDAO.get_by_id(db, usuario_carrera.id_usuario)
+        # El usuario llega con sueldos y carreras cargados: las validaciones no consultan de nuevo
+        usuario = await request_loader(db).load(Usuario, usuario_carrera.id_usuario)
         if not usuario or not usuario.status:
             return None
         
         if usuario.rol and usuario.rol.categoria != "ALUMNO":
             raise ValueError("Solo usuarios con rol ALUMNO pueden tener carrera")
         
-        existing = await UsuarioCarreraDAO.get_carrera_by_usuario(db, usuario_carrera.id_usuario, True)
-        if existing:
+        if any(carrera.status for carrera in usuario.carreras):
             raise ValueError("El usuario ya tiene una carrera activa asignada")
         
-        sueldo = await SueldoDAO.get_sueldo_by_usuario(db, usuario_carrera.id_usuario, True)
-        if sueldo:
+        if any(sueldo.status for sueldo in usuario.sueldos):
             raise ValueError("El usuario no puede tener carrera y sueldo simultáneamente")
         
-        # Crear la asignación (esto hace commit en la BD)
         db_relacion = await UsuarioCarreraDAO.create(db, usuario_carrera)
         
-        # Capturar occurredAt justo después del commit (cuando ocurrió el cambio real)
+        # occurredAt: momento del cambio (se confirma al terminar la request)
         occurred_at = datetime.now(timezone.utc)
         
-        # Refrescar el usuario para obtener los datos más recientes
-        await db.refresh(usuario)
+        # Solo la colección de carreras cambió: incluir la recién asignada
+        await db.refresh(usuario, attribute_names=["carreras"])
         
         # Obtener información del rol, sueldo y carrera para el evento
         from .usuario_service import UsuarioService
@@ -70,24 +68,16 @@ class UsuarioCarreraService:
             occurred_at=occurred_at
         )
         
-        published = await EventProducer.publish(
+        await enqueue_event(
+            db,
             message=event,
             exchange_name="user.event",
-            routing_key="user.created"
-        )
-        
-        if published:
-            logger.info(
-                f"✅ Evento user.created publicado correctamente para usuario ALUMNO: "
-                f"user_id={usuario.id_usuario}, legajo={usuario.legajo}, "
-                f"id_carrera={db_relacion.id_carrera}, eventId={event.get('eventId')}"
-            )
-        else:
-            logger.warning(
-                f"⚠️ No se pudo publicar evento user.created para usuario ALUMNO: "
-                f"user_id={usuario.id_usuario}, legajo={usuario.legajo}, "
-                f"id_carrera={db_relacion.id_carrera}, eventId={event.get('eventId')}"
+            routing_key="user.created",
+            context=(
+                f"para usuario ALUMNO: user_id={usuario.id_usuario}, legajo={usuario.legajo}, "
+                f"id_carrera={db_relacion.id_carrera}"
             )
+        )
         
         return UsuarioCarreraSchema(
             id_usuario=db_relacion.id_usuario,
@@ -101,11 +91,16 @@ class UsuarioCarreraService:
         relaciones = await UsuarioCarreraDAO.get_all(db, skip, limit, status_filter)
         return [UsuarioCarreraSchema(id_usuario=rel.id_usuario, id_carrera=rel.id_carrera, status=rel.status) for rel in relaciones]
     
+    @staticmethod
+    async def get_usuario_carreras_page(db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, status_filter: Optional[bool] = None) -> Tuple[List[UsuarioCarreraSchema], Optional[str]]:
+        """Obtener una página de relaciones usuario-carrera por cursor; retorna (relaciones, cursor siguiente)"""
+        relaciones, next_cursor = await UsuarioCarreraDAO.get_page(db, limit, cursor, status_filter)
+        return [UsuarioCarreraSchema(id_usuario=rel.id_usuario, id_carrera=rel.id_carrera, status=rel.status) for rel in relaciones], next_cursor
+    
     @staticmethod
     async def update_carrera(db: AsyncSession, id_usuario: UUID, id_carrera_antigua: UUID, id_carrera_nueva: UUID) -> Optional[UsuarioCarreraSchema]:
         """Modificar la carrera asignada a un usuario (solo se cambia el id_carrera)"""
-        existing = await UsuarioCarreraDAO.get_by_id(db, id_usuario, id_carrera_antigua, True)
-        if not existing:
+        if not await UsuarioCarreraDAO.exists(db, id_usuario, id_carrera_antigua):
             return None
         
         if id_carrera_antigua == id_carrera_nueva:
@@ -128,11 +123,10 @@ class UsuarioCarreraService:
     
     @staticmethod
     async def delete_usuario_carrera(db: AsyncSession, id_usuario: UUID, id_carrera: UUID) -> tuple[bool, str]:
-        existing = await UsuarioCarreraDAO.get_by_id(db, id_usuario, id_carrera, True)
-        if not existing:
+        if not await UsuarioCarreraDAO.exists(db, id_usuario, id_carrera):
             return False, "Relación usuario-carrera no encontrada"
         
-        usuario = await UsuarioDAO.get_by_id(db, id_usuario)
+        usuario = await request_loader(db).load(Usuario, id_usuario)
         if usuario and usuario.status:
             return False, "No se puede eliminar la carrera de un usuario activo"
         
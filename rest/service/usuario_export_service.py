@@ -0,0 +1,87 @@
+import os
+import io
+import csv
+import uuid
+import logging
+from typing import AsyncIterator, List, Optional
+
+from dotenv import load_dotenv
+
+from .. import database
+from ..dao.usuario_dao import UsuarioDAO
+from ..schemas.usuario_schema import UsuarioConRol
+from .usuario_service import UsuarioService
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Filas que se traen por vuelta del cursor del servidor
+USER_EXPORT_BATCH_SIZE = int(os.getenv('USER_EXPORT_BATCH_SIZE', '500'))
+
+CSV_COLUMNS = [
+    "id_usuario", "nombre", "apellido", "legajo", "dni", "email_institucional",
+    "email_personal", "telefono_personal", "fecha_alta", "status",
+    "id_rol", "rol_categoria", "rol_subcategoria",
+    "id_sueldo", "cbu", "sueldo_adicional", "id_carrera"
+]
+
+
+class UsuarioExportService:
+    """
+    Exportación completa de usuarios con rol, sueldo y carrera.
+
+    Usa su propia sesión (la de la request se cierra antes de que termine el
+    streaming) y un cursor del lado del servidor, así la memoria se mantiene
+    acotada a un lote y el primer byte sale apenas llega el primer lote.
+    """
+
+    @staticmethod
+    def _csv_row(usuario: UsuarioConRol) -> List:
+        return [
+            usuario.id_usuario, usuario.nombre, usuario.apellido, usuario.legajo, usuario.dni,
+            usuario.email_institucional or "", usuario.email_personal, usuario.telefono_personal,
+            usuario.fecha_alta.isoformat() if usuario.fecha_alta else "", usuario.status,
+            usuario.rol.id_rol, usuario.rol.categoria, usuario.rol.subcategoria or "",
+            usuario.sueldo.id_sueldo if usuario.sueldo else "",
+            usuario.sueldo.cbu if usuario.sueldo else "",
+            usuario.sueldo.sueldo_adicional if usuario.sueldo else "",
+            usuario.carrera.id_carrera if usuario.carrera else ""
+        ]
+
+    @staticmethod
+    def _serialize(usuarios: List[UsuarioConRol], format: str) -> str:
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows(UsuarioExportService._csv_row(usuario) for usuario in usuarios)
+            return buffer.getvalue()
+        return "".join(usuario.model_dump_json(exclude_none=True) + "\n" for usuario in usuarios)
+
+    @staticmethod
+    async def export_users(
+        format: str = "ndjson",
+        status_filter: Optional[bool] = None,
+        id_rol: Optional[uuid.UUID] = None
+    ) -> AsyncIterator[str]:
+        """Generar el export por lotes en formato NDJSON o CSV"""
+        if format == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(CSV_COLUMNS)
+            yield buffer.getvalue()
+
+        if database.AsyncSessionLocal is None:
+            return
+
+        exported = 0
+        async with database.AsyncSessionLocal() as db:
+            async for partition in UsuarioDAO.stream_all(db, status_filter, id_rol, USER_EXPORT_BATCH_SIZE):
+                usuarios = await UsuarioService._usuarios_to_usuarios_con_rol(db, partition)
+                exported += len(usuarios)
+                yield UsuarioExportService._serialize(usuarios, format)
+                # Liberar solo las entidades del lote ya enviado: expunge_all() reemplazaría
+                # el identity map mientras el cursor sigue cargando filas en él
+                for usuario in partition:
+                    db.expunge(usuario)
+
+        logger.info(f"Export de usuarios completado: {exported} filas ({format})")
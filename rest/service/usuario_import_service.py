@@ -0,0 +1,210 @@
+import os
+import csv
+import json
+import uuid
+import codecs
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+
+from ..database import savepoint
+from ..dao.rol_dao import RolDAO
+from ..dao.usuario_dao import UsuarioDAO
+from ..schemas.usuario_schema import UsuarioCreate
+from ..security.password_hasher import password_hasher
+from .legajo_allocator import legajo_allocator
+from .usuario_service import UsuarioService, UNIQUE_ALLOCATION_ATTEMPTS
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Filas que se insertan por transacción
+USER_IMPORT_CHUNK_SIZE = int(os.getenv('USER_IMPORT_CHUNK_SIZE', '500'))
+
+# Fila numerada (1 = primera fila de datos) con sus valores crudos, o el error de parseo
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Cortar un stream de bytes UTF-8 en líneas sin cargarlo completo en memoria"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def parse_csv_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    """Parsear un CSV con encabezado; admite campos entre comillas con saltos de línea"""
+    header: Optional[List[str]] = None
+    record = ""
+    row_number = 0
+
+    async for line in _iter_lines(chunks):
+        record += line
+        # Un registro está completo cuando sus comillas están balanceadas
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [column.strip() for column in values]
+            continue
+
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, None, f"Se esperaban {len(header)} columnas y se encontraron {len(values)}"
+            continue
+        yield row_number, {column: value.strip() for column, value in zip(header, values) if value.strip() != ""}, None
+
+    if record.strip():
+        yield row_number + 1, None, "Comillas sin cerrar al final del archivo"
+
+
+async def parse_ndjson_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    """Parsear NDJSON: un objeto JSON por línea"""
+    row_number = 0
+    async for line in _iter_lines(chunks):
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, None, f"JSON inválido: {e.msg}"
+            continue
+        if not isinstance(data, dict):
+            yield row_number, None, "Cada línea debe ser un objeto JSON"
+            continue
+        yield row_number, data, None
+
+
+class UsuarioImportService:
+    """
+    Alta masiva de usuarios.
+
+    Las filas se validan con UsuarioCreate a medida que llegan y se procesan en
+    lotes de USER_IMPORT_CHUNK_SIZE: emails y legajos se asignan por lote, las
+    contraseñas se hashean en paralelo en el pool de bcrypt y el lote se inserta
+    con un INSERT multi-fila en una sola transacción.
+    """
+
+    @staticmethod
+    async def import_users(db: AsyncSession, rows: AsyncIterator[ParsedRow]) -> Dict[str, Any]:
+        """Importar usuarios y retornar un reporte por fila con las contraseñas generadas"""
+        results: List[Dict[str, Any]] = []
+        chunk: List[Tuple[int, UsuarioCreate]] = []
+
+        async for row_number, data, parse_error in rows:
+            if parse_error:
+                results.append({"row": row_number, "status": "error", "errors": [parse_error]})
+                continue
+            try:
+                chunk.append((row_number, UsuarioCreate.model_validate(data)))
+            except ValidationError as e:
+                results.append({
+                    "row": row_number,
+                    "status": "error",
+                    "errors": [
+                        f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                        for error in e.errors()
+                    ]
+                })
+                continue
+
+            if len(chunk) >= USER_IMPORT_CHUNK_SIZE:
+                results.extend(await UsuarioImportService._import_chunk(db, chunk))
+                chunk = []
+
+        if chunk:
+            results.extend(await UsuarioImportService._import_chunk(db, chunk))
+
+        results.sort(key=lambda result: result["row"])
+        created = sum(1 for result in results if result["status"] == "created")
+        return {
+            "total": len(results),
+            "created": created,
+            "failed": len(results) - created,
+            "results": results
+        }
+
+    @staticmethod
+    def _chunk_error(chunk: List[Tuple[int, UsuarioCreate]], message: str) -> List[Dict[str, Any]]:
+        return [{"row": row_number, "status": "error", "errors": [message]} for row_number, _ in chunk]
+
+    @staticmethod
+    async def _import_chunk(db: AsyncSession, chunk: List[Tuple[int, UsuarioCreate]]) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+
+        # Un rol inexistente haría fallar el lote completo por la FK: se valida antes
+        roles = await RolDAO.get_by_ids(db, list({usuario.id_rol for _, usuario in chunk}))
+        valid: List[Tuple[int, UsuarioCreate]] = []
+        for row_number, usuario in chunk:
+            if usuario.id_rol in roles:
+                valid.append((row_number, usuario))
+            else:
+                results.append({"row": row_number, "status": "error", "errors": [f"id_rol: Rol no encontrado ({usuario.id_rol})"]})
+        if not valid:
+            return results
+
+        passwords = [UsuarioService._generate_password() for _ in valid]
+        try:
+            hashed_passwords = await password_hasher.hash_many(passwords)
+        except HTTPException:
+            return results + UsuarioImportService._chunk_error(valid, "Servicio de hashing saturado, reintente estas filas")
+
+        for attempt in range(1, UNIQUE_ALLOCATION_ATTEMPTS + 1):
+            emails = await UsuarioService._allocate_emails(db, [(u.nombre, u.apellido) for _, u in valid])
+            legajos = await legajo_allocator.allocate(db, len(valid))
+
+            records = []
+            for (_, usuario), hashed, email, legajo in zip(valid, hashed_passwords, emails, legajos):
+                record = usuario.model_dump()
+                record.update({
+                    "id_usuario": uuid.uuid4(),
+                    "contraseña": hashed,
+                    "email_institucional": email,
+                    "legajo": legajo,
+                    "status": True
+                })
+                records.append(record)
+
+            try:
+                async with savepoint(db):
+                    await UsuarioDAO.create_many(db, records)
+                # Cada lote se confirma por separado: un error posterior no deshace los ya importados
+                await db.commit()
+                break
+            except IntegrityError as e:
+                error_message = str(e.orig)
+                if "email_institucional" not in error_message and "legajo" not in error_message:
+                    logger.error(f"Error de integridad importando lote de {len(valid)} usuarios: {error_message}")
+                    return results + UsuarioImportService._chunk_error(valid, "Error de integridad al crear el usuario")
+                logger.warning(f"Colisión de email/legajo importando lote de {len(valid)} usuarios, intento {attempt}")
+        else:
+            return results + UsuarioImportService._chunk_error(valid, "No se pudo asignar un email institucional único, reintente estas filas")
+
+        for (row_number, _), record, password in zip(valid, records, passwords):
+            results.append({
+                "row": row_number,
+                "status": "created",
+                "id_usuario": str(record["id_usuario"]),
+                "legajo": record["legajo"],
+                "email_institucional": record["email_institucional"],
+                "password": password
+            })
+        return results
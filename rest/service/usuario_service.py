@@ -1,27 +1,42 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.exc import IntegrityError
 from ..dao.usuario_dao import UsuarioDAO
 from ..dao.sueldo_dao import SueldoDAO
 from ..dao.usuario_carrera_dao import UsuarioCarreraDAO
+from ..dao.rol_dao import RolDAO
 from ..schemas.usuario_schema import (
     UsuarioCreate, UsuarioUpdate, UsuarioConRol,
     RolDetallado, SueldoDetallado, CarreraDetallada
 )
 from typing import List, Optional, Dict, Any, Tuple
-import asyncio
 from ..models.usuario_model import Usuario
 import string
 import random
-import bcrypt
 import uuid
 import re
 import unicodedata
 import logging
 from datetime import datetime, timezone
-from ..messaging.producer import EventProducer
+from ..messaging.outbox import enqueue_event
 from ..messaging.event_builder import build_event
+from ..security.password_hasher import password_hasher
+from .legajo_allocator import legajo_allocator
+from ..database import savepoint
+from ..loader import request_loader
 
 logger = logging.getLogger(__name__)
 
+EMAIL_DOMAIN = "campusconnect.edu.ar"
+# Reintentos del alta ante una colisión concurrente de email institucional o legajo
+UNIQUE_ALLOCATION_ATTEMPTS = 5
+# Campos y relaciones que se pueden pedir con fields= / expand= en los listados
+USUARIO_FIELDS = [
+    "id_usuario", "nombre", "apellido", "legajo", "dni", "email_institucional",
+    "email_personal", "telefono_personal", "fecha_alta", "id_rol", "status"
+]
+USUARIO_EXPANSIONS = ["rol", "sueldo", "carrera"]
+
 class UsuarioService:
     
     @staticmethod
@@ -51,11 +66,11 @@ class UsuarioService:
         return text
     
     @staticmethod
-    async def _generate_unique_email(db: AsyncSession, nombre: str, apellido: str) -> str:
+    def _email_base(nombre: str, apellido: str) -> str:
         """
-        Generar un email institucional único con formato:
-        Primera letra del nombre + apellido completo (normalizado) @uade.edu.ar
-        Ejemplo: Marcos Cavicchia -> mcavicchia@uade.edu.ar
+        Base del email institucional:
+        Primera letra del nombre + apellido completo (normalizado)
+        Ejemplo: Marcos Cavicchia -> mcavicchia
         """
         # Obtener primera letra del nombre (normalizada)
         primera_letra = ""
@@ -69,30 +84,59 @@ class UsuarioService:
         
         if not primera_letra or not apellido_normalizado:
             # Fallback si no hay nombre o apellido válido
-            base_email = f"{apellido_normalizado or 'user'}"
-        else:
-            base_email = f"{primera_letra}{apellido_normalizado}"
+            return f"{apellido_normalizado or 'user'}"
+        return f"{primera_letra}{apellido_normalizado}"
+    
+    @staticmethod
+    def _pick_free_email(base_email: str, existing_emails: set) -> str:
+        """Elegir el menor sufijo libre para la base (sin sufijo equivale al contador 1)"""
+        pattern = re.compile(rf"^{re.escape(base_email)}(\d*)@{re.escape(EMAIL_DOMAIN)}$")
         
-        counter = 1
+        taken = set()
+        for existing in existing_emails:
+            match = pattern.match(existing)
+            if match:
+                taken.add(int(match.group(1)) if match.group(1) else 1)
         
-        while True:
-            if counter == 1:
-                email = f"{base_email}@campusconnect.edu.ar"
-            else:
-                email = f"{base_email}{counter}@campusconnect.edu.ar"
-            
-            existing = await UsuarioDAO.get_by_email_institucional(db, email)
-            if not existing:
-                return email
+        counter = 1
+        while counter in taken:
             counter += 1
+        
+        if counter == 1:
+            return f"{base_email}@{EMAIL_DOMAIN}"
+        return f"{base_email}{counter}@{EMAIL_DOMAIN}"
+    
+    @staticmethod
+    async def _allocate_emails(db: AsyncSession, personas: List[Tuple[str, str]]) -> List[str]:
+        """
+        Generar emails institucionales únicos para una lista de (nombre, apellido).
+        Una sola consulta trae los emails existentes de todas las bases; los sufijos
+        libres se eligen en memoria, contando también los asignados dentro del lote.
+        """
+        bases = [UsuarioService._email_base(nombre, apellido) for nombre, apellido in personas]
+        existing = await UsuarioDAO.get_emails_institucionales_by_prefixes(db, list(set(bases)), EMAIL_DOMAIN)
+        
+        emails = []
+        for base_email in bases:
+            email = UsuarioService._pick_free_email(base_email, existing)
+            existing.add(email)
+            emails.append(email)
+        return emails
+    
+    @staticmethod
+    async def _generate_unique_email(db: AsyncSession, nombre: str, apellido: str) -> str:
+        """
+        Generar un email institucional único con formato:
+        Primera letra del nombre + apellido completo (normalizado) @campusconnect.edu.ar
+        Ejemplo: Marcos Cavicchia -> mcavicchia@campusconnect.edu.ar
+        """
+        emails = await UsuarioService._allocate_emails(db, [(nombre, apellido)])
+        return emails[0]
     
     @staticmethod
     async def _generate_unique_legajo(db: AsyncSession) -> str:
-        while True:
-            legajo = "USR" + ''.join(random.choices(string.digits, k=6))
-            existing = await UsuarioDAO.get_by_legajo(db, legajo)
-            if not existing:
-                return legajo
+        legajos = await legajo_allocator.allocate(db, 1)
+        return legajos[0]
     
     @staticmethod
     def _generate_password() -> str:
@@ -100,8 +144,8 @@ class UsuarioService:
         return ''.join(random.choices(chars, k=8))
     
     @staticmethod
-    def _hash_password(password: str) -> str:
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    async def _hash_password(password: str) -> str:
+        return await password_hasher.hash(password)
     
     @staticmethod
     async def _get_user_event_data(db: AsyncSession, usuario: Usuario) -> Dict[str, Any]:
@@ -109,8 +153,10 @@ class UsuarioService:
         Obtener información del rol, sueldo y carrera del usuario para eventos.
         Retorna diccionarios con la información necesaria.
         """
-        # Obtener rol - siempre refrescar para evitar lazy loading en contexto async
-        await db.refresh(usuario, attribute_names=["rol"])
+        # Se reutilizan las relaciones ya cargadas; si no lo están se consultan
+        # (refresh explícito para evitar lazy loading en contexto async)
+        if not UsuarioService._loaded(usuario, "rol"):
+            await db.refresh(usuario, attribute_names=["rol"])
         rol = usuario.rol
         
         rol_info = None
@@ -128,7 +174,10 @@ class UsuarioService:
         sueldo_info = None
         carrera_info = None
         
-        sueldo = await SueldoDAO.get_sueldo_by_usuario(db, usuario.id_usuario)
+        if UsuarioService._loaded(usuario, "sueldos"):
+            sueldo = next((s for s in usuario.sueldos if s.status), None)
+        else:
+            sueldo = await SueldoDAO.get_sueldo_by_usuario(db, usuario.id_usuario)
         
         if sueldo:
             sueldo_info = {
@@ -139,7 +188,10 @@ class UsuarioService:
                 "status": sueldo.status
             }
         else:
-            carrera = await UsuarioCarreraDAO.get_carrera_by_usuario(db, usuario.id_usuario)
+            if UsuarioService._loaded(usuario, "carreras"):
+                carrera = next((c for c in usuario.carreras if c.status), None)
+            else:
+                carrera = await UsuarioCarreraDAO.get_carrera_by_usuario(db, usuario.id_usuario)
             
             if carrera:
                 carrera_info = {
@@ -160,14 +212,26 @@ class UsuarioService:
         Nota: El evento user.created se publicará cuando se asigne la carrera/sueldo,
         no en este método.
         """
-        # Generar datos únicos
-        email_institucional = await UsuarioService._generate_unique_email(db, usuario.nombre, usuario.apellido)
-        legajo = await UsuarioService._generate_unique_legajo(db)
         password = UsuarioService._generate_password()
-        hashed_password = UsuarioService._hash_password(password)
+        hashed_password = await UsuarioService._hash_password(password)
         
-        # Crear usuario (esto hace commit en la BD)
-        created_user = await UsuarioDAO.create(db, usuario, hashed_password, legajo, email_institucional)
+        # Otro alta concurrente puede tomar el mismo email o legajo entre la generación
+        # y el insert: la restricción única lo detecta y se reintenta con valores nuevos
+        for attempt in range(1, UNIQUE_ALLOCATION_ATTEMPTS + 1):
+            email_institucional = await UsuarioService._generate_unique_email(db, usuario.nombre, usuario.apellido)
+            legajo = await UsuarioService._generate_unique_legajo(db)
+            try:
+                # El SAVEPOINT permite reintentar sin perder la transacción de la request
+                async with savepoint(db):
+                    created_user = await UsuarioDAO.create(db, usuario, hashed_password, legajo, email_institucional)
+                break
+            except IntegrityError as e:
+                error_message = str(e.orig)
+                if "email_institucional" not in error_message and "legajo" not in error_message:
+                    raise
+                logger.warning(f"Colisión asignando email/legajo ({email_institucional}, {legajo}), intento {attempt}")
+        else:
+            return None, "No se pudo asignar un email institucional único, reintente la operación"
         
         # Preparar respuesta
         user_dict = {
@@ -192,16 +256,76 @@ class UsuarioService:
         if not usuarios:
             return []
 
-        detailed_users = await asyncio.gather(
-            *[
-                UsuarioService._usuario_to_usuario_con_rol(db, usuario)
-                for usuario in usuarios
-                if usuario
-            ]
+        return await UsuarioService._usuarios_to_usuarios_con_rol(
+            db, [usuario for usuario in usuarios if usuario]
         )
-        return [usuario for usuario in detailed_users if usuario]
     
     
+    @staticmethod
+    async def get_users_page(db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, status_filter: Optional[bool] = None) -> Tuple[List[UsuarioConRol], Optional[str]]:
+        """Obtener una página de usuarios por cursor; retorna (usuarios, cursor siguiente)"""
+        usuarios, next_cursor = await UsuarioDAO.get_page(db, limit, cursor, status_filter)
+        return await UsuarioService._usuarios_to_usuarios_con_rol(db, usuarios), next_cursor
+    
+    @staticmethod
+    def parse_fieldset(fields: Optional[str], expand: Optional[str]) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Interpretar los parámetros fields= y expand= (listas separadas por coma).
+        Retorna None si no se pidió ninguno (respuesta completa); si solo se pasa
+        `expand` se devuelven todos los campos. Lanza ValueError ante valores desconocidos.
+        """
+        if fields is None and expand is None:
+            return None
+
+        def split(value: Optional[str]) -> List[str]:
+            return list(dict.fromkeys(item.strip() for item in (value or "").split(",") if item.strip()))
+
+        selected_fields = split(fields) if fields is not None else list(USUARIO_FIELDS)
+        selected_expand = split(expand)
+
+        invalid_fields = [field for field in selected_fields if field not in USUARIO_FIELDS]
+        if invalid_fields:
+            raise ValueError(f"Invalid fields: {', '.join(invalid_fields)}. Valid fields: {', '.join(USUARIO_FIELDS)}")
+        invalid_expand = [item for item in selected_expand if item not in USUARIO_EXPANSIONS]
+        if invalid_expand:
+            raise ValueError(f"Invalid expand: {', '.join(invalid_expand)}. Valid values: {', '.join(USUARIO_EXPANSIONS)}")
+        if not selected_fields and not selected_expand:
+            raise ValueError("'fields' must include at least one field")
+        return selected_fields, selected_expand
+    
+    @staticmethod
+    async def get_all_users_sparse(
+        db: AsyncSession,
+        fieldset: Tuple[List[str], List[str]],
+        skip: int = 0,
+        limit: int = 100,
+        status_filter: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """Listar usuarios leyendo solo los campos y relaciones pedidos"""
+        fields, expand = fieldset
+        usuarios = await UsuarioDAO.get_all(db, skip, limit, status_filter, fields, expand)
+        return [UsuarioService._project_usuario(usuario, fields, expand) for usuario in usuarios]
+    
+    @staticmethod
+    async def get_users_page_sparse(
+        db: AsyncSession,
+        fieldset: Tuple[List[str], List[str]],
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status_filter: Optional[bool] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Página por cursor leyendo solo los campos y relaciones pedidos"""
+        fields, expand = fieldset
+        usuarios, next_cursor = await UsuarioDAO.get_page(db, limit, cursor, status_filter, fields, expand)
+        return [UsuarioService._project_usuario(usuario, fields, expand) for usuario in usuarios], next_cursor
+    
+    @staticmethod
+    def project_usuarios_con_rol(usuarios: List[UsuarioConRol], fieldset: Tuple[List[str], List[str]]) -> List[Dict[str, Any]]:
+        """Recortar resultados ya armados (ej: búsquedas por 'param') a los campos pedidos"""
+        fields, expand = fieldset
+        include = set(fields) | set(expand)
+        return [usuario.model_dump(mode="json", include=include, exclude_none=True) for usuario in usuarios]
+    
     @staticmethod
     async def search(
         db: AsyncSession,
@@ -256,17 +380,16 @@ class UsuarioService:
         if not usuarios:
             return []
 
-        detailed_users = await asyncio.gather(
-            *[
-                UsuarioService._usuario_to_usuario_con_rol(db, usuario)
-                for usuario in usuarios
-            ]
-        )
-        return [usuario for usuario in detailed_users if usuario]
+        return await UsuarioService._usuarios_to_usuarios_con_rol(db, usuarios)
     
     @staticmethod
     async def update_user(db: AsyncSession, user_id: uuid.UUID, usuario_update: UsuarioUpdate):
-        existing_user = await UsuarioDAO.get_by_id(db, user_id)
+        """
+        Actualizar un usuario en una sola transacción: una lectura con rol, sueldos
+        y carreras, las reactivaciones si corresponden y un UPDATE ... RETURNING.
+        El evento se arma con las relaciones ya cargadas, sin consultas extra.
+        """
+        existing_user = await UsuarioDAO.get_by_id_joined(db, user_id)
         if not existing_user:
             return None, "User not found"
         
@@ -274,28 +397,24 @@ class UsuarioService:
             return None, "No se puede modificar el rol. Elimine el usuario y créelo nuevamente"
         
         if usuario_update.email_personal and usuario_update.email_personal != existing_user.email_personal:
-            existing_by_email = await UsuarioDAO.get_by_email_personal(db, usuario_update.email_personal)
-            if existing_by_email and existing_by_email.id_usuario != user_id:
+            if await UsuarioDAO.exists_by_email_personal(db, usuario_update.email_personal, exclude_id=user_id):
                 return None, "El email personal ingresado ya está registrado en otro usuario"
         
         if usuario_update.contraseña:
-            usuario_update.contraseña = UsuarioService._hash_password(usuario_update.contraseña)
+            usuario_update.contraseña = await UsuarioService._hash_password(usuario_update.contraseña)
         
         # Detectar si se está activando el usuario (de inactivo a activo)
         is_activating = usuario_update.status is True and not existing_user.status
         
         if is_activating:
-            sueldo_inactivo = await SueldoDAO.get_sueldo_by_usuario(db, user_id, False)
-            if sueldo_inactivo:
+            if any(not sueldo.status for sueldo in existing_user.sueldos):
                 await SueldoDAO.reactivate(db, user_id)
-            carrera_inactiva = await UsuarioCarreraDAO.get_carrera_by_usuario(db, user_id, False)
-            if carrera_inactiva:
+            if any(not carrera.status for carrera in existing_user.carreras):
                 await UsuarioCarreraDAO.reactivate(db, user_id)
         
-        # Actualizar usuario (esto hace commit en la BD)
         updated_user = await UsuarioDAO.update(db, user_id, usuario_update)
         
-        # Capturar occurredAt justo después del commit (cuando ocurrió el cambio real)
+        # occurredAt: momento del cambio (se confirma al terminar la request)
         occurred_at = datetime.now(timezone.utc)
         
         # Obtener información del rol, sueldo y carrera del usuario actualizado
@@ -326,25 +445,14 @@ class UsuarioService:
                 occurred_at=occurred_at
             )
             
-            published_created = await EventProducer.publish(
+            await enqueue_event(
+                db,
                 message=created_event,
                 exchange_name="user.event",
-                routing_key="user.created"
+                routing_key="user.created",
+                context=f"al activar usuario: user_id={user_id}, legajo={existing_user.legajo}"
             )
             
-            if published_created:
-                logger.info(
-                    f"✅ Evento user.created publicado correctamente al activar usuario: "
-                    f"user_id={user_id}, legajo={existing_user.legajo}, "
-                    f"eventId={created_event.get('eventId')}"
-                )
-            else:
-                logger.warning(
-                    f"⚠️ No se pudo publicar evento user.created al activar usuario: "
-                    f"user_id={user_id}, legajo={existing_user.legajo}, "
-                    f"eventId={created_event.get('eventId')}"
-                )
-            
             return updated_user, "User updated successfully"
         
         # Si no se está activando, publicar evento user.updated normalmente
@@ -369,38 +477,27 @@ class UsuarioService:
             occurred_at=occurred_at
         )
         
-        published = await EventProducer.publish(
+        await enqueue_event(
+            db,
             message=event,
             exchange_name="user.event",
-            routing_key="user.updated"
+            routing_key="user.updated",
+            context=f"para usuario: user_id={user_id}, legajo={existing_user.legajo}"
         )
         
-        if published:
-            logger.info(
-                f"✅ Evento user.updated publicado correctamente para usuario: "
-                f"user_id={user_id}, legajo={existing_user.legajo}, "
-                f"eventId={event.get('eventId')}"
-            )
-        else:
-            logger.warning(
-                f"⚠️ No se pudo publicar evento user.updated para usuario: "
-                f"user_id={user_id}, legajo={existing_user.legajo}, "
-                f"eventId={event.get('eventId')}"
-            )
-        
         return updated_user, "User updated successfully"
     
     @staticmethod
     async def delete_user(db: AsyncSession, user_id: uuid.UUID) -> bool:
-        usuario = await UsuarioDAO.get_by_id(db, user_id)
+        usuario = await request_loader(db).load(Usuario, user_id)
         if not usuario:
             return False
 
-        sueldo = await SueldoDAO.get_sueldo_by_usuario(db, user_id, True)
+        sueldo = next((s for s in usuario.sueldos if s.status), None)
         if sueldo:
             await SueldoDAO.soft_delete(db, sueldo.id_sueldo)
         
-        carrera = await UsuarioCarreraDAO.get_carrera_by_usuario(db, user_id, True)
+        carrera = next((c for c in usuario.carreras if c.status), None)
         if carrera:
             await UsuarioCarreraDAO.soft_delete(db, carrera.id_usuario, carrera.id_carrera)
 
@@ -408,13 +505,13 @@ class UsuarioService:
         # Nota: obtenemos esta info antes de eliminar porque después el usuario ya no existe
         event_data = await UsuarioService._get_user_event_data(db, usuario)
 
-        # Eliminar usuario (esto hace commit en la BD)
+        # Baja lógica del usuario, sueldo y carrera en la misma transacción
         deleted = await UsuarioDAO.delete(db, user_id)
         
-        # Capturar occurredAt justo después del commit (cuando ocurrió el cambio real)
+        # occurredAt: momento del cambio (se confirma al terminar la request)
         occurred_at = datetime.now(timezone.utc)
         
-        # Publicar evento user.deleted solo si se eliminó correctamente (emittedAt se genera en build_event)
+        # Registrar el evento user.deleted solo si se eliminó correctamente: se encola en el outbox en la misma transacción y el relay lo publica después (emittedAt se genera en build_event)
         if deleted:
             event = build_event(
                 event_type="user.deleted",
@@ -433,45 +530,85 @@ class UsuarioService:
                 occurred_at=occurred_at
             )
             
-            published = await EventProducer.publish(
+            await enqueue_event(
+                db,
                 message=event,
                 exchange_name="user.event",
-                routing_key="user.deleted"
+                routing_key="user.deleted",
+                context=f"para usuario: user_id={user_id}, legajo={usuario.legajo}"
             )
-            
-            if published:
-                logger.info(
-                    f"✅ Evento user.deleted publicado correctamente para usuario: "
-                    f"user_id={user_id}, legajo={usuario.legajo}, "
-                    f"eventId={event.get('eventId')}"
-                )
-            else:
-                logger.warning(
-                    f"⚠️ No se pudo publicar evento user.deleted para usuario: "
-                    f"user_id={user_id}, legajo={usuario.legajo}, "
-                    f"eventId={event.get('eventId')}"
-                )
         
         return deleted
     
     @staticmethod
-    async def _usuario_to_usuario_con_rol(db: AsyncSession, usuario: Usuario) -> Optional[UsuarioConRol]:
-        """Expandir un usuario con su rol y la entidad asociada (sueldo o carrera)."""
-        if not usuario:
-            return None
+    def _loaded(usuario: Usuario, attribute: str) -> bool:
+        """Indicar si la relación ya fue cargada (ej: por selectinload en el DAO)"""
+        return attribute not in sa_inspect(usuario).unloaded
 
-        rol = getattr(usuario, "rol", None)
-        if not rol:
-            await db.refresh(usuario, attribute_names=["rol"])
-            rol = getattr(usuario, "rol", None)
+    @staticmethod
+    async def _usuarios_to_usuarios_con_rol(db: AsyncSession, usuarios: List[Usuario]) -> List[UsuarioConRol]:
+        """
+        Expandir una página de usuarios con su rol y la entidad asociada (sueldo o carrera).
 
-        if not rol:
-            return None
+        Se usan las relaciones ya cargadas por el DAO; solo para los usuarios que
+        no las tengan se resuelven rol, sueldo activo y carrera activa con una
+        consulta IN por tipo, así la cantidad de consultas no depende del tamaño de la página.
+        """
+        roles: Dict[uuid.UUID, Any] = {}
+        sueldos: Dict[uuid.UUID, Any] = {}
+        carreras: Dict[uuid.UUID, Any] = {}
+
+        missing_roles = set()
+        missing_sueldos = []
+        missing_carreras = []
+
+        for usuario in usuarios:
+            if UsuarioService._loaded(usuario, "rol"):
+                if usuario.rol:
+                    roles[usuario.id_rol] = usuario.rol
+            else:
+                missing_roles.add(usuario.id_rol)
+
+            if UsuarioService._loaded(usuario, "sueldos"):
+                sueldo = next((s for s in usuario.sueldos if s.status), None)
+                if sueldo:
+                    sueldos[usuario.id_usuario] = sueldo
+            else:
+                missing_sueldos.append(usuario.id_usuario)
+
+            if UsuarioService._loaded(usuario, "carreras"):
+                carrera = next((c for c in usuario.carreras if c.status), None)
+                if carrera:
+                    carreras[usuario.id_usuario] = carrera
+            else:
+                missing_carreras.append(usuario.id_usuario)
+
+        missing_roles -= roles.keys()
+        if missing_roles:
+            roles.update(await RolDAO.get_by_ids(db, list(missing_roles)))
+        if missing_sueldos:
+            sueldos.update(await SueldoDAO.get_active_by_usuarios(db, missing_sueldos))
+        if missing_carreras:
+            carreras.update(await UsuarioCarreraDAO.get_active_by_usuarios(db, missing_carreras))
 
+        detailed_users = []
+        for usuario in usuarios:
+            rol = roles.get(usuario.id_rol)
+            if not rol:
+                continue
+            detailed_users.append(
+                UsuarioService._build_usuario_con_rol(
+                    usuario, rol, sueldos.get(usuario.id_usuario), carreras.get(usuario.id_usuario)
+                )
+            )
+        return detailed_users
+
+    @staticmethod
+    def _build_usuario_con_rol(usuario: Usuario, rol, sueldo, carrera) -> UsuarioConRol:
+        """Armar el esquema de respuesta; el sueldo tiene prioridad sobre la carrera."""
         sueldo_detallado = None
         carrera_detallada = None
 
-        sueldo = await SueldoDAO.get_sueldo_by_usuario(db, usuario.id_usuario)
         if sueldo:
             sueldo_detallado = SueldoDetallado(
                 id_sueldo=sueldo.id_sueldo,
@@ -480,13 +617,11 @@ class UsuarioService:
                 observaciones=sueldo.observaciones,
                 status=sueldo.status
             )
-        else:
-            carrera = await UsuarioCarreraDAO.get_carrera_by_usuario(db, usuario.id_usuario)
-            if carrera:
-                carrera_detallada = CarreraDetallada(
-                    id_carrera=carrera.id_carrera,
-                    status=carrera.status
-                )
+        elif carrera:
+            carrera_detallada = CarreraDetallada(
+                id_carrera=carrera.id_carrera,
+                status=carrera.status
+            )
 
         return UsuarioConRol(
             id_usuario=usuario.id_usuario,
@@ -511,6 +646,59 @@ class UsuarioService:
             carrera=carrera_detallada
         )
     
+    @staticmethod
+    def _json_value(value: Any) -> Any:
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _without_none(data: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in data.items() if value is not None}
+
+    @staticmethod
+    def _project_usuario(usuario: Usuario, fields: List[str], expand: List[str]) -> Dict[str, Any]:
+        """
+        Armar la respuesta de un listado con fields=/expand= como dict JSON,
+        sin pasar por UsuarioConRol; solo se leen atributos cargados por el DAO.
+        Igual que en la respuesta completa se omiten los valores nulos y el sueldo
+        tiene prioridad sobre la carrera.
+        """
+        item = {
+            field: UsuarioService._json_value(value)
+            for field in fields
+            if (value := getattr(usuario, field)) is not None
+        }
+
+        if "rol" in expand and usuario.rol is not None:
+            rol = usuario.rol
+            item["rol"] = UsuarioService._without_none({
+                "id_rol": str(rol.id_rol),
+                "descripcion": rol.descripcion,
+                "categoria": rol.categoria,
+                "subcategoria": rol.subcategoria,
+                "sueldo_base": float(rol.sueldo_base),
+                "status": rol.status
+            })
+
+        sueldo = next((s for s in usuario.sueldos if s.status), None) if "sueldo" in expand else None
+        if sueldo:
+            item["sueldo"] = UsuarioService._without_none({
+                "id_sueldo": str(sueldo.id_sueldo),
+                "cbu": sueldo.cbu,
+                "sueldo_adicional": float(sueldo.sueldo_adicional or 0),
+                "observaciones": sueldo.observaciones,
+                "status": sueldo.status
+            })
+        elif "carrera" in expand:
+            carrera = next((c for c in usuario.carreras if c.status), None)
+            if carrera:
+                item["carrera"] = {"id_carrera": str(carrera.id_carrera), "status": carrera.status}
+
+        return item
+    
     @staticmethod
     def _user_to_dict(user) -> Dict[str, Any]:
         """Convertir usuario a diccionario"""
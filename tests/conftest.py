@@ -0,0 +1,71 @@
+"""
+Fixtures compartidas: base SQLite (aiosqlite) por test y contador de sentencias SQL.
+"""
+import asyncio
+from typing import List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+pytest.importorskip("aiosqlite")
+
+from rest import database
+from rest.models.base import Base
+
+
+class StatementCounter:
+    """Registra cada sentencia que llega al driver (before_cursor_execute)"""
+
+    def __init__(self, engine):
+        self.statements: List[str] = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+
+async def _create_schema(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path, monkeypatch):
+    """Motor SQLite en un archivo temporal, instalado como base de la app"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'backoffice.db'}")
+    asyncio.run(_create_schema(engine))
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(
+        database,
+        "AsyncSessionLocal",
+        async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    )
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def statement_counter(sqlite_engine) -> StatementCounter:
+    return StatementCounter(sqlite_engine)
+
+
+@pytest.fixture
+def run(sqlite_engine):
+    """Ejecutar una corrutina en un event loop nuevo, liberando las conexiones al terminar"""
+    def runner(coroutine):
+        async def main():
+            try:
+                return await coroutine
+            finally:
+                await sqlite_engine.dispose()
+        return asyncio.run(main())
+    return runner
@@ -0,0 +1,61 @@
+"""
+Datos de prueba para los tests sobre SQLite.
+"""
+import uuid
+from decimal import Decimal
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from rest.models.rol_model import Rol
+from rest.models.sueldo_model import Sueldo
+from rest.models.usuario_carrera_model import UsuarioCarrera
+from rest.models.usuario_model import Usuario
+
+
+async def seed_users(
+    db: AsyncSession,
+    count: int,
+    status: bool = True,
+    sueldo_status: bool = True,
+    nombre: str = "Ana"
+) -> List[Usuario]:
+    """Crear `count` usuarios de un mismo rol: los de índice par con sueldo y el resto con carrera"""
+    rol = Rol(
+        id_rol=uuid.uuid4(),
+        categoria="DOCENTE",
+        subcategoria=f"TEST-{uuid.uuid4().hex[:8]}",
+        sueldo_base=Decimal("1000")
+    )
+    db.add(rol)
+
+    usuarios = []
+    for index in range(count):
+        usuario = Usuario(
+            id_usuario=uuid.uuid4(),
+            nombre=nombre,
+            apellido=f"Perez{index}",
+            legajo=f"USR{uuid.uuid4().hex[:12]}",
+            dni=f"{30000000 + index}",
+            email_institucional=f"user{uuid.uuid4().hex[:12]}@campusconnect.edu.ar",
+            email_personal=f"user{index}@example.com",
+            telefono_personal="1122334455",
+            contraseña="hash",
+            id_rol=rol.id_rol,
+            status=status
+        )
+        db.add(usuario)
+        if index % 2 == 0:
+            db.add(Sueldo(
+                id_sueldo=uuid.uuid4(),
+                id_usuario=usuario.id_usuario,
+                cbu="0" * 22,
+                sueldo_adicional=Decimal("10"),
+                status=sueldo_status
+            ))
+        else:
+            db.add(UsuarioCarrera(id_usuario=usuario.id_usuario, id_carrera=uuid.uuid4(), status=True))
+        usuarios.append(usuario)
+
+    await db.commit()
+    return usuarios
@@ -0,0 +1,41 @@
+"""
+Export en streaming: con más usuarios que USER_EXPORT_BATCH_SIZE se exportan
+todos los lotes, no solo el primero.
+"""
+import json
+
+import pytest
+
+from rest import database
+from rest.service import usuario_export_service
+from rest.service.usuario_export_service import UsuarioExportService
+from tests.factories import seed_users
+
+USERS = 7
+
+
+async def _export(format):
+    async with database.AsyncSessionLocal() as db:
+        await seed_users(db, USERS)
+    return "".join([chunk async for chunk in UsuarioExportService.export_users(format=format)])
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setattr(usuario_export_service, "USER_EXPORT_BATCH_SIZE", 3)
+
+
+def test_ndjson_export_spans_several_batches(run):
+    body = run(_export("ndjson"))
+
+    rows = [json.loads(line) for line in body.splitlines()]
+    assert len(rows) == USERS
+    assert len({row["id_usuario"] for row in rows}) == USERS
+
+
+def test_csv_export_spans_several_batches(run):
+    body = run(_export("csv"))
+
+    lines = body.splitlines()
+    assert lines[0].startswith("id_usuario,")
+    assert len(lines) == USERS + 1
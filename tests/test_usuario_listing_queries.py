@@ -0,0 +1,59 @@
+"""
+Regresión N+1: expandir una página de usuarios (rol, sueldo activo y carrera
+activa) usa la misma cantidad de sentencias sea cual sea el tamaño de la página.
+"""
+import pytest
+from sqlalchemy import select
+
+from rest import database
+from rest.models.usuario_model import Usuario
+from rest.service.usuario_service import UsuarioService
+from tests.factories import seed_users
+
+# Una consulta de usuarios más una por relación (rol, sueldos, carreras)
+PAGE_STATEMENTS = 4
+
+
+async def _count_statements(statement_counter, page_size, load_page):
+    async with database.AsyncSessionLocal() as db:
+        await seed_users(db, page_size)
+    async with database.AsyncSessionLocal() as db:
+        statement_counter.reset()
+        usuarios = await load_page(db, page_size)
+        return statement_counter.count, usuarios
+
+
+def _get_all_users(db, page_size):
+    return UsuarioService.get_all_users(db, skip=0, limit=page_size)
+
+
+def _search_by_nombre(db, page_size):
+    return UsuarioService.search(db, "nombre", "ana", skip=0, limit=page_size)
+
+
+def _search_by_status(db, page_size):
+    return UsuarioService.search(db, "status", "true", skip=0, limit=page_size)
+
+
+async def _expand_unloaded(db, page_size):
+    # Usuarios sin relaciones cargadas: el servicio las resuelve con una consulta IN por tipo
+    result = await db.execute(select(Usuario).limit(page_size))
+    return await UsuarioService._usuarios_to_usuarios_con_rol(db, list(result.scalars().all()))
+
+
+@pytest.mark.parametrize("load_page", [_get_all_users, _search_by_nombre, _search_by_status, _expand_unloaded])
+@pytest.mark.parametrize("page_size", [3, 60])
+def test_page_expansion_uses_constant_statements(run, statement_counter, load_page, page_size):
+    count, usuarios = run(_count_statements(statement_counter, page_size, load_page))
+
+    assert len(usuarios) == page_size
+    assert count == PAGE_STATEMENTS, statement_counter.statements
+
+
+def test_page_expansion_resolves_sueldo_and_carrera(run, statement_counter):
+    _, usuarios = run(_count_statements(statement_counter, 4, _get_all_users))
+
+    by_apellido = {usuario.apellido: usuario for usuario in usuarios}
+    assert by_apellido["Perez0"].sueldo is not None and by_apellido["Perez0"].carrera is None
+    assert by_apellido["Perez1"].carrera is not None and by_apellido["Perez1"].sueldo is None
+    assert all(usuario.rol.categoria == "DOCENTE" for usuario in usuarios)
@@ -0,0 +1,64 @@
+"""
+PUT de usuario en un número acotado de sentencias: una lectura con JOINs, las
+reactivaciones necesarias, el UPDATE ... RETURNING y el INSERT en el outbox.
+"""
+from sqlalchemy import select
+
+from rest import database
+from rest.models.outbox_model import OutboxEvent
+from rest.models.sueldo_model import Sueldo
+from rest.schemas.usuario_schema import UsuarioUpdate
+from rest.service.usuario_service import UsuarioService
+from tests.factories import seed_users
+
+
+async def _update(statement_counter, usuario_update, **seed):
+    async with database.AsyncSessionLocal() as db:
+        usuario = (await seed_users(db, 1, **seed))[0]
+
+    statement_counter.reset()
+    async with database.unit_of_work() as db:
+        updated, message = await UsuarioService.update_user(db, usuario.id_usuario, usuario_update)
+    statements = list(statement_counter.statements)
+
+    async with database.AsyncSessionLocal() as db:
+        events = (await db.execute(select(OutboxEvent).order_by(OutboxEvent.id))).scalars().all()
+        sueldos = (await db.execute(select(Sueldo).where(Sueldo.id_usuario == usuario.id_usuario))).scalars().all()
+    return updated, message, statements, events, sueldos
+
+
+def test_update_reactivation_takes_four_statements(run, statement_counter):
+    updated, message, statements, events, sueldos = run(_update(
+        statement_counter,
+        UsuarioUpdate(status=True),
+        status=False,
+        sueldo_status=False
+    ))
+
+    assert message == "User updated successfully"
+    assert updated.status is True
+    # SELECT con JOINs, UPDATE sueldos, UPDATE usuarios ... RETURNING, INSERT outbox_events
+    assert len(statements) == 4, statements
+    assert statements[0].lstrip().upper().startswith("SELECT")
+    assert statements[1].lstrip().upper().startswith("UPDATE SUELDOS")
+    assert statements[2].lstrip().upper().startswith("UPDATE USUARIOS") and "RETURNING" in statements[2].upper()
+    assert statements[3].lstrip().upper().startswith("INSERT INTO OUTBOX_EVENTS")
+
+    # El evento lleva el sueldo reactivado, armado con las relaciones ya cargadas
+    assert [event.routing_key for event in events] == ["user.created"]
+    payload = events[0].payload["payload"]
+    assert payload["status"] is True
+    assert payload["sueldo"] is not None
+    assert payload["sueldo"]["status"] is True
+    assert payload["sueldo"]["id_sueldo"] == str(sueldos[0].id_sueldo)
+    assert sueldos[0].status is True
+
+
+def test_plain_update_takes_three_statements(run, statement_counter):
+    updated, _, statements, events, _ = run(_update(statement_counter, UsuarioUpdate(telefono_personal="1199998888")))
+
+    assert updated.telefono_personal == "1199998888"
+    # SELECT con JOINs, UPDATE usuarios ... RETURNING, INSERT outbox_events
+    assert len(statements) == 3, statements
+    assert [event.routing_key for event in events] == ["user.updated"]
+    assert events[0].payload["payload"]["sueldo"] is not None